@@ -123,7 +123,13 @@ fi
 
 if [[ "${SKIP_BUILD}" -eq 0 ]]; then
   echo "[INFO] 开始构建 Pro 二进制..."
-  (cd "${REPO_ROOT}" && "${PYTHON}" -m PyInstaller -F -n "${NAME}" "src/drama_processor/cli/main.py")
+  # 把配置打进二进制，找不到外部配置文件时作为内置默认配置使用
+  PACKAGED_CONFIG_DIR="${REPO_ROOT}/build/packaged_config"
+  mkdir -p "${PACKAGED_CONFIG_DIR}"
+  cp -f "${PRO_CONFIG}" "${PACKAGED_CONFIG_DIR}/pro.yaml"
+  (cd "${REPO_ROOT}" && "${PYTHON}" -m PyInstaller -F -n "${NAME}" --hidden-import drama_processor.cli.commands \
+    --add-data "${PACKAGED_CONFIG_DIR}/pro.yaml:drama_processor/config/packaged" \
+    "src/drama_processor/cli/main.py")
 else
   echo "[INFO] 跳过构建，直接打包..."
 fi
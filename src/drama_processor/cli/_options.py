@@ -0,0 +1,53 @@
+"""Pro/Lite 入口共用的根命令选项。
+
+click.Path / click.Choice 等参数类型在模块级只构建一次，两个入口复用同一组装饰器。
+"""
+
+from pathlib import Path
+from typing import Callable, TypeVar
+
+import click
+
+F = TypeVar("F", bound=Callable[..., object])
+
+_CONFIG_PATH_TYPE = click.Path(exists=True, path_type=Path)
+_LICENSE_PATH_TYPE = click.Path(exists=True, dir_okay=False, path_type=Path)
+_LOG_FILE_PATH_TYPE = click.Path(path_type=Path)
+_LOG_LEVEL_CHOICE = click.Choice(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"])
+
+CONFIG_OPTION = click.option(
+    "--config",
+    "-c",
+    type=_CONFIG_PATH_TYPE,
+    help="Configuration file path",
+)
+
+PRINT_FINGERPRINT_OPTION = click.option(
+    "--print-fingerprint",
+    is_flag=True,
+    help="打印本机指纹（用于签发 license），打印后退出",
+)
+
+LOG_LEVEL_OPTION = click.option(
+    "--log-level",
+    type=_LOG_LEVEL_CHOICE,
+    default="INFO",
+    help="Logging level",
+)
+
+LOG_FILE_OPTION = click.option(
+    "--log-file",
+    type=_LOG_FILE_PATH_TYPE,
+    help="Log file path",
+)
+
+NO_RICH_OPTION = click.option(
+    "--no-rich",
+    is_flag=True,
+    help="Disable rich formatting",
+)
+
+
+def license_option(help_text: str) -> Callable[[F], F]:
+    """--license 选项（各版本的帮助文案不同）。"""
+    return click.option("--license", type=_LICENSE_PATH_TYPE, help=help_text)
@@ -2,16 +2,16 @@
 
 import logging
 import os
+import stat
 import sys
+import traceback
 from pathlib import Path
 from typing import List, Optional, Tuple
 
 import click
 
 from ..config import ConfigManager, save_config
-from ..core.processor import DramaProcessor
 # AI功能已移除
-from ..integrations.feishu_watcher import FeishuWatcher as FeishuAutoWatcher
 from ..models.config import ProcessingConfig
 from ..models.project import DramaProject
 from ..utils.system import ensure_dir, resolve_asset_path
@@ -20,13 +20,82 @@ from ..utils.history import HistoryManager
 
 logger = logging.getLogger(__name__)
 
+# 仓库根目录（src/drama_processor/cli/commands.py 向上 3 层）
+_PROJECT_ROOT = Path(__file__).resolve().parents[3]
+_DEFAULT_CONFIG_PATH = _PROJECT_ROOT / "configs" / "default.yaml"
+_DEFAULT_TAIL_REL = "assets/tail.mp4"
+
+
+# CLI 数值参数的合法范围，交由 Click 在解析阶段校验
+_COUNT_RANGE = click.IntRange(1, 1000)
+_DURATION_RANGE = click.FloatRange(1.0, 7200.0)
+_FPS_RANGE = click.IntRange(1, 240)
+_JOBS_RANGE = click.IntRange(1, 32)
+_FILTER_THREADS_RANGE = click.IntRange(1, 256)
+
+
+def _validate_duration_range(ctx: click.Context, param: click.Parameter, value: Optional[float]) -> Optional[float]:
+    """校验 --min-sec <= --max-sec（在两者中后解析的那个参数上触发）。"""
+    other = "max_sec" if param.name == "min_sec" else "min_sec"
+    other_value = ctx.params.get(other)
+    if value is not None and other_value is not None:
+        min_sec, max_sec = (value, other_value) if param.name == "min_sec" else (other_value, value)
+        if min_sec > max_sec:
+            raise click.BadParameter(f"需满足 --min-sec ({min_sec:g}) <= --max-sec ({max_sec:g})")
+    return value
+
+
+def _is_regular_file(path: Path) -> bool:
+    """单次 stat() 判断路径是否为普通文件。"""
+    try:
+        return stat.S_ISREG(path.stat().st_mode)
+    except (FileNotFoundError, NotADirectoryError):
+        return False
+
+
+def _report_exception(ctx: click.Context, prefix: str, e: BaseException, sep: str = ": ") -> None:
+    """输出失败信息（debug 模式下附带堆栈）并以退出码 1 结束。"""
+    click.echo(f"{prefix}{sep}{e}", err=True)
+    if ctx.obj.get("debug"):
+        traceback.print_exc()
+    sys.exit(1)
+
+
+def _resolve_tail_file(tail_file: Optional[str], configured: Optional[str]) -> Optional[str]:
+    """解析尾部引导视频路径。
+
+    优先级：命令行显式指定 > 运行时根目录下的 assets/tail.mp4 > 配置文件中的 tail_file。
+    绝对路径只做一次 stat()，相对路径交给 resolve_asset_path 在运行时根目录中查找。
+    """
+    if tail_file:
+        # Explicit tail file（支持相对路径到发布包目录）
+        path = Path(tail_file)
+        if _is_regular_file(path):
+            return tail_file
+        resolved = None if path.is_absolute() else resolve_asset_path(tail_file)
+        if resolved:
+            return resolved
+        click.echo(f"⚠️ 指定的尾部文件不存在：{tail_file}")
+        return None
+
+    # 优先在运行时根目录中查找默认尾部 assets/tail.mp4
+    default_tail = resolve_asset_path(_DEFAULT_TAIL_REL)
+    if default_tail:
+        return default_tail
+    if configured:
+        resolved = resolve_asset_path(configured)
+        if resolved:
+            return resolved
+        click.echo(f"⚠️ 配置中的尾部文件不存在：{configured}")
+    return None
+
 
 @click.command("process")
 @click.argument("root_dir", type=click.Path(exists=True, file_okay=False, path_type=Path), required=False)
 # Material generation settings
-@click.option("--count", type=int, default=10, help="每部短剧生成素材条数量（默认10）")
-@click.option("--min-sec", type=float, default=480, help="每条素材最小时长（默认480s=8分钟）")
-@click.option("--max-sec", type=float, default=900, help="每条素材最大时长（默认900s=15分钟）")
+@click.option("--count", type=_COUNT_RANGE, default=10, help="每部短剧生成素材条数量（默认10）")
+@click.option("--min-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=480, help="每条素材最小时长（默认480s=8分钟）")
+@click.option("--max-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=900, help="每条素材最大时长（默认900s=15分钟）")
 @click.option("--date", type=str, default=None, help="文件名前缀日期，如 8.26；默认当天")
 
 # Random start settings
@@ -35,7 +104,7 @@ logger = logging.getLogger(__name__)
 
 # Video settings
 @click.option("--sw", is_flag=True, help="使用软编(libx264)；默认自动检测硬编")
-@click.option("--fps", type=int, default=60, help="输出帧率（默认60）")
+@click.option("--fps", type=_FPS_RANGE, default=60, help="输出帧率（默认60）")
 @click.option("--smart-fps/--no-smart-fps", default=True, help="自适应帧率：源<40fps 用源帧率，否则封顶45fps（默认开启）")
 @click.option("--canvas", type=str, default=None, help="参考画布：'WxH' 或 'first'；默认自动选择最常见分辨率")
 
@@ -56,7 +125,7 @@ logger = logging.getLogger(__name__)
 @click.option("--no-interactive", is_flag=True, help="禁用交互式选择（默认在未指定 include/exclude/full 且在 TTY 下会交互选择）")
 
 # Performance settings
-@click.option("--jobs", type=int, default=6, help="每部剧内的并发生成数（默认6；建议2~8）")
+@click.option("--jobs", type=_JOBS_RANGE, default=6, help="每部剧内的并发生成数（默认6；建议2~8）")
 
 # Directory settings
 @click.option("--temp-dir", type=str, default=None, help="临时工作目录根（默认 /tmp）")
@@ -69,7 +138,7 @@ logger = logging.getLogger(__name__)
 
 # Processing optimizations
 @click.option("--fast-mode", is_flag=True, help="更快：关闭 eq/hue 随机色彩扰动，仅保留缩放/裁切/填充与文字")
-@click.option("--filter-threads", type=int, default=max(4, min(8, (os.cpu_count() or 4) * 3 // 4)), help="滤镜并行线程数（默认=CPU核数75%，最少4个最多8个）")
+@click.option("--filter-threads", type=_FILTER_THREADS_RANGE, default=max(4, min(8, (os.cpu_count() or 4) * 3 // 4)), help="滤镜并行线程数（默认=CPU核数75%，最少4个最多8个）")
 @click.option("--verbose", is_flag=True, help="详细日志：显示完整的FFmpeg命令和更多调试信息")
 
 # 去重功能设置
@@ -146,11 +215,6 @@ def process_command(
         
         # Directory usage info removed to keep output clean
     
-    # Validate parameters
-    if min_sec <= 0 or max_sec <= 0 or min_sec > max_sec:
-        click.echo("参数错误：请保证 0 < --min-sec <= --max-sec。", err=True)
-        sys.exit(2)
-    
     # Expand include/exclude lists that may contain comma-separated or newline-separated values
     include_list = []
     for item in include:
@@ -292,29 +356,7 @@ def process_command(
     )
     
     # Handle tail file and update config
-    if tail_file:
-        # Explicit tail file（支持相对路径到发布包目录）
-        if os.path.isfile(tail_file):
-            config.tail_file = tail_file
-        else:
-            resolved = resolve_asset_path(tail_file)
-            if resolved:
-                config.tail_file = resolved
-            else:
-                click.echo(f"⚠️ 指定的尾部文件不存在：{tail_file}")
-                config.tail_file = None
-    else:
-        # 优先在运行时根目录中查找默认尾部 assets/tail.mp4
-        default_tail = resolve_asset_path("assets/tail.mp4")
-        if default_tail:
-            config.tail_file = default_tail
-        elif config.tail_file:
-            resolved = resolve_asset_path(config.tail_file)
-            if resolved:
-                config.tail_file = resolved
-            else:
-                click.echo(f"⚠️ 配置中的尾部文件不存在：{config.tail_file}")
-                config.tail_file = None
+    config.tail_file = _resolve_tail_file(tail_file, config.tail_file)
     
     # AI enhancement settings
     config.enable_deduplication = enable_deduplication
@@ -323,6 +365,7 @@ def process_command(
     click.echo("🚀 启用快速处理模式...")
     click.echo("  ✅ 传统处理模式：快速生成素材")
     
+    from ..core.processor import DramaProcessor
     processor = DramaProcessor(config)
     
     # Main processing
@@ -342,11 +385,7 @@ def process_command(
         click.echo("\n用户中断操作", err=True)
         sys.exit(130)
     except Exception as e:
-        click.echo(f"处理失败：{e}", err=True)
-        if ctx.obj.get("debug"):
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+        _report_exception(ctx, "处理失败", e, sep="：")
 
 
 @click.command("analyze")
@@ -376,6 +415,7 @@ def analyze_command(ctx, root_dir: Optional[Path], output, format: str):
     sys._drama_analyzer_mode = True
     
     # Initialize processor
+    from ..core.processor import DramaProcessor
     processor = DramaProcessor(config)
     
     # Discover dramas
@@ -408,7 +448,6 @@ def analyze_command(ctx, root_dir: Optional[Path], output, format: str):
         except Exception as e:
             click.echo(f"✗ 分析 {drama_name} 失败: {e}", err=True)
             # 详细错误信息
-            import traceback
             click.echo(f"详细错误: {traceback.format_exc()}", err=True)
     
     # Output results
@@ -487,14 +526,14 @@ def validate_config(config_file: Path):
 # Legacy compatibility command that matches the original script exactly
 @click.command("run", hidden=True)
 @click.argument("root_dir", required=False)
-@click.option("--count", type=int, default=10)
-@click.option("--min-sec", type=float, default=480)
-@click.option("--max-sec", type=float, default=900)
+@click.option("--count", type=_COUNT_RANGE, default=10)
+@click.option("--min-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=480)
+@click.option("--max-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=900)
 @click.option("--date", type=str, default=None)
 @click.option("--random-start", is_flag=True, default=True)
 @click.option("--seed", type=int, default=None)
 @click.option("--sw", is_flag=True)
-@click.option("--fps", type=int, default=60)
+@click.option("--fps", type=_FPS_RANGE, default=60)
 @click.option("--smart-fps", is_flag=True, default=True)
 @click.option("--canvas", type=str, default=None)
 @click.option("--font-file", type=str, default=None)
@@ -504,7 +543,7 @@ def validate_config(config_file: Path):
 # Cover options removed
 @click.option("--include", multiple=True)
 @click.option("--exclude", multiple=True)
-@click.option("--jobs", type=int, default=1)
+@click.option("--jobs", type=_JOBS_RANGE, default=1)
 @click.option("--full", is_flag=True)
 @click.option("--no-interactive", is_flag=True)
 @click.option("--temp-dir", type=str, default=None)
@@ -513,7 +552,7 @@ def validate_config(config_file: Path):
 @click.option("--tail-cache-dir", type=str, default="/tmp/tails_cache")
 @click.option("--refresh-tail-cache", is_flag=True)
 @click.option("--fast-mode", is_flag=True)
-@click.option("--filter-threads", type=int, default=max(4, min(8, (os.cpu_count() or 4) * 3 // 4)))
+@click.option("--filter-threads", type=_FILTER_THREADS_RANGE, default=max(4, min(8, (os.cpu_count() or 4) * 3 // 4)))
 def legacy_run_command(**kwargs):
     """Legacy compatibility - same as process command."""
     # Convert to the process command format
@@ -746,34 +785,29 @@ def feishu_list(ctx, status: Optional[str], date: Optional[str]):
         click.echo(f"📋 飞书表格中{filter_desc}的剧目")
         click.echo("=" * 60)
         
-        for i, drama in enumerate(dramas, 1):
-            click.echo(f"{i:2d}. {drama}")
+        click.echo("\n".join(f"{i:2d}. {drama}" for i, drama in enumerate(dramas, 1)))
         
         click.echo(f"\n📊 总计: {len(dramas)} 部剧")
         click.echo("=" * 60)
         
     except Exception as e:
-        click.echo(f"❌ 查询飞书数据失败: {e}", err=True)
-        if ctx.obj.get("debug"):
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+        _report_exception(ctx, "❌ 查询飞书数据失败", e)
 
 
 @feishu_command.command("run")
 @click.option("--status", type=str, default=None, help="筛选状态（默认使用配置文件中的pending_status_value）")
 @click.argument("root_dir", type=click.Path(exists=True, file_okay=False, path_type=Path), required=False)
 # Material generation settings
-@click.option("--count", type=int, default=None, help="每部短剧生成素材条数量（默认使用配置文件）")
-@click.option("--min-sec", type=float, default=None, help="每条素材最小时长（默认使用配置文件）")
-@click.option("--max-sec", type=float, default=None, help="每条素材最大时长（默认使用配置文件）")
+@click.option("--count", type=_COUNT_RANGE, default=None, help="每部短剧生成素材条数量（默认使用配置文件）")
+@click.option("--min-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=None, help="每条素材最小时长（默认使用配置文件）")
+@click.option("--max-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=None, help="每条素材最大时长（默认使用配置文件）")
 @click.option("--date", type=str, default=None, help="文件名前缀日期，如 8.26；默认当天")
 # Random start settings
 @click.option("--random-start/--no-random-start", default=None, help="随机起点，提升多样性（默认使用配置文件）")
 @click.option("--seed", type=int, default=None, help="随机起点种子；不传则每次运行都会不同")
 # Video settings
 @click.option("--sw", is_flag=True, help="使用软编(libx264)；默认自动检测硬编")
-@click.option("--fps", type=int, default=None, help="输出帧率（默认使用配置文件）")
+@click.option("--fps", type=_FPS_RANGE, default=None, help="输出帧率（默认使用配置文件）")
 @click.option("--smart-fps/--no-smart-fps", default=None, help="自适应帧率：源<40fps 用源帧率，否则封顶45fps（默认使用配置文件）")
 @click.option("--canvas", type=str, default=None, help="参考画布：'WxH' 或 'first'；默认自动选择最常见分辨率")
 # Text settings
@@ -783,7 +817,7 @@ def feishu_list(ctx, status: Optional[str], date: Optional[str]):
 # Tail settings
 @click.option("--tail-file", type=str, default=None, help="尾部引导视频路径（默认脚本同级 tail.mp4；不存在则跳过）")
 # Performance settings
-@click.option("--jobs", type=int, default=None, help="每部剧内的并发生成数（默认使用配置文件）")
+@click.option("--jobs", type=_JOBS_RANGE, default=None, help="每部剧内的并发生成数（默认使用配置文件）")
 # Directory settings
 @click.option("--temp-dir", type=str, default=None, help="临时工作目录根（默认 /tmp）")
 @click.option("--keep-temp", is_flag=True, help="保留临时目录，便于调试（默认不保留）")
@@ -793,7 +827,7 @@ def feishu_list(ctx, status: Optional[str], date: Optional[str]):
 @click.option("--refresh-tail-cache", is_flag=True, help="强制刷新尾部缓存")
 # Processing optimizations
 @click.option("--fast-mode/--no-fast-mode", default=None, help="更快：关闭 eq/hue 随机色彩扰动，仅保留缩放/裁切/填充与文字（默认使用配置文件）")
-@click.option("--filter-threads", type=int, default=None, help="滤镜并行线程数（默认使用配置文件中的值）")
+@click.option("--filter-threads", type=_FILTER_THREADS_RANGE, default=None, help="滤镜并行线程数（默认使用配置文件中的值）")
 @click.option("--verbose", is_flag=True, help="详细日志：显示完整的FFmpeg命令和更多调试信息")
 # 去重功能设置
 @click.option("--enable-deduplication", is_flag=True, help="启用剪辑点去重功能，避免生成重复素材")
@@ -828,12 +862,7 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
     """一键查询飞书表格中的剧目并自动剪辑，自动更新状态。"""
     # 加载配置文件作为基础配置
     from ..config.loader import load_config_with_fallback
-    import os
-    # 构建配置文件路径：从当前文件向上4级到项目根目录，然后进入configs目录
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-    config_path = os.path.join(project_root, "configs", "default.yaml")
-    base_config = load_config_with_fallback(config_path)
+    base_config = load_config_with_fallback(_DEFAULT_CONFIG_PATH)
     config = ctx.obj.get("config") or base_config
     
     _ensure_feishu_cli_enabled(config)
@@ -869,8 +898,7 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
             if skipped_dramas:
                 click.echo("\n📝 日期去重结果:")
                 click.echo(f"  - 跳过已处理剧集: {len(skipped_dramas)} 部")
-                for drama_name in skipped_dramas:
-                    click.echo(f"    ⏭️  {drama_name}")
+                click.echo("\n".join(f"    ⏭️  {drama_name}" for drama_name in skipped_dramas))
                 click.echo(f"  - 待处理剧集: {len(drama_info)} 部")
         elif force_reprocess:
             click.echo("🔄 强制重新处理模式已启用，将忽略历史记录")
@@ -892,8 +920,7 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
         click.echo(f"📋 从飞书获取到 {len(dramas)} 部待处理剧目")
         click.echo("=" * 60)
         
-        for i, drama in enumerate(dramas, 1):
-            click.echo(f"{i:2d}. {drama}")
+        click.echo("\n".join(f"{i:2d}. {drama}" for i, drama in enumerate(dramas, 1)))
         
         # 确认处理
         if not auto_confirm:
@@ -963,27 +990,7 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
             config.side_text = side_text
         
         # Handle tail file similar to process command
-        if tail_file:
-            if os.path.isfile(tail_file):
-                config.tail_file = tail_file
-            else:
-                resolved = resolve_asset_path(tail_file)
-                if resolved:
-                    config.tail_file = resolved
-                else:
-                    click.echo(f"⚠️ 指定的尾部文件不存在：{tail_file}")
-                    config.tail_file = None
-        else:
-            default_tail = resolve_asset_path("assets/tail.mp4")
-            if default_tail:
-                config.tail_file = default_tail
-            elif config.tail_file:
-                resolved = resolve_asset_path(config.tail_file)
-                if resolved:
-                    config.tail_file = resolved
-                else:
-                    click.echo(f"⚠️ 配置中的尾部文件不存在：{config.tail_file}")
-                    config.tail_file = None
+        config.tail_file = _resolve_tail_file(tail_file, config.tail_file)
         
         if jobs is not None:
             config.jobs = jobs
@@ -1034,6 +1041,7 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
         click.echo("🚀 启用快速处理模式...")
         click.echo("  ✅ 传统处理模式：快速生成素材")
         
+        from ..core.processor import DramaProcessor
         processor = DramaProcessor(config, status_callback=status_update_callback)
         
         # 构建剧目日期映射用于传递给处理器
@@ -1074,27 +1082,23 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
             sys.exit(1)  # Partial failure
     
     except Exception as e:
-        click.echo(f"❌ 自动剪辑失败: {e}", err=True)
-        if ctx.obj.get("debug"):
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+        _report_exception(ctx, "❌ 自动剪辑失败", e)
 
 
 @feishu_command.command("select")
 @click.option("--status", type=str, default=None, help="筛选状态（默认使用配置文件中的pending_status_value）")
 @click.argument("root_dir", type=click.Path(exists=True, file_okay=False, path_type=Path), required=False)
 # Material generation settings
-@click.option("--count", type=int, default=None, help="每部短剧生成素材条数量（默认使用配置文件）")
-@click.option("--min-sec", type=float, default=None, help="每条素材最小时长（默认使用配置文件）")
-@click.option("--max-sec", type=float, default=None, help="每条素材最大时长（默认使用配置文件）")
+@click.option("--count", type=_COUNT_RANGE, default=None, help="每部短剧生成素材条数量（默认使用配置文件）")
+@click.option("--min-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=None, help="每条素材最小时长（默认使用配置文件）")
+@click.option("--max-sec", type=_DURATION_RANGE, callback=_validate_duration_range, default=None, help="每条素材最大时长（默认使用配置文件）")
 @click.option("--date", type=str, default=None, help="文件名前缀日期，如 8.26；默认当天")
 # Random start settings
 @click.option("--random-start/--no-random-start", default=None, help="随机起点，提升多样性（默认使用配置文件）")
 @click.option("--seed", type=int, default=None, help="随机起点种子；不传则每次运行都会不同")
 # Video settings
 @click.option("--sw", is_flag=True, help="使用软编(libx264)；默认自动检测硬编")
-@click.option("--fps", type=int, default=None, help="输出帧率（默认使用配置文件）")
+@click.option("--fps", type=_FPS_RANGE, default=None, help="输出帧率（默认使用配置文件）")
 @click.option("--smart-fps/--no-smart-fps", default=None, help="自适应帧率：源<40fps 用源帧率，否则封顶45fps（默认使用配置文件）")
 @click.option("--canvas", type=str, default=None, help="参考画布：'WxH' 或 'first'；默认自动选择最常见分辨率")
 # Text settings
@@ -1104,7 +1108,7 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
 # Tail settings
 @click.option("--tail-file", type=str, default=None, help="尾部引导视频路径（默认脚本同级 tail.mp4；不存在则跳过）")
 # Performance settings
-@click.option("--jobs", type=int, default=None, help="每部剧内的并发生成数（默认使用配置文件）")
+@click.option("--jobs", type=_JOBS_RANGE, default=None, help="每部剧内的并发生成数（默认使用配置文件）")
 # Directory settings
 @click.option("--temp-dir", type=str, default=None, help="临时工作目录根（默认 /tmp）")
 @click.option("--keep-temp", is_flag=True, help="保留临时目录，便于调试（默认不保留）")
@@ -1114,7 +1118,7 @@ def feishu_run(ctx, status: Optional[str], root_dir: Optional[Path],
 @click.option("--refresh-tail-cache", is_flag=True, help="强制刷新尾部缓存")
 # Processing optimizations
 @click.option("--fast-mode", is_flag=True, help="更快：关闭 eq/hue 随机色彩扰动，仅保留缩放/裁切/填充与文字")
-@click.option("--filter-threads", type=int, default=max(4, min(8, (os.cpu_count() or 4) * 3 // 4)), help="滤镜并行线程数（默认=CPU核数75%，最少4个最多8个）")
+@click.option("--filter-threads", type=_FILTER_THREADS_RANGE, default=max(4, min(8, (os.cpu_count() or 4) * 3 // 4)), help="滤镜并行线程数（默认=CPU核数75%，最少4个最多8个）")
 @click.option("--verbose", is_flag=True, help="详细日志：显示完整的FFmpeg命令和更多调试信息")
 # 去重功能设置
 @click.option("--enable-deduplication", is_flag=True, help="启用剪辑点去重功能，避免生成重复素材")
@@ -1148,12 +1152,7 @@ def feishu_select(ctx, status: Optional[str], root_dir: Optional[Path],
     """从飞书表格选择特定剧目进行剪辑，自动更新状态。"""
     # 加载配置文件作为基础配置
     from ..config.loader import load_config_with_fallback
-    import os
-    # 构建配置文件路径：从当前文件向上4级到项目根目录，然后进入configs目录
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(os.path.dirname(os.path.dirname(current_dir)))
-    config_path = os.path.join(project_root, "configs", "default.yaml")
-    base_config = load_config_with_fallback(config_path)
+    base_config = load_config_with_fallback(_DEFAULT_CONFIG_PATH)
     config = ctx.obj.get("config") or base_config
     
     _ensure_feishu_cli_enabled(config)
@@ -1189,8 +1188,7 @@ def feishu_select(ctx, status: Optional[str], root_dir: Optional[Path],
             if skipped_dramas:
                 click.echo("\n📝 日期去重结果:")
                 click.echo(f"  - 跳过已处理剧集: {len(skipped_dramas)} 部")
-                for drama_name in skipped_dramas:
-                    click.echo(f"    ⏭️  {drama_name}")
+                click.echo("\n".join(f"    ⏭️  {drama_name}" for drama_name in skipped_dramas))
                 click.echo(f"  - 待处理剧集: {len(drama_info)} 部")
         elif force_reprocess:
             click.echo("🔄 强制重新处理模式已启用，将忽略历史记录")
@@ -1212,8 +1210,7 @@ def feishu_select(ctx, status: Optional[str], root_dir: Optional[Path],
         click.echo(f"📋 飞书表格中{filter_desc}的剧目")
         click.echo("=" * 60)
         
-        for i, drama in enumerate(dramas, 1):
-            click.echo(f"{i:2d}. {drama}")
+        click.echo("\n".join(f"{i:2d}. {drama}" for i, drama in enumerate(dramas, 1)))
         
         click.echo("=" * 60)
         
@@ -1258,8 +1255,7 @@ def feishu_select(ctx, status: Optional[str], root_dir: Optional[Path],
         
         # 显示选择的剧目
         click.echo(f"\n📌 已选择 {len(selected_dramas)} 部剧目：")
-        for i, drama in enumerate(selected_dramas, 1):
-            click.echo(f"  {i}. {drama}")
+        click.echo("\n".join(f"  {i}. {drama}" for i, drama in enumerate(selected_dramas, 1)))
         
         # 确认处理
         if not click.confirm(f"\n确认要剪辑这 {len(selected_dramas)} 部剧吗？（状态将自动更新）"):
@@ -1326,27 +1322,7 @@ def feishu_select(ctx, status: Optional[str], root_dir: Optional[Path],
             config.side_text = side_text
         
         # Handle tail file similar to process command
-        if tail_file:
-            if os.path.isfile(tail_file):
-                config.tail_file = tail_file
-            else:
-                resolved = resolve_asset_path(tail_file)
-                if resolved:
-                    config.tail_file = resolved
-                else:
-                    click.echo(f"⚠️ 指定的尾部文件不存在：{tail_file}")
-                    config.tail_file = None
-        else:
-            default_tail = resolve_asset_path("assets/tail.mp4")
-            if default_tail:
-                config.tail_file = default_tail
-            elif config.tail_file:
-                resolved = resolve_asset_path(config.tail_file)
-                if resolved:
-                    config.tail_file = resolved
-                else:
-                    click.echo(f"⚠️ 配置中的尾部文件不存在：{config.tail_file}")
-                    config.tail_file = None
+        config.tail_file = _resolve_tail_file(tail_file, config.tail_file)
         
         if jobs is not None:
             config.jobs = jobs
@@ -1397,6 +1373,7 @@ def feishu_select(ctx, status: Optional[str], root_dir: Optional[Path],
         click.echo("🚀 启用快速处理模式...")
         click.echo("  ✅ 传统处理模式：快速生成素材")
         
+        from ..core.processor import DramaProcessor
         processor = DramaProcessor(config, status_callback=status_update_callback)
         
         # 构建剧目日期映射用于传递给处理器
@@ -1437,11 +1414,7 @@ def feishu_select(ctx, status: Optional[str], root_dir: Optional[Path],
             sys.exit(1)  # Partial failure
     
     except Exception as e:
-        click.echo(f"❌ 选择性剪辑失败: {e}", err=True)
-        if ctx.obj.get("debug"):
-            import traceback
-            traceback.print_exc()
-        sys.exit(1)
+        _report_exception(ctx, "❌ 选择性剪辑失败", e)
 
 
 def _parse_date_list_option(raw: Optional[str]) -> Optional[List[str]]:
@@ -1486,6 +1459,7 @@ def feishu_watch(ctx, poll_interval: Optional[int], status: Optional[str],
         config.output_dir = current_out_dir
     os.makedirs(config.output_dir, exist_ok=True)
     
+    from ..integrations.feishu_watcher import FeishuWatcher as FeishuAutoWatcher
     watcher = FeishuAutoWatcher(
         config=config,
         poll_interval=poll_interval or watcher_cfg.poll_interval,
@@ -1560,8 +1534,9 @@ def feishu_dedup(ctx, action: str, date: Optional[str]):
             click.echo(f"最后更新时间: {summary['last_updated']}")
             click.echo("\n📋 已处理剧集列表:")
             
-            for i, drama_name in enumerate(summary['processed_dramas'], 1):
-                click.echo(f"  {i:2d}. {drama_name}")
+            click.echo("\n".join(
+                f"  {i:2d}. {drama_name}" for i, drama_name in enumerate(summary['processed_dramas'], 1)
+            ))
         
         elif action == 'clear':
             if not date:
@@ -1587,5 +1562,4 @@ def feishu_dedup(ctx, action: str, date: Optional[str]):
     except Exception as e:
         click.echo(f"❌ 操作失败: {e}", err=True)
         if ctx.obj.get("debug"):
-            import traceback
             traceback.print_exc()
@@ -0,0 +1,50 @@
+"""按需加载子命令的 Click Group。"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Optional
+
+import click
+
+
+class LazyGroup(click.Group):
+    """子命令在首次被解析时才 import，避免 --help/补全时加载整个处理流水线。
+
+    lazy_subcommands 形如 {"process": "drama_processor.cli.commands:process_command"}。
+    可为子命令附加 gate（无参可调用对象），仅在该命令被列出或解析时求值，
+    返回 False 时该命令对当前进程不可见（用于 license 控制的功能）。
+    """
+
+    def __init__(self, *args: Any, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands: Dict[str, str] = dict(lazy_subcommands or {})
+        self._gates: Dict[str, Callable[[], bool]] = {}
+
+    def add_lazy_command(
+        self, name: str, import_path: str, gate: Optional[Callable[[], bool]] = None
+    ) -> None:
+        """注册一个延迟加载的子命令（可选 gate 控制是否可用）。"""
+        self.lazy_subcommands[name] = import_path
+        if gate is not None:
+            self._gates[name] = gate
+
+    def _is_enabled(self, cmd_name: str) -> bool:
+        gate = self._gates.get(cmd_name)
+        return gate is None or gate()
+
+    def list_commands(self, ctx: click.Context) -> List[str]:
+        names = set(super().list_commands(ctx)) | set(self.lazy_subcommands)
+        return sorted(name for name in names if self._is_enabled(name))
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        if not self._is_enabled(cmd_name):
+            return None
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            self.add_command(self._load_command(cmd_name), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+    def _load_command(self, cmd_name: str) -> click.Command:
+        module_name, attr = self.lazy_subcommands[cmd_name].split(":", 1)
+        command = getattr(importlib.import_module(module_name), attr)
+        if not isinstance(command, click.Command):
+            raise ValueError(f"延迟加载的子命令 {cmd_name!r} 不是 click.Command: {command!r}")
+        return command
@@ -1,80 +1,101 @@
-"""Main CLI entry point."""
+"""Main CLI entry point.
+
+Pro 与 Lite 共用同一套根命令实现，差异（帮助文案、默认配置候选、Feishu 授权）
+由 edition 参数决定；本模块的 ``cli`` 为 Pro 版本，Lite 入口见 ``lite_main``。
+"""
 
 import logging
-import os
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional
 
 import click
 
 from ..config import ConfigManager, get_default_config
-from ..core.processor import DramaProcessor
+from ..config.loader import load_packaged_default
+from ..config.discovery import (
+    EDITION_LITE,
+    EDITION_PRO,
+    default_config_candidates,
+    find_first_existing,
+)
 from ..utils.fingerprint import get_machine_fingerprint
 from ..utils.logging import setup_logging
 from ..utils.license import (
     FEATURE_ALL,
     FEATURE_FEISHU,
     LicenseError,
-    get_allowed_features_from_args_and_env,
-    get_license_info_from_args_and_env,
     load_and_verify_license,
+    probe_license_from_argv_and_env,
+)
+from ._options import (
+    CONFIG_OPTION,
+    LOG_FILE_OPTION,
+    LOG_LEVEL_OPTION,
+    NO_RICH_OPTION,
+    PRINT_FINGERPRINT_OPTION,
+    license_option,
 )
-from .commands import process_command, analyze_command, config_command, legacy_run_command, history_command, feishu_command
+from .lazy_group import LazyGroup
 # AI功能已移除
 
 
-# import 时先读取 license（参数/环境变量），决定是否注册 feishu 命令
-_ALLOWED_FEATURES_AT_IMPORT = get_allowed_features_from_args_and_env(sys.argv)
+_logger = logging.getLogger(__name__)
 
+# 本模块直接暴露的 cli 对应的版本
+DRAMA_PROCESSOR_EDITION = EDITION_PRO
 
-@click.group(invoke_without_command=True)
-@click.option(
-    "--config",
-    "-c",
-    type=click.Path(exists=True, path_type=Path),
-    help="Configuration file path"
-)
-@click.option(
-    "--license",
-    type=click.Path(exists=True, dir_okay=False, path_type=Path),
-    help="授权文件路径（可选，用于解锁 Feishu 等高级功能）",
-)
-@click.option(
-    "--print-fingerprint",
-    is_flag=True,
-    help="打印本机指纹（用于签发 license），打印后退出",
-)
-@click.option(
-    "--log-level",
-    type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]),
-    default="INFO",
-    help="Logging level"
-)
-@click.option(
-    "--log-file",
-    type=click.Path(path_type=Path),
-    help="Log file path"
-)
-@click.option(
-    "--no-rich",
-    is_flag=True,
-    help="Disable rich formatting"
-)
-@click.pass_context
-def cli(
-    ctx,
+_HELP = {
+    EDITION_PRO: "Drama Processor - Professional video processing tool for drama series.",
+    EDITION_LITE: "Drama Processor Lite - 无 Feishu 版本。",
+}
+_LICENSE_HELP = {
+    EDITION_PRO: "授权文件路径（可选，用于解锁 Feishu 等高级功能）",
+    EDITION_LITE: "授权文件路径（发布包运行必填；也可放在二进制同目录并命名为 license.json 自动识别）",
+}
+
+# 发布包内置的默认配置（外部找不到配置文件时使用）
+_PACKAGED_DEFAULT = {
+    EDITION_PRO: "pro.yaml",
+    EDITION_LITE: "lite.yaml",
+}
+
+
+def _feishu_command_allowed() -> bool:
+    """feishu 命令是否可用。
+
+    仅在需要时求值（--help 列表或解析到 feishu），探测结果在进程内缓存，
+    根回调随后复用同一结果，不会再次扫描 argv 或校验签名。
+    """
+    features = probe_license_from_argv_and_env().allowed_features
+    return FEATURE_ALL in features or FEATURE_FEISHU in features
+
+
+# 子命令按需导入：只有真正执行（或展示帮助）时才加载 commands 模块
+_COMMANDS_MODULE = "drama_processor.cli.commands"
+_LAZY_SUBCOMMANDS = {
+    "process": f"{_COMMANDS_MODULE}:process_command",
+    "analyze": f"{_COMMANDS_MODULE}:analyze_command",
+    "config": f"{_COMMANDS_MODULE}:config_command",
+    "run": f"{_COMMANDS_MODULE}:legacy_run_command",
+    "history": f"{_COMMANDS_MODULE}:history_command",
+}
+
+
+def _init_root_context(
+    ctx: click.Context,
+    edition: str,
     config: Optional[Path],
     license: Optional[Path],
     print_fingerprint: bool,
     log_level: str,
     log_file: Optional[Path],
     no_rich: bool,
-):
-    """Drama Processor - Professional video processing tool for drama series."""
+) -> None:
+    """根命令回调：日志、配置、license 与 Feishu 授权控制。"""
     # Ensure context object exists
     ctx.ensure_object(dict)
-    
+
     # Set up logging
     logger = setup_logging(
         level=log_level,
@@ -90,57 +111,27 @@ def cli(
     if ctx.invoked_subcommand is None:
         click.echo(ctx.get_help())
         ctx.exit(0)
-    
+
     # Load configuration
     # If no config specified, try to find default config file
     if config is None:
-        # Try to find default config file.
-        # 约定：
-        # - Pro 二进制：优先 pro.yaml（若存在），否则回退 default.yaml
-        # - 源码开发态 + DEV_BYPASS：为避免误用 pro.yaml（仅面向发布包），强制优先 default.yaml
-        dev_bypass_raw = os.environ.get("DRAMA_PROCESSOR_DEV_BYPASS")
-        dev_bypass_enabled = (
-            not getattr(sys, "frozen", False)
-            and dev_bypass_raw is not None
-            and dev_bypass_raw.strip().lower() in {"1", "true", "yes", "y", "on"}
-        )
+        config = find_first_existing(default_config_candidates(edition))
 
-        if dev_bypass_enabled:
-            default_config_paths = [
-                Path("configs/default.yaml"),
-                Path("config/default.yaml"),
-                Path("default.yaml"),
-                Path.cwd() / "configs" / "default.yaml",
-                Path.cwd() / "config" / "default.yaml",
-            ]
-        else:
-            # Pro 版本默认优先使用 configs/pro.yaml（若存在），否则回退 default.yaml
-            default_config_paths = [
-                Path("configs/pro.yaml"),
-                Path("configs/default.yaml"),
-                Path("config/pro.yaml"),
-                Path("config/default.yaml"),
-                Path("pro.yaml"),
-                Path("default.yaml"),
-                Path.cwd() / "configs" / "pro.yaml",
-                Path.cwd() / "configs" / "default.yaml",
-                Path.cwd() / "config" / "pro.yaml",
-                Path.cwd() / "config" / "default.yaml",
-            ]
-        
-        for config_path in default_config_paths:
-            if config_path.exists():
-                config = config_path
-                break
-    
-    config_manager = ConfigManager(config)
-    try:
-        processing_config = config_manager.load()
-        logger.info("Configuration loaded successfully")
-    except Exception as e:
-        logger.warning(f"Failed to load configuration: {e}")
-        processing_config = get_default_config()
-        logger.info("Using default configuration")
+    config_manager = ConfigManager.for_path(config)
+    processing_config = None
+    if config is None:
+        processing_config = load_packaged_default(_PACKAGED_DEFAULT[edition])
+        if processing_config is not None:
+            logger.info("Using packaged default configuration")
+
+    if processing_config is None:
+        try:
+            processing_config = config_manager.load()
+            logger.info("Configuration loaded successfully")
+        except Exception as e:
+            logger.warning(f"Failed to load configuration: {e}")
+            processing_config = get_default_config()
+            logger.info("Using default configuration")
 
     # License 校验：显式 --license 优先，否则从 argv/env/默认路径读取
     license_info = None
@@ -152,7 +143,7 @@ def cli(
             click.echo(f"❌ License 校验失败：{e}", err=True)
             sys.exit(1)
     else:
-        license_info = get_license_info_from_args_and_env(sys.argv, logger_=logger)
+        license_info = probe_license_from_argv_and_env().info
 
     ctx.obj["license"] = license_info
 
@@ -164,47 +155,80 @@ def cli(
         )
         sys.exit(1)
 
-    # 未授权 feishu 时，强制关闭所有 feishu 相关配置，避免通过 process 侧路使用
-    if not (license_info and license_info.allows(FEATURE_FEISHU)):
+    if edition == EDITION_LITE:
+        # Lite 版本强制关闭 Feishu 能力
+        if processing_config.enable_feishu_features:
+            logger.info("Lite 版本已强制关闭所有 Feishu 相关功能")
+        processing_config = processing_config.without_feishu()
+    elif not (license_info and license_info.allows(FEATURE_FEISHU)):
+        # 未授权 feishu 时，强制关闭所有 feishu 相关配置，避免通过 process 侧路使用
         if processing_config.enable_feishu_features:
             logger.warning("未授权 Feishu 功能，已强制关闭 enable_feishu_features")
-        processing_config.enable_feishu_features = False
-        processing_config.enable_feishu_notification = False
-        processing_config.feishu = None
-        if processing_config.feishu_watcher:
-            processing_config.feishu_watcher.enabled = False
-    
+        processing_config = processing_config.without_feishu()
+
     # Store in context
     ctx.obj["config_manager"] = config_manager
     ctx.obj["config"] = processing_config
     ctx.obj["logger"] = logger
 
 
-# Add subcommands
-cli.add_command(process_command)
-cli.add_command(analyze_command) 
-cli.add_command(config_command)
-cli.add_command(legacy_run_command)
-cli.add_command(history_command)
-if FEATURE_ALL in _ALLOWED_FEATURES_AT_IMPORT or FEATURE_FEISHU in _ALLOWED_FEATURES_AT_IMPORT:
-    cli.add_command(feishu_command)
+def build_cli(edition: str) -> LazyGroup:
+    """Build the root command group for an edition (Pro or Lite)."""
+
+    @click.group(
+        cls=LazyGroup,
+        invoke_without_command=True,
+        lazy_subcommands=_LAZY_SUBCOMMANDS,
+        help=_HELP[edition],
+    )
+    @CONFIG_OPTION
+    @license_option(_LICENSE_HELP[edition])
+    @PRINT_FINGERPRINT_OPTION
+    @LOG_LEVEL_OPTION
+    @LOG_FILE_OPTION
+    @NO_RICH_OPTION
+    @click.pass_context
+    def cli(
+        ctx,
+        config: Optional[Path],
+        license: Optional[Path],
+        print_fingerprint: bool,
+        log_level: str,
+        log_file: Optional[Path],
+        no_rich: bool,
+    ):
+        _init_root_context(
+            ctx, edition, config, license, print_fingerprint, log_level, log_file, no_rich
+        )
+
+    if edition == EDITION_PRO:
+        # feishu 命令仅在 license 授权时可见
+        cli.add_lazy_command("feishu", f"{_COMMANDS_MODULE}:feishu_command", gate=_feishu_command_allowed)
+    return cli
+
+
+cli = build_cli(DRAMA_PROCESSOR_EDITION)
 
 # AI功能已移除
 
 
-def main():
-    """Main entry point."""
+def run_cli(group: click.Group) -> None:
+    """Run a root command group with the shared top-level error handling."""
     try:
-        cli()
+        group()
     except KeyboardInterrupt:
         click.echo("\nOperation cancelled by user", err=True)
         sys.exit(130)
     except Exception as e:
-        logger = logging.getLogger(__name__)
-        logger.exception("Unexpected error occurred")
+        _logger.exception("Unexpected error occurred")
         click.echo(f"Error: {e}", err=True)
         sys.exit(1)
 
 
+def main():
+    """Main entry point."""
+    run_cli(cli)
+
+
 if __name__ == "__main__":
     main()
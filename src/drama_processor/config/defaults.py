@@ -1,15 +1,17 @@
 """Default configuration values."""
 
+import functools
 import os
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from ..models.config import ProcessingConfig
 from ..utils.system import find_font
 
 
+@functools.lru_cache(maxsize=1)
 def get_default_font() -> Optional[str]:
-    """Get default font path."""
+    """Get default font path (looked up once per process)."""
     # Try to find Kaiti font first
     font_path = find_font("Kaiti")
     if font_path:
@@ -29,18 +31,29 @@ def get_default_font() -> Optional[str]:
     return None
 
 
-def get_default_config() -> ProcessingConfig:
-    """Get default processing configuration."""
-    config = ProcessingConfig()
+@functools.lru_cache(maxsize=1)
+def _default_config_template() -> ProcessingConfig:
+    """Build the default configuration once; callers receive deep copies."""
+    overrides: Dict[str, Any] = {}
     
     # Set default font
     default_font = get_default_font()
     if default_font:
-        config.font_file = default_font
+        overrides["font_file"] = default_font
     
     # Set filter threads based on CPU count (75% of cores, min 4, max 8)
     cpu_count = os.cpu_count() or 4
-    config.filter_threads = max(4, min(8, cpu_count * 3 // 4))
+    overrides["filter_threads"] = max(4, min(8, cpu_count * 3 // 4))
+    
+    # 一次校验构建模板，而不是先构造再逐个字段赋值
+    return ProcessingConfig.model_validate(overrides)
+
+
+def get_default_config() -> ProcessingConfig:
+    """Get default processing configuration.
     
-    return config
+    Returns a fresh, mutable copy of a cached template, so font discovery
+    and CPU detection only run once per process.
+    """
+    return _default_config_template().model_copy(deep=True)
 
@@ -0,0 +1,85 @@
+"""Default configuration file discovery."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Iterable, Optional, Set, Tuple, Union
+
+# 发布版本：Pro 含 Feishu 集成，Lite 为无 Feishu 版本
+EDITION_PRO = "pro"
+EDITION_LITE = "lite"
+
+_TRUTHY = {"1", "true", "yes", "y", "on"}
+
+# 默认配置候选（相对当前工作目录，按优先级排列）
+_PRO_CANDIDATES: Tuple[str, ...] = (
+    "configs/pro.yaml",
+    "configs/default.yaml",
+    "config/pro.yaml",
+    "config/default.yaml",
+    "pro.yaml",
+    "default.yaml",
+)
+_DEV_CANDIDATES: Tuple[str, ...] = (
+    "configs/default.yaml",
+    "config/default.yaml",
+    "default.yaml",
+)
+_LITE_CANDIDATES: Tuple[str, ...] = (
+    "configs/lite.yaml",
+    "configs/default.yaml",
+    "config/default.yaml",
+    "default.yaml",
+)
+
+
+def find_first_existing(candidates: Iterable[Union[str, Path]]) -> Optional[Path]:
+    """Return the first candidate that is an existing file.
+
+    Each candidate costs a single ``os.path.isfile`` call; once a parent
+    directory is known to be missing, the remaining candidates under it are
+    skipped without touching the filesystem. Priority order of ``candidates``
+    is preserved, and only the winning candidate is turned into a ``Path``.
+
+    Args:
+        candidates: Candidate file paths in priority order
+
+    Returns:
+        The first existing candidate, or None
+    """
+    missing_parents: Set[str] = set()
+    for candidate in candidates:
+        path = os.fspath(candidate)
+        parent = os.path.dirname(path)
+        if parent in missing_parents:
+            continue
+        if os.path.isfile(path):
+            return Path(candidate)
+        if parent and not os.path.isdir(parent):
+            missing_parents.add(parent)
+    return None
+
+
+def is_dev_bypass_enabled() -> bool:
+    """源码开发态下是否设置了 DRAMA_PROCESSOR_DEV_BYPASS（二进制发布包中始终为 False）。"""
+    raw = os.environ.get("DRAMA_PROCESSOR_DEV_BYPASS")
+    return (
+        not getattr(sys, "frozen", False)
+        and raw is not None
+        and raw.strip().lower() in _TRUTHY
+    )
+
+
+def default_config_candidates(edition: str) -> Tuple[str, ...]:
+    """Default config file candidates for an edition, in priority order.
+
+    约定：
+    - Pro 二进制：优先 pro.yaml（若存在），否则回退 default.yaml
+    - 源码开发态 + DEV_BYPASS：为避免误用 pro.yaml（仅面向发布包），强制优先 default.yaml
+    - Lite：优先 lite.yaml，否则回退 default.yaml
+    """
+    if edition == EDITION_LITE:
+        return _LITE_CANDIDATES
+    if is_dev_bypass_enabled():
+        return _DEV_CANDIDATES
+    return _PRO_CANDIDATES
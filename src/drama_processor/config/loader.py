@@ -1,33 +1,76 @@
 """Configuration loading and saving."""
 
+import copy
+import functools
 import logging
+import os
 import yaml
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Union, Optional
+from typing import Dict, Any, List, Union, Optional
 
 from ..models.config import ProcessingConfig
 from .defaults import get_default_config
 
 logger = logging.getLogger(__name__)
 
+# 优先使用 libyaml 的 C 实现，解析速度比纯 Python 版本快数倍
+try:
+    from yaml import CSafeDumper as _SafeDumper
+    from yaml import CSafeLoader as _SafeLoader
+    _HAS_LIBYAML = True
+except ImportError:  # pragma: no cover - 取决于 PyYAML 的编译方式
+    from yaml import SafeDumper as _SafeDumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+    _HAS_LIBYAML = False
+
+if not _HAS_LIBYAML:
+    logger.warning("PyYAML 未启用 libyaml，配置解析将使用较慢的纯 Python 实现；建议安装带 libyaml 的 PyYAML")
+
 
 def _deep_update(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
-    """递归合并字典，override 中的值覆盖 base 中的值。
+    """深度合并字典，override 中的值覆盖 base 中的值。
+    
+    使用显式栈迭代合并，并直接原地修改 base（不再逐层复制）；
+    需要保留原字典时由调用方先 copy.deepcopy。
     
     Args:
-        base: 基础字典
+        base: 基础字典（会被原地修改）
         override: 覆盖字典
         
     Returns:
-        合并后的字典
+        合并后的字典（即 base 本身）
+    """
+    if not override:
+        return base
+    
+    stack = [(base, override)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                stack.append((current, value))
+            else:
+                target[key] = value
+    return base
+
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path_str: str, mtime_ns: int, size: int) -> Any:
+    """按 (路径, mtime, 大小) 缓存 YAML 解析结果；文件变化后键随之变化，自动失效。
+
+    返回值在多次调用间共享，调用方必须通过 _read_yaml 取得深拷贝后再修改。
     """
-    result = base.copy()
-    for key, value in override.items():
-        if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-            result[key] = _deep_update(result[key], value)
-        else:
-            result[key] = value
-    return result
+    # 一次性读取字节交给 libyaml，由其内部完成 UTF-8 解码
+    return yaml.load(Path(path_str).read_bytes(), Loader=_SafeLoader)
+
+
+def _read_yaml(path: Path) -> Any:
+    """读取并解析 YAML 文件（带缓存），返回可安全修改的副本。"""
+    st = os.stat(path)
+    data = _load_yaml_cached(str(path.resolve()), st.st_mtime_ns, st.st_size)
+    return copy.deepcopy(data)
 
 
 def _load_user_config(config_path: Path, active_user: str) -> Optional[Dict[str, Any]]:
@@ -49,8 +92,7 @@ def _load_user_config(config_path: Path, active_user: str) -> Optional[Dict[str,
         return None
     
     try:
-        with open(user_config_path, 'r', encoding='utf-8') as f:
-            user_data = yaml.safe_load(f)
+        user_data = _read_yaml(user_config_path)
         
         if user_data is None:
             return {}
@@ -61,11 +103,36 @@ def _load_user_config(config_path: Path, active_user: str) -> Optional[Dict[str,
     except yaml.YAMLError as e:
         logger.error(f"用户配置文件格式错误: {e}")
         return None
-    except Exception as e:
+    except OSError as e:
         logger.error(f"加载用户配置失败: {e}")
         return None
 
 
+def _load_user_configs(config_path: Path, active_users: List[str]) -> Dict[str, Any]:
+    """加载多个用户配置并按顺序合并（后者覆盖前者）。
+    
+    各用户文件的读取与解析互不依赖，多于一个时并发进行，合并仍按列表顺序。
+    
+    Args:
+        config_path: 主配置文件路径
+        active_users: 用户名列表（优先级由低到高）
+        
+    Returns:
+        合并后的用户配置字典（可能为空）
+    """
+    if len(active_users) == 1:
+        results = [_load_user_config(config_path, active_users[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(active_users))) as pool:
+            results = list(pool.map(lambda user: _load_user_config(config_path, user), active_users))
+    
+    merged: Dict[str, Any] = {}
+    for user_config in results:
+        if user_config:
+            merged = _deep_update(merged, user_config)
+    return merged
+
+
 def load_config(config_path: Union[str, Path]) -> ProcessingConfig:
     """Load configuration from file with user config merging.
     
@@ -89,8 +156,7 @@ def load_config(config_path: Union[str, Path]) -> ProcessingConfig:
     
     try:
         # 1. 加载主配置文件
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config_data = yaml.safe_load(f)
+        config_data = _read_yaml(config_path)
         
         if config_data is None:
             config_data = {}
@@ -99,11 +165,14 @@ def load_config(config_path: Union[str, Path]) -> ProcessingConfig:
         active_user = config_data.get('active_user')
         
         if active_user:
-            # 3. 加载用户配置
-            user_config = _load_user_config(config_path, active_user)
+            # 3. 加载用户配置（active_user 可为单个用户名或用户名列表）
+            if isinstance(active_user, str):
+                user_config = _load_user_config(config_path, active_user)
+            else:
+                user_config = _load_user_configs(config_path, [str(user) for user in active_user])
             
             if user_config:
-                # 4. 合并配置（用户配置覆盖主配置）
+                # 4. 合并配置（用户配置覆盖主配置；config_data 是缓存的副本，可原地修改）
                 config_data = _deep_update(config_data, user_config)
                 logger.debug(f"用户配置已合并: {active_user}")
         
@@ -131,15 +200,26 @@ def save_config(config: ProcessingConfig, config_path: Union[str, Path]) -> None
     try:
         config_dict = config.dict()
         
-        with open(config_path, 'w', encoding='utf-8') as f:
-            yaml.dump(
-                config_dict,
-                f,
-                default_flow_style=False,
-                allow_unicode=True,
-                sort_keys=True
-            )
-            
+        new_bytes = yaml.dump(
+            config_dict,
+            Dumper=_SafeDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=True
+        ).encode('utf-8')
+
+        # 内容未变化时不重写文件（保持 mtime，避免下游缓存失效）
+        try:
+            if config_path.read_bytes() == new_bytes:
+                return
+        except OSError:
+            pass
+
+        # 先写临时文件再原子替换，避免中断时留下半截配置
+        tmp_path = config_path.with_suffix(config_path.suffix + '.tmp')
+        tmp_path.write_bytes(new_bytes)
+        os.replace(tmp_path, config_path)
+
     except Exception as e:
         raise OSError(f"Failed to save configuration: {e}")
 
@@ -162,6 +242,43 @@ def load_config_with_fallback(config_path: Union[str, Path, None]) -> Processing
         return get_default_config()
 
 
+# 随程序打包的默认配置所在的包内目录（由发布脚本写入，源码树中通常不存在）
+_PACKAGED_CONFIG_DIR = "packaged"
+
+
+def load_packaged_default(name: str) -> Optional[ProcessingConfig]:
+    """Load a default configuration bundled inside the package.
+    
+    发布包会把对应版本的配置打进 ``drama_processor/config/packaged/``，
+    找不到外部配置文件时从包资源读取，避免冷启动时逐个探测磁盘路径。
+    
+    Args:
+        name: Resource file name, e.g. ``pro.yaml`` / ``lite.yaml``
+        
+    Returns:
+        Packaged configuration, or None if it is not bundled or invalid
+    """
+    try:
+        from importlib.resources import files
+    except ImportError:  # pragma: no cover - Python 3.8
+        return None
+    
+    try:
+        resource = files(__package__).joinpath(_PACKAGED_CONFIG_DIR, name)
+        data = yaml.load(resource.read_bytes(), Loader=_SafeLoader)
+    except (OSError, ModuleNotFoundError):
+        return None
+    except yaml.YAMLError as e:
+        logger.warning(f"内置配置 {name} 格式错误: {e}")
+        return None
+    
+    try:
+        return ProcessingConfig(**(data or {}))
+    except Exception as e:
+        logger.warning(f"内置配置 {name} 无效: {e}")
+        return None
+
+
 def merge_configs(base_config: ProcessingConfig, override_data: Dict[str, Any]) -> ProcessingConfig:
     """Merge configuration with override data.
     
@@ -172,6 +289,6 @@ def merge_configs(base_config: ProcessingConfig, override_data: Dict[str, Any])
     Returns:
         Merged configuration
     """
-    config_dict = base_config.dict()
-    config_dict = _deep_update(config_dict, override_data)
+    # base_config.dict() 每次返回新字典，可直接原地合并
+    config_dict = _deep_update(base_config.dict(), override_data)
     return ProcessingConfig(**config_dict)
@@ -19,6 +19,24 @@ class ConfigManager:
         """
         self.config_path = config_path
         self._config: Optional[ProcessingConfig] = None
+        self._config_dict_cache: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def for_path(cls, config_path: Optional[Path] = None) -> "ConfigManager":
+        """Get the process-wide manager for a configuration path.
+        
+        Args:
+            config_path: Optional path to configuration file
+            
+        Returns:
+            Shared ConfigManager instance for this path
+        """
+        key = Path(config_path).resolve() if config_path is not None else None
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = cls(config_path)
+            _MANAGERS[key] = manager
+        return manager
     
     @property
     def config(self) -> ProcessingConfig:
@@ -30,6 +48,10 @@ class ConfigManager:
     def load(self, config_path: Optional[Path] = None) -> ProcessingConfig:
         """Load configuration.
         
+        Always goes through the loader: it caches each parsed YAML file (the
+        main file and any merged user files) by path, mtime and size, so an
+        edit to any of them is picked up.
+        
         Args:
             config_path: Optional path to configuration file
             
@@ -38,6 +60,7 @@ class ConfigManager:
         """
         path = config_path or self.config_path
         self._config = load_config_with_fallback(path)
+        self._config_dict_cache = None
         return self._config
     
     def save(self, config_path: Optional[Path] = None) -> None:
@@ -68,28 +91,41 @@ class ConfigManager:
             self._config = get_default_config()
         
         self._config = merge_configs(self._config, kwargs)
+        self._config_dict_cache = None
     
     def reset(self) -> None:
         """Reset configuration to defaults."""
         self._config = get_default_config()
+        self._config_dict_cache = None
     
     def get_config_dict(self) -> Dict[str, Any]:
         """Get configuration as dictionary.
         
+        The serialized dict is cached until the configuration is reloaded,
+        updated or reset; treat it as read-only.
+        
         Returns:
             Configuration dictionary
         """
-        return self.config.dict()
+        if self._config_dict_cache is None:
+            self._config_dict_cache = self.config.dict()
+        return self._config_dict_cache
     
     def validate_config(self) -> bool:
         """Validate current configuration.
         
+        ProcessingConfig is validated by pydantic when it is constructed
+        (load/update/reset), so a loaded configuration is a valid one.
+        
         Returns:
             True if configuration is valid
         """
         try:
-            self.config.dict()
-            return True
+            return self.config is not None
         except Exception:
             return False
 
+
+
+# Process-wide managers keyed by resolved config path (see ConfigManager.for_path)
+_MANAGERS: Dict[Optional[Path], ConfigManager] = {}
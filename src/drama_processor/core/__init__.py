@@ -5,7 +5,7 @@ from .encoder import VideoEncoder
 from .analyzer import VideoAnalyzer
 
 from .segments import SegmentBuilder
-from .overlay import TextOverlay
+from .overlay import EpisodeSpec, JitterTable, TextOverlay
 
 __all__ = [
     "DramaProcessor",
@@ -14,5 +14,7 @@ __all__ = [
 
     "SegmentBuilder",
     "TextOverlay",
+    "EpisodeSpec",
+    "JitterTable",
 ]
 
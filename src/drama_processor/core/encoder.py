@@ -7,18 +7,166 @@ import tempfile
 import shutil
 import subprocess
 import shlex
+import signal
 import random
 import math
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any
-from collections import Counter
+from collections import Counter, deque
+
+try:
+    import psutil
+except ImportError:  # pragma: no cover - psutil 为可选依赖
+    psutil = None
 
 from ..models.config import ProcessingConfig
-from ..utils.video import probe_video_stream, probe_duration
-from ..utils.files import write_text_file, ensure_dir, md5_of_text, md5_of_file
+from ..utils.video import cached_probe, escape_filter_value, probe_duration
+from ..utils.files import (write_text_file, ensure_dir, md5_of_text, md5_of_file,
+                           quick_file_signature, link_or_copy)
 from ..utils.time import human_duration
 
 
+# 滤镜图超过该长度时改为写入脚本文件传给 ffmpeg，避免命令行过长
+_FILTER_SCRIPT_THRESHOLD = 4096
+
+# ffmpeg 输出只保留末尾部分用于报错（按读取块数 / 行数截断）
+_OUTPUT_TAIL_CHUNKS = 16
+_OUTPUT_TAIL_LINES = 200
+
+# 单次 ffmpeg 调用的默认超时（秒）：单个片段 / 尾部 / 拼接
+_FFMPEG_TIMEOUT = 300.0
+# 整条素材单进程编码时，按素材时长放宽超时：每秒素材额外允许的编码时间（秒）
+_TIMEOUT_PER_MEDIA_SECOND = 4.0
+
+# 并发 ffprobe 的最大线程数
+_PROBE_WORKERS = 8
+
+# libx264 编码线程上限（再多收益很小，只会增加内存与延迟）
+_MAX_CODEC_THREADS = 16
+
+# 硬件编码器对应的硬件解码方式（解码后自动下载到内存，CPU 滤镜无需改动）
+_HWACCEL_FOR_ENCODER = {
+    "h264_nvenc": "cuda",
+    "h264_videotoolbox": "videotoolbox",
+    "h264_vaapi": "vaapi",
+}
+
+
+def _physical_cores() -> int:
+    """Physical CPU cores (logical count when psutil is unavailable)."""
+    if psutil is not None:
+        cores = psutil.cpu_count(logical=False)
+        if cores:
+            return cores
+    return os.cpu_count() or 1
+
+
+@lru_cache(maxsize=None)
+def _ffmpeg_query(flag: str) -> Optional[str]:
+    """Output of ``ffmpeg -hide_banner <flag>`` (e.g. -encoders, -hwaccels), queried once per process."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", flag],
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    return result.stdout if result.returncode == 0 else None
+
+
+@lru_cache(maxsize=1)
+def _available_hwaccels() -> Optional[frozenset]:
+    """Hardware decoders reported by ``ffmpeg -hwaccels`` (None if unknown)."""
+    output = _ffmpeg_query("-hwaccels")
+    if output is None:
+        return None
+    # 输出首行为 "Hardware acceleration methods:"，其后每行一个名称
+    return frozenset(line.strip() for line in output.splitlines()[1:] if line.strip())
+
+
+@lru_cache(maxsize=None)
+def _test_codec(codec: str) -> bool:
+    """Test if a hardware codec actually works by doing a quick encoding test."""
+    try:
+        # Create a simple test pattern and try to encode it
+        test_cmd = [
+            "ffmpeg", "-hide_banner", "-nostdin", "-y", "-f", "lavfi",
+            "-i", "testsrc=duration=1:size=320x240:rate=1",
+            "-c:v", codec, "-t", "0.1", "-f", "null", "-"
+        ]
+        
+        result = subprocess.run(
+            test_cmd,
+            capture_output=True,
+            text=True,
+            timeout=15
+        )
+        
+        # Encoding succeeded only if ffmpeg exited cleanly (driver/API errors exit non-zero)
+        return result.returncode == 0
+            
+    except (subprocess.TimeoutExpired, Exception):
+        return False
+
+
+@lru_cache(maxsize=None)
+def _detect_hw_codec_cached(preferred_codec: str) -> str:
+    """Pick the first working hardware encoder; cached per preferred codec for the process lifetime."""
+    # Priority order for WSL/Windows environment
+    codec_priority = [
+        "h264_nvenc",    # NVIDIA GPU (most common in WSL)
+        "h264_qsv",      # Intel Quick Sync Video
+        "h264_amf",      # AMD GPU
+        "h264_videotoolbox",  # macOS (if running on Mac)
+        "h264_vaapi",    # Linux VA-API (pure Linux)
+    ]
+    
+    # If user specified a codec, try it first
+    if preferred_codec and preferred_codec != "auto":
+        codec_priority.insert(0, preferred_codec)
+    
+    # Check which codecs are available
+    try:
+        available_encoders = _ffmpeg_query("-encoders")
+        if available_encoders is None:
+            print("⚠️ 无法检测编码器，使用默认配置")
+            return preferred_codec or "libx264"
+        
+        for codec in codec_priority:
+            if codec in available_encoders:
+                # Test if the codec actually works
+                if _test_codec(codec):
+                    print(f"✅ 检测到可用的硬件编码器: {codec}")
+                    return codec
+                else:
+                    print(f"⚠️ 硬件编码器 {codec} 不可用，继续检测...")
+        
+        print("⚠️ 未检测到可用的硬件编码器，将使用软件编码")
+        return "libx264"
+            
+    except Exception as e:
+        print(f"⚠️ 编码器检测失败: {e}")
+        return preferred_codec or "libx264"
+
+
+@dataclass(frozen=True)
+class MaterialVariation:
+    """一条素材的随机画面/标题扰动，所有片段共用（同一素材内可复现）。"""
+
+    crop_pad: int
+    brightness: float
+    contrast: float
+    saturation: float
+    hue: float
+    title_color: str
+
+
 class VideoEncoder:
     """Video encoder for drama processing."""
     
@@ -46,87 +194,82 @@ class VideoEncoder:
         # Brand text settings (from config)
         self.config = config  # Keep reference to config for dynamic text selection
         self.use_brand_text = config.enable_brand_text
+        
+        # 物理核心数，用于分配软件编码线程
+        self._ncores = _physical_cores()
+        
+        # ffmpeg 支持的硬件解码方式（进程内只查询一次；未知时不传 -hwaccel）
+        self._hwaccels = _available_hwaccels() or frozenset()
+        
+        # 多条素材并发（jobs > 1）时，同一缓存文件只由一个线程构建，其余等待后复用
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._build_locks_guard = threading.Lock()
+        # 本进程内已按 refresh 重建过的尾部缓存（并发素材不重复刷新）
+        self._refreshed_tails: set = set()
+        
+        # ffprobe results keyed by (realpath, mtime)
+        self._probe_cache: Dict[Tuple[str, Optional[int]], Dict[str, Any]] = {}
     
     def _detect_best_hw_codec(self, preferred_codec: str) -> str:
-        """Detect the best available hardware codec for the current environment."""
-        # Priority order for WSL/Windows environment
-        codec_priority = [
-            "h264_nvenc",    # NVIDIA GPU (most common in WSL)
-            "h264_qsv",      # Intel Quick Sync Video
-            "h264_amf",      # AMD GPU
-            "h264_videotoolbox",  # macOS (if running on Mac)
-            "h264_vaapi",    # Linux VA-API (pure Linux)
-        ]
+        """Detect the best available hardware codec for the current environment.
         
-        # If user specified a codec, try it first
-        if preferred_codec and preferred_codec != "auto":
-            codec_priority.insert(0, preferred_codec)
+        The result is cached per process (see ``_detect_hw_codec_cached``), so
+        later encoder instances skip ``ffmpeg -encoders`` and the test encodes.
+        """
+        return _detect_hw_codec_cached(preferred_codec)
+    
+    def _probe(self, path: str) -> Dict[str, Any]:
+        """Probe a video with a per-encoder cache keyed by (realpath, mtime).
         
-        # Check which codecs are available
+        Misses go through cached_probe, i.e. the persistent ffprobe cache when enabled.
+        """
         try:
-            result = subprocess.run(
-                ["ffmpeg", "-encoders"], 
-                capture_output=True, 
-                text=True, 
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                available_encoders = result.stdout
-                for codec in codec_priority:
-                    if codec in available_encoders:
-                        # Test if the codec actually works
-                        if self._test_codec(codec):
-                            print(f"✅ 检测到可用的硬件编码器: {codec}")
-                            return codec
-                        else:
-                            print(f"⚠️ 硬件编码器 {codec} 不可用，继续检测...")
-                
-                print("⚠️ 未检测到可用的硬件编码器，将使用软件编码")
-                return "libx264"
-            else:
-                print("⚠️ 无法检测编码器，使用默认配置")
-                return preferred_codec or "libx264"
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
-            print(f"⚠️ 编码器检测失败: {e}")
-            return preferred_codec or "libx264"
+            key = (os.path.realpath(path), os.stat(path).st_mtime_ns)
+        except OSError:
+            key = (path, None)
+        info = self._probe_cache.get(key)
+        if info is None:
+            info = cached_probe(path)
+            self._probe_cache[key] = info
+        return info
     
-    def _test_codec(self, codec: str) -> bool:
-        """Test if a hardware codec actually works by doing a quick encoding test."""
+    def _duration(self, path: str) -> float:
+        """Cached duration of a video file."""
+        return self._probe(path)["duration"]
+    
+    def probe_many(self, paths: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """Probe several files concurrently (through the cache); None for failures."""
+        def probe_or_none(path: str) -> Optional[Dict[str, Any]]:
+            try:
+                return self._probe(path)
+            except Exception:
+                return None
+        
+        if len(paths) <= 1:
+            return [probe_or_none(path) for path in paths]
+        # ffprobe 是独立子进程，线程只负责等待，可安全并发
+        with ThreadPoolExecutor(max_workers=min(len(paths), _PROBE_WORKERS)) as executor:
+            return list(executor.map(probe_or_none, paths))
+    
+    def _episode_durations(self, episodes: List[str]) -> List[Optional[float]]:
+        """Durations of all episodes; None for episodes that cannot be probed."""
+        return [info["duration"] if info is not None else None for info in self.probe_many(episodes)]
+    
+    def _matches_target(self, src: str, ref_w: int, ref_h: int, fps: int) -> bool:
+        """Whether the source already has the target size and frame rate."""
         try:
-            # Create a simple test pattern and try to encode it
-            test_cmd = [
-                "ffmpeg", "-y", "-f", "lavfi", "-i", "testsrc=duration=1:size=320x240:rate=1",
-                "-c:v", codec, "-t", "0.1", "-f", "null", "-"
-            ]
-            
-            result = subprocess.run(
-                test_cmd,
-                capture_output=True,
-                text=True,
-                timeout=15
-            )
-            
-            # Check if encoding succeeded (return code 0) and no critical errors
-            if result.returncode == 0:
-                return True
-            else:
-                # Check for common hardware encoding errors
-                error_output = result.stderr.lower()
-                if any(error in error_output for error in [
-                    "driver does not support", "required nvenc api version",
-                    "minimum required nvidia driver", "could not open encoder",
-                    "function not implemented", "invalid argument"
-                ]):
-                    return False
-                return False
-                
-        except (subprocess.TimeoutExpired, Exception):
+            info = self._probe(src)
+        except Exception:
             return False
+        # 帧率需精确一致：29.97 等源仍需 fps 滤镜，否则与其它片段拼接时时基不一致
+        return info["w"] == ref_w and info["h"] == ref_h and abs(info["fps"] - fps) < 0.01
     
-    def run_ffmpeg(self, cmd: List[str], label: Optional[str] = None) -> subprocess.CompletedProcess:
-        """Run ffmpeg command with configurable logging verbosity."""
+    def run_ffmpeg(self, cmd: List[str], label: Optional[str] = None,
+                   timeout: Optional[float] = _FFMPEG_TIMEOUT) -> subprocess.CompletedProcess:
+        """Run ffmpeg command with configurable logging verbosity.
+        
+        timeout 为 None 时不限时。
+        """
         # Extract key operation info instead of full command
         operation = "FFmpeg处理"
         if label:
@@ -152,13 +295,7 @@ class VideoEncoder:
             print(f"🎬 {operation}...")
         
         t0 = time.time()
-        try:
-            # Use timeout to prevent hanging and capture output in real-time
-            r = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, 
-                             text=True, timeout=300)  # 5 minutes timeout
-        except subprocess.TimeoutExpired:
-            print(f"❌ {operation} 超时 (5分钟)")
-            raise RuntimeError(f"Command timed out after 5 minutes: {operation}")
+        r = self._spawn_ffmpeg(cmd, operation, timeout)
         dt = time.time() - t0
         
         if r.returncode == 0:
@@ -177,6 +314,61 @@ class VideoEncoder:
         
         return r
     
+    def _spawn_ffmpeg(self, cmd: List[str], operation: str,
+                      timeout: Optional[float] = _FFMPEG_TIMEOUT) -> subprocess.CompletedProcess:
+        """Run ffmpeg in its own process group, keeping only the tail of its output.
+        
+        ffmpeg writes progress to stderr continuously; only the last chunks are
+        kept (for error reporting) instead of buffering and decoding everything.
+        Banner and (unless verbose) info-level logging are suppressed.
+        """
+        if os.path.basename(cmd[0]).startswith("ffmpeg"):
+            quiet = ["-hide_banner", "-nostdin"]
+            if not self.config.verbose:
+                quiet += ["-loglevel", "error"]
+            cmd = [cmd[0], *quiet, *cmd[1:]]
+        proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT, start_new_session=True)
+        chunks: deque = deque(maxlen=_OUTPUT_TAIL_CHUNKS)
+        reader = threading.Thread(
+            target=lambda: chunks.extend(iter(lambda: proc.stdout.read1(65536), b"")),
+            daemon=True,
+        )
+        reader.start()
+        try:
+            # Use timeout to prevent hanging
+            proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._kill_process_group(proc)
+            print(f"❌ {operation} 超时 ({human_duration(timeout)})")
+            raise RuntimeError(f"Command timed out after {timeout:g}s: {operation}")
+        finally:
+            reader.join(timeout=5)
+            proc.stdout.close()
+        
+        text = b"".join(chunks).decode("utf-8", errors="replace").replace("\r", "\n")
+        output = "\n".join(text.splitlines()[-_OUTPUT_TAIL_LINES:])
+        return subprocess.CompletedProcess(cmd, proc.returncode, stdout=output)
+    
+    @staticmethod
+    def _kill_process_group(proc: subprocess.Popen) -> None:
+        """Terminate ffmpeg and anything it spawned; escalate to SIGKILL if needed."""
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(proc.pid, signal.SIGTERM)
+                proc.wait(timeout=5)
+                return
+            except ProcessLookupError:
+                return
+            except subprocess.TimeoutExpired:
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    return
+        else:
+            proc.kill()
+        proc.wait()
+    
     def even(self, x: int) -> int:
         """Ensure even number for video dimensions."""
         return x if x % 2 == 0 else x - 1
@@ -185,191 +377,450 @@ class VideoEncoder:
         """Convert text to vertical layout."""
         if "\n" in text:
             return text
-        return "\n".join(list(text))
+        return "\n".join(text)
+    
+    def pick_variation(self, seed: Optional[str] = None) -> MaterialVariation:
+        """Draw the crop/color/title-color variation for one material.
+        
+        seed: makes the draw reproducible (used with the segment cache so a
+        re-run of the same material produces the same filter graph).
+        """
+        rng = random.Random(seed) if seed is not None else random
+        return MaterialVariation(
+            crop_pad=rng.randint(0, 3),  # Light cropping for variation
+            brightness=round(rng.uniform(-0.02, 0.02), 3),
+            contrast=round(rng.uniform(0.98, 1.02), 3),
+            saturation=round(rng.uniform(0.98, 1.02), 3),
+            hue=round(rng.uniform(-5, 5), 2),
+            title_color=rng.choice(self.title_colors),
+        )
     
     def build_overlay_filters(self, ref_w: int, ref_h: int, fps: int, fontfile: str,
                             drama_name: str, footer_text: str, side_text: str,
-                            workdir: str, fast_mode: bool, material_idx: Optional[int] = None) -> str:
-        """Build video filter string with text overlays."""
+                            workdir: str, fast_mode: bool, material_idx: Optional[int] = None,
+                            source_matches: bool = False,
+                            text_files: Optional[Dict[str, str]] = None,
+                            variation: Optional[MaterialVariation] = None) -> str:
+        """Build video filter string with text overlays.
+        
+        source_matches: the source already has the target size and fps, so
+        scale/fps are identity operations and are left out of the graph.
+        text_files: overlay text files from write_overlay_text_files; written
+        on demand when not given.
+        variation: the material's variation from pick_variation; drawn on
+        demand when not given.
+        """
+        if text_files is None:
+            text_files = self.write_overlay_text_files(workdir, drama_name, footer_text,
+                                                       side_text, material_idx)
+        if variation is None:
+            variation = self.pick_variation()
+        base = self._build_variation_filters(ref_w, ref_h, fps, fast_mode, variation, source_matches)
+        text_filters = self._build_text_filters(ref_h, fontfile, text_files, variation)
+        return ",".join([base] + text_filters if base else text_filters)
+    
+    def _overlay_signature(self, ref_w: int, ref_h: int, fps: int, fontfile: str,
+                           text_files: Dict[str, str], variation: MaterialVariation,
+                           fast_mode: bool, source_matches: bool) -> str:
+        """Workdir-independent signature of the overlay filters, for cache keys.
+        
+        Built from the unescaped inputs: text files enter by content hash
+        instead of path, so the per-run temp dir never reaches the key.
+        """
+        text_sigs = {name: f"{name}-{md5_of_file(Path(path))}" for name, path in text_files.items()}
+        base = self._build_variation_filters(ref_w, ref_h, fps, fast_mode, variation, source_matches)
+        text_filters = self._build_text_filters(ref_h, fontfile, text_sigs, variation)
+        return ",".join([base] + text_filters if base else text_filters)
+    
+    def write_overlay_text_files(self, workdir: str, drama_name: str, footer_text: str,
+                                 side_text: str, material_idx: Optional[int] = None) -> Dict[str, str]:
+        """Write the drawtext text files for one material.
+        
+        File names are derived from the content, so identical texts share one
+        file and files that already exist are not rewritten.
+        
+        Returns:
+            Mapping of "title" / "bottom" / "side" (/ "brand") to file paths
+        """
+        texts = {
+            "title": f"《{drama_name}》",
+            "bottom": footer_text,
+            "side": self.to_vertical(side_text),
+        }
+        # Add brand text overlay (same position and style as watermark would be)
+        if self.use_brand_text:
+            # Get brand text for current material
+            if material_idx is not None:
+                brand_text = self.config.get_brand_text_for_material(material_idx)
+            else:
+                brand_text = self.config.brand_text
+            texts["brand"] = self.to_vertical(brand_text)
+        
+        text_files = {}
+        for name, text in texts.items():
+            path = os.path.join(workdir, f"{name}_{md5_of_text(text)[:8]}.txt")
+            if not os.path.isfile(path):
+                write_text_file(path, text)
+            text_files[name] = path
+        return text_files
+    
+    def _build_variation_filters(self, ref_w: int, ref_h: int, fps: int, fast_mode: bool,
+                                 variation: MaterialVariation, source_matches: bool = False) -> str:
+        """fps/scale/pad to the canvas plus the material's crop and color variation."""
         # Base video processing filters
-        base_filters = [f"scale={ref_w}:{ref_h}:force_original_aspect_ratio=decrease"]
-        crop_pad = random.randint(0, 3)  # Light cropping for variation
+        # fps 放在最前：被丢弃的帧不再经过 scale/crop/pad/eq/hue
+        base_filters = []
+        if not source_matches:
+            base_filters.append(f"fps={fps}")
+            base_filters.append(f"scale={ref_w}:{ref_h}:force_original_aspect_ratio=decrease")
+        crop_pad = variation.crop_pad
         if crop_pad > 0:
             base_filters.append(f"crop=iw-2*{crop_pad}:ih-2*{crop_pad}:{crop_pad}:{crop_pad}")
-        base_filters.append(f"pad={ref_w}:{ref_h}:(ow-iw)/2:(oh-ih)/2")
-        base_filters.append(f"fps={fps}")
+        if crop_pad > 0 or not source_matches:
+            base_filters.append(f"pad={ref_w}:{ref_h}:(ow-iw)/2:(oh-ih)/2")
 
         # Color adjustments (skip in fast mode)
+        # 取整后恰为恒等的系数不生成滤镜，省去一次整帧处理
         if not fast_mode:
-            brightness = round(random.uniform(-0.02, 0.02), 3)
-            contrast = round(random.uniform(0.98, 1.02), 3)
-            saturation = round(random.uniform(0.98, 1.02), 3)
-            hue = round(random.uniform(-5, 5), 2)
-            base_filters.append(f"eq=brightness={brightness}:contrast={contrast}:saturation={saturation}")
-            base_filters.append(f"hue=h={hue}")
-
-        base = ",".join(base_filters)
+            if variation.brightness or variation.contrast != 1.0 or variation.saturation != 1.0:
+                base_filters.append(f"eq=brightness={variation.brightness}:contrast={variation.contrast}"
+                                    f":saturation={variation.saturation}")
+            if variation.hue:
+                base_filters.append(f"hue=h={variation.hue}")
 
+        return ",".join(base_filters)
+    
+    def _build_text_filters(self, ref_h: int, fontfile: str, text_files: Dict[str, str],
+                            variation: MaterialVariation) -> List[str]:
+        """drawtext filters for title, footer, side text and (optionally) brand text."""
         # Text overlay setup
         title_fs, bottom_fs, side_fs = self.title_font_size, self.bottom_font_size, self.side_font_size
         margin = max(12, int(ref_h * 0.037))
 
-        title_txt = os.path.join(workdir, "title.txt")
-        bottom_txt = os.path.join(workdir, "bottom.txt")
-        side_txtf = os.path.join(workdir, "side.txt")
-
-        write_text_file(title_txt, f"《{drama_name}》")
-        write_text_file(bottom_txt, footer_text)
-        write_text_file(side_txtf, self.to_vertical(side_text))
-
-        title_color = random.choice(self.title_colors)
+        title_color = variation.title_color
+        font = escape_filter_value(fontfile)
+        src = {name: escape_filter_value(path) for name, path in text_files.items()}
 
         # Text overlay filters
         dt_top = (
-            f"drawtext=fontfile='{fontfile}':textfile='{title_txt}':fontsize={title_fs}:"
+            f"drawtext=fontfile={font}:textfile={src['title']}:fontsize={title_fs}:"
             f"fontcolor={title_color}@0.9:shadowx=1:shadowy=1:box=0:"
             f"x=(w-text_w)/2:y={margin + 20}"
         )
         dt_bottom = (
-            f"drawtext=fontfile='{fontfile}':textfile='{bottom_txt}':fontsize={bottom_fs}:"
+            f"drawtext=fontfile={font}:textfile={src['bottom']}:fontsize={bottom_fs}:"
             f"fontcolor=white@0.85:box=0:"
             f"x=(w-text_w)/2:y=h-text_h-{margin + 120}"
         )
         dt_side = (
-            f"drawtext=fontfile='{fontfile}':textfile='{side_txtf}':fontsize={side_fs}:"
+            f"drawtext=fontfile={font}:textfile={src['side']}:fontsize={side_fs}:"
             f"fontcolor=white@0.85:box=0:"
             f"x=w-text_w-{margin}:y={margin + 200}"
         )
         
-        filters = [base, dt_top, dt_bottom, dt_side]
+        filters = [dt_top, dt_bottom, dt_side]
         
-        # Add brand text overlay (same position and style as watermark would be)
-        if self.use_brand_text:
-            # Get brand text for current material
-            if material_idx is not None:
-                brand_text = self.config.get_brand_text_for_material(material_idx)
-            else:
-                brand_text = self.config.brand_text
-            
-            brand_txt = os.path.join(workdir, "brand.txt")
-            write_text_file(brand_txt, self.to_vertical(brand_text))
-            
+        if "brand" in text_files:
             dt_brand = (
-                f"drawtext=fontfile='{fontfile}':textfile='{brand_txt}':fontsize={side_fs}:"
+                f"drawtext=fontfile={font}:textfile={src['brand']}:fontsize={side_fs}:"
                 f"fontcolor=white@0.85:box=0:"
                 f"x={margin}:y={margin + 200}"
             )
             filters.append(dt_brand)
 
-        return ",".join(filters)
+        return filters
+    
+    def _use_watermark(self) -> bool:
+        """Watermark is used only if brand text is disabled and the watermark file exists."""
+        return bool(not self.use_brand_text and
+                    self.watermark_path and
+                    os.path.exists(self.watermark_path))
+    
+    def _watermark_overlay(self, ref_w: int, ref_h: int, wm_input: int, main_label: str, out_label: str) -> str:
+        """filter_complex fragment that overlays the watermark input on main_label."""
+        # Calculate watermark size and position
+        watermark_width = int(ref_w * 0.08)  # 8% of video width
+        text_margin = max(12, int(ref_h * 0.037))  # Same margin as text overlays
+        
+        # Position watermark to match text positioning:
+        # - Left margin same as right text's right margin
+        # - Top margin same as title's top margin
+        watermark_x = text_margin  # Same as right text distance from right edge
+        watermark_y = text_margin + 20  # Same as title distance from top
+        
+        return (
+            f"[{wm_input}:v]scale={watermark_width}:-1[wm];"
+            f"[{main_label}][wm]overlay={watermark_x}:{watermark_y}:format=auto[{out_label}]"
+        )
+    
+    def _filter_args(self, graph: str, workdir: str, complex_graph: bool) -> List[str]:
+        """-vf / -filter_complex arguments; long graphs go through a script file."""
+        if len(graph) <= _FILTER_SCRIPT_THRESHOLD:
+            return ["-filter_complex" if complex_graph else "-vf", graph]
+        
+        fd, script_path = tempfile.mkstemp(prefix="filter_", suffix=".txt", dir=workdir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(graph)
+        return ["-filter_complex_script" if complex_graph else "-filter_script:v", script_path]
+    
+    def _hwaccel_args(self, vcodec: str, hw: bool) -> List[str]:
+        """Input options for hardware decoding (placed before each -i of a source video)."""
+        if not hw or not self.config.video.hw_decode:
+            return []
+        hwaccel = _HWACCEL_FOR_ENCODER.get(vcodec)
+        if not hwaccel or hwaccel not in self._hwaccels:
+            return []
+        return ["-hwaccel", hwaccel]
+    
+    def _thread_args(self, vcodec: str, hw: bool, filter_threads: int, workers: int = 1) -> List[str]:
+        """Thread budgets: filter graph threads plus encoder threads.
+        
+        libx264 gets ``config.encoder_threads`` if set, otherwise the physical
+        cores shared among the ``workers`` ffmpeg processes of a material and
+        the ``jobs`` materials running at once (capped at _MAX_CODEC_THREADS); VideoToolbox
+        ignores extra threads, so it gets one. Other hardware encoders keep
+        ffmpeg's default.
+        """
+        args = [
+            "-filter_threads", str(filter_threads),
+            "-filter_complex_threads", str(filter_threads),
+        ]
+        if vcodec == "h264_videotoolbox":
+            args += ["-threads", "1"]
+        elif not hw:
+            concurrent = max(1, workers) * max(1, self.config.jobs)
+            codec_threads = (self.config.encoder_threads or
+                             min(_MAX_CODEC_THREADS, max(1, self._ncores // concurrent)))
+            args += ["-threads", str(codec_threads)]
+        return args
+    
+    def _encode_args(self, vcodec: str, hw: bool, out_path: str) -> List[str]:
+        """Video/audio codec and muxer arguments shared by all re-encoding steps.
+        
+        Intermediate ``.ts`` outputs are written as MPEG-TS (no faststart pass),
+        so they can later be joined with the concat protocol.
+        """
+        args = ["-c:v", vcodec, "-profile:v", self.config.video.profile]
+        if hw:
+            args += ["-level", self.config.video.hw_level, "-tag:v", self.config.video.tag, "-b:v", self.bitrate, 
+                    "-maxrate", self.config.video.max_rate, "-bufsize", self.config.video.buffer_size]
+        else:
+            args += ["-level", self.config.video.sw_level, "-preset", self.config.video.preset, "-crf", self.soft_crf, 
+                    "-pix_fmt", self.config.video.pixel_format]
+        args += ["-c:a", "aac", "-b:a", self.audio_br, "-ar", str(self.audio_sr)]
+        if out_path.endswith(".ts"):
+            # 容器标签（avc1 等）在拼接成 mp4 时由 mp4 muxer 写入
+            if "-tag:v" in args:
+                i = args.index("-tag:v")
+                del args[i:i + 2]
+            args += ["-f", "mpegts"]
+        else:
+            args += ["-movflags", "+faststart"]
+        return args
+    
+    def _run_with_hw_fallback(self, build_cmd, use_hw: bool, label: str,
+                              timeout: Optional[float] = _FFMPEG_TIMEOUT) -> bool:
+        """Run build_cmd(vcodec, hw); fall back to x264 if hardware encoding fails.
+        
+        timeout 同时作用于硬编尝试与 x264 回退。
+        
+        Returns:
+            True if the hardware encoder produced the output, False if x264 did
+        """
+        try:
+            if use_hw:
+                # Try hardware encoding first
+                result = self.run_ffmpeg(build_cmd(self.video_codec_hw, True), label=label, timeout=timeout)
+                # Check if hardware encoding actually failed
+                if result.returncode != 0:
+                    raise Exception("Hardware encoding failed")
+                return True
+            self.run_ffmpeg(build_cmd(self.video_codec_sw, False), label=label, timeout=timeout)
+            return False
+        except Exception as e:
+            if use_hw:
+                print("⚠️ 硬编失败，回退到 x264 软编…")
+                self.run_ffmpeg(build_cmd(self.video_codec_sw, False), label=label+"(fallback-x264)",
+                                timeout=timeout)
+                return False
+            raise
     
     def build_base_vf(self, ref_w: int, ref_h: int, fps: int) -> str:
         """Build basic video filter for tail normalization."""
         return (
-            f"scale={ref_w}:{ref_h}:force_original_aspect_ratio=decrease,"
-            f"pad={ref_w}:{ref_h}:(ow-iw)/2:(oh-ih)/2,fps={fps}"
+            f"fps={fps},scale={ref_w}:{ref_h}:force_original_aspect_ratio=decrease,"
+            f"pad={ref_w}:{ref_h}:(ow-iw)/2:(oh-ih)/2"
         )
     
     def norm_and_trim(self, src: str, start_s: float, end_s: float, out_path: str,
                      ref_w: int, ref_h: int, fps: int, fontfile: str, drama_name: str,
                      footer_text: str, side_text: str, workdir: str, use_hw: bool,
                      seg_idx: int, seg_total: int, fast_mode: bool, filter_threads: int,
-                     material_idx: Optional[int] = None):
-        """Normalize and trim video segment with text overlay."""
+                     material_idx: Optional[int] = None,
+                     text_files: Optional[Dict[str, str]] = None,
+                     variation: Optional[MaterialVariation] = None,
+                     workers: int = 1):
+        """Normalize and trim video segment with text overlay.
+        
+        workers: number of segment encodes running concurrently (splits the
+        encoder thread budget).
+        """
         dur = max(0.01, end_s - start_s)
+        # 源已是目标规格时省掉 scale/fps（文字需烧录，仍要重新编码）
+        source_matches = self._matches_target(src, ref_w, ref_h, fps)
+        if variation is None:
+            variation = self.pick_variation()
+        if text_files is None:
+            text_files = self.write_overlay_text_files(workdir, drama_name, footer_text,
+                                                       side_text, material_idx)
+        vf = self.build_overlay_filters(ref_w, ref_h, fps, fontfile, drama_name, 
+                                      footer_text, side_text, workdir, fast_mode=fast_mode, 
+                                      material_idx=material_idx, source_matches=source_matches,
+                                      text_files=text_files, variation=variation)
+        
+        overlay_sig = ""
+        if self.config.segment_cache_dir:
+            overlay_sig = self._overlay_signature(ref_w, ref_h, fps, fontfile, text_files,
+                                                  variation, fast_mode, source_matches)
+        cache_path = self._segment_cache_path(src, start_s, end_s, ref_w, ref_h, fps,
+                                              overlay_sig, use_hw, out_path)
+        if cache_path and os.path.isfile(cache_path):
+            link_or_copy(cache_path, out_path)
+            print(f"🧩 复用片段缓存#{seg_idx}/{seg_total}：{os.path.basename(cache_path)}")
+            return
         
         def build_cmd(vcodec: str, hw: bool):
-            # Check if we should use watermark (only if brand text is disabled and watermark exists)
-            use_watermark = (not self.use_brand_text and 
-                           self.watermark_path and 
-                           os.path.exists(self.watermark_path))
-            
-            if use_watermark:
+            if self._use_watermark():
                 # Use filter_complex for watermark + text overlays
-                vf = self.build_overlay_filters(ref_w, ref_h, fps, fontfile, drama_name, 
-                                              footer_text, side_text, workdir, fast_mode=fast_mode, 
-                                              material_idx=material_idx)
-                
-                # Calculate watermark size and position
-                watermark_width = int(ref_w * 0.08)  # 8% of video width
-                text_margin = max(12, int(ref_h * 0.037))  # Same margin as text overlays
-                
-                # Position watermark to match text positioning:
-                # - Left margin same as right text's right margin
-                # - Top margin same as title's top margin
-                watermark_x = text_margin  # Same as right text distance from right edge
-                watermark_y = text_margin + 20  # Same as title distance from top
-                
-                # Build filter_complex that combines video processing with watermark overlay
-                filter_complex = (
-                    f"[0:v]{vf}[main];"
-                    f"[1:v]scale={watermark_width}:-1[wm];"
-                    f"[main][wm]overlay={watermark_x}:{watermark_y}:format=auto[out]"
-                )
+                filter_complex = f"[0:v]{vf}[main];" + self._watermark_overlay(ref_w, ref_h, 1, "main", "out")
                 
                 cmd = [
                     "ffmpeg", "-y",
                     "-ss", str(max(0, start_s)), "-t", str(dur),
+                    *self._hwaccel_args(vcodec, hw),
                     "-i", src,
                     "-i", self.watermark_path,
-                    "-filter_complex", filter_complex,
+                    *self._filter_args(filter_complex, workdir, complex_graph=True),
                     "-map", "[out]", "-map", "0:a",
-                    "-analyzeduration", "20M", "-probesize", "20M",
-                    "-sws_flags", "fast_bilinear",
-                    "-filter_threads", str(filter_threads),
-                    "-filter_complex_threads", str(filter_threads),
-                    "-c:v", vcodec,
-                    "-profile:v", self.config.video.profile,
                 ]
             else:
                 # Use text overlays (including brand text if enabled)
-                vf = self.build_overlay_filters(ref_w, ref_h, fps, fontfile, drama_name, 
-                                              footer_text, side_text, workdir, fast_mode=fast_mode, 
-                                              material_idx=material_idx)
                 cmd = [
                     "ffmpeg", "-y",
                     "-ss", str(max(0, start_s)), "-t", str(dur),
+                    *self._hwaccel_args(vcodec, hw),
                     "-i", src,
-                    "-vf", vf,
-                    "-analyzeduration", "20M", "-probesize", "20M",
-                    "-sws_flags", "fast_bilinear",
-                    "-filter_threads", str(filter_threads),
-                    "-filter_complex_threads", str(filter_threads),
-                    "-c:v", vcodec,
-                    "-profile:v", self.config.video.profile,
+                    *self._filter_args(vf, workdir, complex_graph=False),
                 ]
             
-            if hw:
-                cmd += ["-level", self.config.video.hw_level, "-tag:v", self.config.video.tag, "-b:v", self.bitrate, 
-                       "-maxrate", self.config.video.max_rate, "-bufsize", self.config.video.buffer_size]
-            else:
-                cmd += ["-level", self.config.video.sw_level, "-preset", self.config.video.preset, "-crf", self.soft_crf, 
-                       "-pix_fmt", self.config.video.pixel_format]
-            cmd += ["-c:a", "aac", "-b:a", self.audio_br, "-ar", str(self.audio_sr), 
-                   "-movflags", "+faststart", out_path]
-            return cmd
+            cmd += [
+                "-analyzeduration", "20M", "-probesize", "20M",
+                "-sws_flags", "fast_bilinear",
+                *self._thread_args(vcodec, hw, filter_threads, workers),
+            ]
+            return cmd + self._encode_args(vcodec, hw, out_path) + [out_path]
         
         if seg_total == 1:
             label = f"规范化片段"
         else:
             label = f"规范化片段#{seg_idx}/{seg_total}"
-        t0 = time.time()
+        used_hw = self._run_with_hw_fallback(build_cmd, use_hw, label)
+        if cache_path and used_hw != use_hw:
+            # 硬编失败回退到 x264：按实际编码器入缓存，避免之后的硬编运行复用软编片段
+            cache_path = self._segment_cache_path(src, start_s, end_s, ref_w, ref_h, fps,
+                                                  overlay_sig, used_hw, out_path)
+        if cache_path:
+            self._store_segment_cache(out_path, cache_path)
+    
+    def _segment_cache_path(self, src: str, start_s: float, end_s: float, ref_w: int, ref_h: int,
+                            fps: int, overlay_sig: str, use_hw: bool, out_path: str) -> Optional[str]:
+        """Content-addressed cache entry for one normalized segment (None if the cache is off).
+        
+        overlay_sig comes from _overlay_signature (no per-run paths); use_hw
+        is the encoder that actually produced (or will produce) the segment.
+        """
+        cache_dir = self.config.segment_cache_dir
+        if not cache_dir:
+            return None
         try:
-            if use_hw:
-                # Try hardware encoding first
-                result = self.run_ffmpeg(build_cmd(self.video_codec_hw, True), label=label)
-                # Check if hardware encoding actually failed
-                if result.returncode != 0:
-                    raise Exception("Hardware encoding failed")
-            else:
-                self.run_ffmpeg(build_cmd(self.video_codec_sw, False), label=label)
-        except Exception as e:
-            if use_hw:
-                print("⚠️ 硬编失败，回退到 x264 软编…")
-                self.run_ffmpeg(build_cmd(self.video_codec_sw, False), label=label+"(fallback-x264)")
+            src_sig = quick_file_signature(src)
+        except OSError:
+            return None
+        wm_sig = ""
+        if self._use_watermark():
+            try:
+                wm_sig = quick_file_signature(self.watermark_path)
+            except OSError:
+                return None
+        vcodec = self.video_codec_hw if use_hw else self.video_codec_sw
+        encode_sig = " ".join(self._encode_args(vcodec, use_hw, out_path))
+        key_str = (f"{os.path.abspath(src)}|{src_sig}|{start_s}|{end_s}|{ref_w}x{ref_h}@{fps}|"
+                   f"{overlay_sig}|{wm_sig}|{encode_sig}|{'hw' if use_hw else 'sw'}")
+        ensure_dir(cache_dir)
+        return os.path.join(cache_dir, f"seg_{md5_of_text(key_str)[:16]}{os.path.splitext(out_path)[1]}")
+    
+    @staticmethod
+    def _store_segment_cache(out_path: str, cache_path: str) -> None:
+        """Hard-link (or copy across filesystems) a fresh segment into the cache (best effort)."""
+        try:
+            link_or_copy(out_path, cache_path)
+        except OSError as e:
+            print("⚠️ 写入片段缓存失败：", e)
+    
+    def norm_and_trim_batch(self, segs: List[Tuple[str, float, float]], out_path: str,
+                            ref_w: int, ref_h: int, fps: int, fontfile: str, drama_name: str,
+                            footer_text: str, side_text: str, workdir: str, use_hw: bool,
+                            fast_mode: bool, filter_threads: int,
+                            material_idx: Optional[int] = None,
+                            text_files: Optional[Dict[str, str]] = None,
+                            variation: Optional[MaterialVariation] = None):
+        """Normalize, trim and join all segments in a single ffmpeg process.
+        
+        Each segment is its own accurately seeked input with its own variation
+        filters; the concat filter joins them and the text overlays are applied
+        once, so out_path is the already concatenated main video.
+        """
+        if variation is None:
+            variation = self.pick_variation()
+        
+        def build_cmd(vcodec: str, hw: bool):
+            cmd = ["ffmpeg", "-y"]
+            graph = []
+            concat_inputs = []
+            for i, (src, start_s, end_s) in enumerate(segs):
+                dur = max(0.01, end_s - start_s)
+                cmd += ["-ss", str(max(0, start_s)), "-t", str(dur), *self._hwaccel_args(vcodec, hw), "-i", src]
+                base = self._build_variation_filters(ref_w, ref_h, fps, fast_mode, variation,
+                                                     self._matches_target(src, ref_w, ref_h, fps))
+                # concat 要求各路参数一致：统一 SAR
+                graph.append(f"[{i}:v]{base + ',' if base else ''}setsar=1[v{i}]")
+                concat_inputs.append(f"[v{i}][{i}:a]")
+            
+            files = text_files
+            if files is None:
+                files = self.write_overlay_text_files(workdir, drama_name, footer_text,
+                                                      side_text, material_idx)
+            text_filters = self._build_text_filters(ref_h, fontfile, files, variation)
+            graph.append(f"{''.join(concat_inputs)}concat=n={len(segs)}:v=1:a=1[cv][ca]")
+            if self._use_watermark():
+                cmd += ["-i", self.watermark_path]
+                graph.append(f"[cv]{','.join(text_filters)}[main]")
+                graph.append(self._watermark_overlay(ref_w, ref_h, len(segs), "main", "out"))
             else:
-                raise
-        # Remove the extra completion print since run_ffmpeg already prints completion
+                graph.append(f"[cv]{','.join(text_filters)}[out]")
+            
+            cmd += [
+                *self._filter_args(";".join(graph), workdir, complex_graph=True),
+                "-map", "[out]", "-map", "[ca]",
+                "-sws_flags", "fast_bilinear",
+                *self._thread_args(vcodec, hw, filter_threads),
+            ]
+            return cmd + self._encode_args(vcodec, hw, out_path) + [out_path]
+        
+        # 单进程编码整条素材（数百秒），固定 5 分钟超时不够：按素材总时长放宽
+        total_media = sum(max(0.01, end_s - start_s) for _, start_s, end_s in segs)
+        timeout = _FFMPEG_TIMEOUT + total_media * _TIMEOUT_PER_MEDIA_SECOND
+        self._run_with_hw_fallback(build_cmd, use_hw, f"规范化片段x{len(segs)}(单进程)", timeout=timeout)
     
     def norm_tail(self, src: str, out_path: str, ref_w: int, ref_h: int, fps: int, 
                  use_hw: bool, filter_threads: int):
@@ -379,27 +830,16 @@ class VideoEncoder:
         def build_cmd(vcodec: str, hw: bool):
             cmd = [
                 "ffmpeg", "-y",
+                *self._hwaccel_args(vcodec, hw),
                 "-i", src,
                 "-vf", vf,
                 "-analyzeduration", "20M", "-probesize", "20M",
                 "-sws_flags", "fast_bilinear",
-                "-filter_threads", str(filter_threads),
-                "-filter_complex_threads", str(filter_threads),
-                "-c:v", vcodec,
-                "-profile:v", self.config.video.profile,
+                *self._thread_args(vcodec, hw, filter_threads),
             ]
-            if hw:
-                cmd += ["-level", self.config.video.hw_level, "-tag:v", self.config.video.tag, "-b:v", self.bitrate,
-                       "-maxrate", self.config.video.max_rate, "-bufsize", self.config.video.buffer_size]
-            else:
-                cmd += ["-level", self.config.video.sw_level, "-preset", self.config.video.preset, "-crf", self.soft_crf,
-                       "-pix_fmt", self.config.video.pixel_format]
-            cmd += ["-c:a", "aac", "-b:a", self.audio_br, "-ar", str(self.audio_sr),
-                   "-movflags", "+faststart", out_path]
-            return cmd
+            return cmd + self._encode_args(vcodec, hw, out_path) + [out_path]
         
-        self.run_ffmpeg(build_cmd(self.video_codec_hw, True) if use_hw else build_cmd(self.video_codec_sw, False), 
-                       label="尾部规范化")
+        self._run_with_hw_fallback(build_cmd, use_hw, "尾部规范化")
     
     def get_or_build_tail_norm(self, tail_src: str, ref_w: int, ref_h: int, fps: int,
                               use_hw: bool, cache_dir: str, refresh: bool, filter_threads: int) -> Optional[str]:
@@ -409,7 +849,8 @@ class VideoEncoder:
         
         ensure_dir(cache_dir)
         try:
-            file_sig = md5_of_file(tail_src)[:8]
+            # 大小 + mtime + 首尾采样哈希，不再对整个尾部视频做 MD5
+            file_sig = quick_file_signature(tail_src)
         except Exception:
             file_sig = "nosig"
         
@@ -417,16 +858,24 @@ class VideoEncoder:
         fp = md5_of_text(key_str)[:16]
         cache_path = os.path.join(cache_dir, f"tail_{fp}.mp4")
         
-        if os.path.isfile(cache_path) and not refresh:
-            print(f"🧩 复用尾部缓存：{cache_path}")
-            return cache_path
-        
-        tmp_out = cache_path + ".tmp.mp4"
+        with self._build_lock(cache_path):
+            refresh = refresh and cache_path not in self._refreshed_tails
+            if os.path.isfile(cache_path) and not refresh:
+                print(f"🧩 复用尾部缓存：{cache_path}")
+                return cache_path
+            return self._build_tail_norm(tail_src, cache_path, ref_w, ref_h, fps, use_hw, filter_threads)
+    
+    def _build_tail_norm(self, tail_src: str, cache_path: str, ref_w: int, ref_h: int, fps: int,
+                         use_hw: bool, filter_threads: int) -> Optional[str]:
+        """Normalize the tail into cache_path (caller holds the build lock)."""
+        # 临时文件名带上进程/线程，避免多个进程同时构建同一缓存时互相覆盖
+        tmp_out = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp.mp4"
         try:
             print("⚙️ 正在规范化尾部（构建/刷新缓存）…")
             t0 = time.time()
             self.norm_tail(tail_src, tmp_out, ref_w, ref_h, fps, use_hw=use_hw, filter_threads=filter_threads)
             os.replace(tmp_out, cache_path)
+            self._refreshed_tails.add(cache_path)
             print(f"✅ 尾部缓存就绪：{cache_path} | 用时 {human_duration(time.time()-t0)}")
             return cache_path
         except Exception as e:
@@ -438,7 +887,59 @@ class VideoEncoder:
                 pass
             return None
     
+    def _build_lock(self, path: str) -> threading.Lock:
+        """Per-file lock serializing cache builds across concurrent materials."""
+        with self._build_locks_guard:
+            return self._build_locks.setdefault(path, threading.Lock())
 
+    def _tail_ts_sidecar(self, tail_norm: str) -> Optional[str]:
+        """MPEG-TS copy of a cached normalized tail (remuxed once, kept next to the cache)."""
+        ts_path = os.path.splitext(tail_norm)[0] + ".ts"
+        with self._build_lock(ts_path):
+            if os.path.isfile(ts_path) and os.path.getmtime(ts_path) >= os.path.getmtime(tail_norm):
+                return ts_path
+            return self._remux_tail_ts(tail_norm, ts_path)
+    
+    def _remux_tail_ts(self, tail_norm: str, ts_path: str) -> Optional[str]:
+        """Remux the normalized tail to MPEG-TS (caller holds the build lock)."""
+        tmp_out = f"{ts_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            self.run_ffmpeg([
+                "ffmpeg", "-y", "-i", tail_norm,
+                "-c", "copy", "-bsf:v", "h264_mp4toannexb", "-f", "mpegts",
+                tmp_out
+            ], label="尾部TS缓存")
+            os.replace(tmp_out, ts_path)
+            return ts_path
+        except Exception as e:
+            print("⚠️ 尾部TS缓存失败，改用 concat demuxer：", e)
+            try:
+                if os.path.exists(tmp_out):
+                    os.remove(tmp_out)
+            except OSError:
+                pass
+            return None
+    
+    def concat_parts(self, paths: List[str], out_path: str, workdir: str, filter_threads: int):
+        """Concatenate normalized parts into out_path (stream copy, +faststart).
+        
+        When every part is an MPEG-TS file from the same encode settings, the
+        concat protocol joins them byte-wise without opening and indexing each
+        file; otherwise falls back to the concat demuxer.
+        """
+        if all(p.endswith(".ts") and "|" not in p and os.path.isfile(p) for p in paths):
+            self.run_ffmpeg([
+                "ffmpeg", "-y",
+                "-i", "concat:" + "|".join(paths),
+                "-c", "copy", "-bsf:a", "aac_adtstoasc", "-movflags", "+faststart",
+                out_path
+            ], label=f"concat->{os.path.basename(out_path)}")
+            return
+        
+        list_path = os.path.join(workdir, "list_main.txt")
+        self.write_ffconcat_list(paths, list_path)
+        self.concat_videos(list_path, out_path, filter_threads=filter_threads)
+    
     def concat_videos(self, list_file: str, out_path: str, filter_threads: int):
         """Concatenate videos using ffmpeg concat demuxer."""
         self.run_ffmpeg([
@@ -449,17 +950,27 @@ class VideoEncoder:
         ], label=f"concat->{os.path.basename(out_path)}")
     
     def write_ffconcat_list(self, paths: List[str], list_path: str):
-        """Write ffmpeg concat file list."""
-        with open(list_path, "w", encoding="utf-8") as f:
-            for p in paths:
-                esc = p.replace("'", r"\'")
-                f.write(f"file '{esc}'\n")
+        """Write ffmpeg concat file list.
+        
+        Every path must exist (fails before ffmpeg starts instead of mid-concat).
+        Quotes are escaped the ffconcat way: close the quote, add ``\\'``,
+        reopen (``'\\''``). The list is written with a single write().
+        """
+        missing = [p for p in paths if not os.path.isfile(p)]
+        if missing:
+            raise FileNotFoundError(f"拼接文件不存在: {', '.join(missing)}")
+        
+        content = "".join("file '" + p.replace("'", "'\\''") + "'\n" for p in paths)
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_CLOEXEC", 0)
+        fd = os.open(list_path, flags, 0o644)
+        with os.fdopen(fd, "wb") as f:
+            f.write(content.encode("utf-8"))
     
     def determine_reference_resolution(self, episodes: List[str], canvas: Optional[str]) -> Tuple[int, int]:
         """Determine reference resolution from episodes or canvas setting."""
         if canvas:
             if canvas.lower() == "first":
-                info = probe_video_stream(episodes[0])
+                info = self._probe(episodes[0])
                 return self.even(info["w"]), self.even(info["h"])
             elif "x" in canvas.lower():
                 w, h = canvas.lower().split("x")
@@ -469,9 +980,8 @@ class VideoEncoder:
         else:
             # Auto-detect most common resolution
             sizes = []
-            for ep in episodes:
-                info = probe_video_stream(ep)
-                if info["w"] and info["h"]:
+            for info in self.probe_many(episodes):
+                if info and info["w"] and info["h"]:
                     sizes.append((self.even(info["w"]), self.even(info["h"])))
             if not sizes:
                 raise ValueError("未能探测到任何有效分辨率")
@@ -483,14 +993,10 @@ class VideoEncoder:
             return requested_fps
         
         src_fps = 0.0
-        for ep in episodes:
-            try:
-                info = probe_video_stream(ep)
-                if info.get("fps"):
-                    src_fps = info["fps"]
-                    break
-            except Exception:
-                continue
+        for info in self.probe_many(episodes):
+            if info and info.get("fps"):
+                src_fps = info["fps"]
+                break
         
         if src_fps > 0:
             if src_fps < 40:
@@ -527,7 +1033,7 @@ class VideoEncoder:
         for i in range(start_ep_idx, len(episodes)):
             path = episodes[i]
             try:
-                dur = probe_duration(path)
+                dur = self._duration(path)
             except Exception:
                 continue
             seg_start = start_offset if i == start_ep_idx else 0.0
@@ -577,59 +1083,119 @@ class VideoEncoder:
             
         return segs
     
+    def _duration_suffix_sums(self, episodes: List[str]) -> Tuple[List[Optional[float]], List[float]]:
+        """Episode durations plus suffix sums (suffix[i] = total duration from episode i on).
+        
+        Episodes that cannot be probed count as 0 in the sums.
+        """
+        durations = self._episode_durations(episodes)
+        suffix = [0.0] * (len(durations) + 1)
+        for i in range(len(durations) - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + (durations[i] or 0.0)
+        return durations, suffix
+    
     def _calculate_available_duration(self, episodes: List[str], start_ep_idx: int, start_offset: float) -> float:
         """Calculate total available duration from given start point."""
-        total_duration = 0.0
-        for i in range(start_ep_idx, len(episodes)):
-            try:
-                dur = probe_duration(episodes[i])
-                if i == start_ep_idx:
-                    available = max(0.0, dur - start_offset)
-                else:
-                    available = dur
-                total_duration += available
-            except Exception:
-                continue
-        return total_duration
+        durations, suffix = self._duration_suffix_sums(episodes)
+        if start_ep_idx >= len(durations):
+            return 0.0
+        first = durations[start_ep_idx]
+        head = max(0.0, first - start_offset) if first is not None else 0.0
+        return head + suffix[start_ep_idx + 1]
     
     def _find_valid_start_point(self, episodes: List[str], min_sec: float, max_sec: float) -> Optional[Tuple[int, float]]:
         """Find a start point that can provide minimum required duration."""
+        durations, suffix = self._duration_suffix_sums(episodes)
+        
         # Try each episode as starting point
-        for ep_idx in range(len(episodes)):
-            try:
-                episode_duration = probe_duration(episodes[ep_idx])
-                
-                # Calculate maximum safe offset for this episode
-                available_from_ep = self._calculate_available_duration(episodes, ep_idx, 0.0)
-                
-                if available_from_ep < min_sec:
-                    continue  # This episode can't provide enough content even from start
-                
-                # Find maximum offset that still allows min_sec of content
-                max_safe_offset = episode_duration - min_sec
-                if max_safe_offset < 0:
-                    max_safe_offset = 0.0
-                
-                # Conservative offset: take from earlier in the episode
-                safe_offset = min(max_safe_offset, episode_duration * 0.1)  # Max 10% into episode
-                
-                # Verify this start point can provide minimum duration
-                available_duration = self._calculate_available_duration(episodes, ep_idx, safe_offset)
-                if available_duration >= min_sec:
-                    return (ep_idx, safe_offset)
-                    
-            except Exception:
+        for ep_idx, episode_duration in enumerate(durations):
+            if episode_duration is None:
                 continue
+            
+            if suffix[ep_idx] < min_sec:
+                continue  # This episode can't provide enough content even from start
+            
+            # Find maximum offset that still allows min_sec of content
+            max_safe_offset = max(0.0, episode_duration - min_sec)
+            
+            # Conservative offset: take from earlier in the episode
+            safe_offset = min(max_safe_offset, episode_duration * 0.1)  # Max 10% into episode
+            
+            # Verify this start point can provide minimum duration
+            available_duration = max(0.0, episode_duration - safe_offset) + suffix[ep_idx + 1]
+            if available_duration >= min_sec:
+                return (ep_idx, safe_offset)
         
         return None  # No valid start point found
     
+    def _segment_workers(self, seg_total: int, use_hw: bool) -> int:
+        """Number of segments of one material to encode concurrently."""
+        if use_hw and self.video_codec_hw == "h264_videotoolbox":
+            # VideoToolbox 的硬编会话基本是串行的，并发只会互相抢占
+            return 1
+        return max(1, min(seg_total, self.config.parallel_segments))
+    
+    def _norm_segments_and_concat(self, segs: List[Tuple[str, float, float]], out_path: str,
+                                  ref_w: int, ref_h: int, target_fps: int, fontfile: str,
+                                  drama_name: str, footer_text: str, side_text: str, workdir: str,
+                                  use_hw: bool, fast_mode: bool, filter_threads: int,
+                                  material_idx: int, text_files: Dict[str, str],
+                                  variation: MaterialVariation,
+                                  tail_path: Optional[str] = None) -> None:
+        """Normalize each segment with its own ffmpeg process, then concat them.
+        
+        tail_path, if given, is appended in the same concat step; it has been
+        normalized to the same canvas, fps and codec settings as the segments.
+        Segments are written as MPEG-TS so the concat needs no per-file indexing.
+        """
+        seg_total = len(segs)
+        workers = self._segment_workers(seg_total, use_hw)
+        # 并行时按并发度均分 filter 线程，避免总线程数成倍膨胀
+        seg_filter_threads = max(1, filter_threads // workers)
+        tmp_parts: List[Optional[str]] = [None] * seg_total
+        
+        def encode_segment(idx: int, ep_path: str, s: float, e: float) -> str:
+            tmp_out = os.path.join(workdir, f"norm_{idx:03d}.ts")
+            if seg_total > 1:
+                print(f"  📹 片段 {idx}/{seg_total}: {os.path.basename(ep_path)} ({s:.1f}s-{e:.1f}s)")
+            self.norm_and_trim(ep_path, s, e, tmp_out, ref_w, ref_h, target_fps, fontfile, 
+                             drama_name, footer_text, side_text, workdir, use_hw=use_hw, 
+                             seg_idx=idx, seg_total=seg_total, fast_mode=fast_mode, 
+                             filter_threads=seg_filter_threads, material_idx=material_idx,
+                             text_files=text_files, variation=variation, workers=workers)
+            return tmp_out
+        
+        if workers == 1:
+            for idx, (ep_path, s, e) in enumerate(segs, start=1):
+                tmp_parts[idx - 1] = encode_segment(idx, ep_path, s, e)
+        else:
+            print(f"⚡ 并行处理片段（并发 {workers}）")
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(encode_segment, idx, ep_path, s, e): idx
+                    for idx, (ep_path, s, e) in enumerate(segs, start=1)
+                }
+                for future in as_completed(futures):
+                    tmp_parts[futures[future] - 1] = future.result()
+
+        # Concatenate main segments (and tail)
+        t0 = time.time()
+        self.concat_parts(tmp_parts + [tail_path] if tail_path else tmp_parts, out_path,
+                          workdir, filter_threads=filter_threads)
+        print(f"⏱️ {'主片段+尾部' if tail_path else '主片段'}拼接: {human_duration(time.time()-t0)}")
+    
     def process_material(self, episodes: List[str], drama_name: str, start_ep_idx: int, start_offset: float,
                         min_sec: float, max_sec: float, out_path: str, reference_resolution: Tuple[int, int],
                         target_fps: int, fontfile: str, footer_text: str, side_text: str, use_hw: bool,
                         tail_video: Optional[Path], cover_image: Optional[Path],
                         temp_root: str, keep_temp: bool, tail_cache_dir: str, refresh_tail_cache: bool,
-                        material_idx: int, material_total: int, fast_mode: bool, filter_threads: int) -> Path:
-        """Process a single material with all processing steps."""
+                        material_idx: int, material_total: int, fast_mode: bool,
+                        filter_threads: int) -> Optional[Tuple[Path, Optional[float]]]:
+        """Process a single material with all processing steps.
+        
+        Returns:
+            (输出路径, 成品时长)；时长探测失败时为 None。无可用片段时返回 None。
+        """
         workdir = tempfile.mkdtemp(prefix="mat_", dir=temp_root)
         t0_all = time.time()
         print(f"🎬 开始素材 | 剧：{drama_name} | 第 {material_idx} / {material_total} 条 | 临时目录：{workdir}")
@@ -672,33 +1238,14 @@ class VideoEncoder:
                 print(f"📋 单片段: {ep_name}: {s_time:.1f}s-{e_time:.1f}s")
 
             # Process individual segments
-            tmp_parts = []
             seg_total = len(segs)
             if seg_total == 1:
                 print(f"📝 处理片段: {os.path.basename(segs[0][0])} ({segs[0][1]:.1f}s-{segs[0][2]:.1f}s)")
             else:
                 print(f"📝 处理 {seg_total} 个片段...")
             
-            for idx, (ep_path, s, e) in enumerate(segs, start=1):
-                tmp_out = os.path.join(workdir, f"norm_{idx:03d}.mp4")
-                if seg_total > 1:
-                    print(f"  📹 片段 {idx}/{seg_total}: {os.path.basename(ep_path)} ({s:.1f}s-{e:.1f}s)")
-                self.norm_and_trim(ep_path, s, e, tmp_out, ref_w, ref_h, target_fps, fontfile, 
-                                 drama_name, footer_text, side_text, workdir, use_hw=use_hw, 
-                                 seg_idx=idx, seg_total=seg_total, fast_mode=fast_mode, 
-                                 filter_threads=filter_threads, material_idx=material_idx)
-                tmp_parts.append(tmp_out)
-
-            # Concatenate main segments
-            list_path = os.path.join(workdir, "list_main.txt")
-            self.write_ffconcat_list(tmp_parts, list_path)
-            concat_main = os.path.join(workdir, "concat_main.mp4")
-            t0 = time.time()
-            self.concat_videos(list_path, concat_main, filter_threads=filter_threads)
-            print(f"⏱️ 主片段拼接: {human_duration(time.time()-t0)}")
-
-            # Add tail if specified
-            final_src = concat_main
+            # 先确定尾部是否可用，这样最后一步拼接可直接写出 out_path（省去一次整文件 remux）
+            tail_norm_cached = None
             if tail_file and os.path.isfile(tail_file):
                 tail_norm_cached = self.get_or_build_tail_norm(
                     tail_src=tail_file,
@@ -708,45 +1255,64 @@ class VideoEncoder:
                     refresh=refresh_tail_cache,
                     filter_threads=filter_threads
                 )
-                if tail_norm_cached and os.path.isfile(tail_norm_cached):
-                    list2 = os.path.join(workdir, "list_with_tail.txt")
-                    self.write_ffconcat_list([concat_main, tail_norm_cached], list2)
-                    final_with_tail = os.path.join(workdir, "concat_with_tail.mp4")
-                    t0 = time.time()
-                    self.concat_videos(list2, final_with_tail, filter_threads=filter_threads)
-                    print(f"⏱️ 拼接尾部 用时：{human_duration(time.time()-t0)}")
-                    final_src = final_with_tail
-                    print("ℹ️ 已追加尾部（缓存）：", tail_norm_cached)
-                else:
+                if not (tail_norm_cached and os.path.isfile(tail_norm_cached)):
                     print("⚠️ 尾部缓存不可用，跳过尾部。")
+                    tail_norm_cached = None
+            # 尾部的 TS 副本用于 concat 协议拼接；不可用时回退到原 mp4（concat demuxer）
+            tail_part = None
+            if tail_norm_cached:
+                tail_part = self._tail_ts_sidecar(tail_norm_cached) or tail_norm_cached
             else:
                 if tail_file:
                     print("⚠️ 指定的尾部文件不存在，跳过：", tail_file)
 
-            # Simple final copy with faststart (skip cover for now to fix duration issue)
-            t0 = time.time()
-            
-            self.run_ffmpeg([
-                "ffmpeg", "-y",
-                "-i", final_src,
-                "-c", "copy",
-                "-movflags", "+faststart",
-                out_path
-            ], label="最终输出")
-            print(f"⏱️ 最终封装: {human_duration(time.time()-t0)}")
+            # 文字文件每条素材只写一次，所有片段共用（也避免并行片段互相覆盖）
+            text_files = self.write_overlay_text_files(workdir, drama_name, footer_text,
+                                                       side_text, material_idx)
+            # 扰动参数每条素材抽取一次，各片段一致；启用片段缓存时按片段选择固定种子，重跑可命中缓存
+            variation_seed = None
+            if self.config.segment_cache_dir:
+                variation_seed = md5_of_text(f"{drama_name}|{segs}")
+            variation = self.pick_variation(variation_seed)
+
+            if self.config.single_pass_segments and seg_total > 1:
+                # 单个 ffmpeg 进程完成全部片段的规范化与拼接；有尾部时再拼接一次
+                concat_main = os.path.join(workdir, "concat_main.ts") if tail_part else out_path
+                t0 = time.time()
+                self.norm_and_trim_batch(segs, concat_main, ref_w, ref_h, target_fps, fontfile,
+                                         drama_name, footer_text, side_text, workdir, use_hw=use_hw,
+                                         fast_mode=fast_mode, filter_threads=filter_threads,
+                                         material_idx=material_idx, text_files=text_files,
+                                         variation=variation)
+                print(f"⏱️ 片段规范化+拼接: {human_duration(time.time()-t0)}")
+                
+                # Add tail if specified (concat 已带 +faststart，直接输出最终文件)
+                if tail_part:
+                    t0 = time.time()
+                    self.concat_parts([concat_main, tail_part], out_path, workdir,
+                                      filter_threads=filter_threads)
+                    print(f"⏱️ 拼接尾部 用时：{human_duration(time.time()-t0)}")
+            else:
+                # 各片段与尾部在同一次 concat 中直接拼接到 out_path
+                self._norm_segments_and_concat(segs, out_path, ref_w, ref_h, target_fps, fontfile,
+                                               drama_name, footer_text, side_text, workdir, use_hw,
+                                               fast_mode, filter_threads, material_idx, text_files,
+                                               variation, tail_path=tail_part)
+            if tail_norm_cached:
+                print("ℹ️ 已追加尾部（缓存）：", tail_norm_cached)
 
             dt_all = time.time() - t0_all
             
             # Get video duration for display
             try:
-                from ..utils.video import probe_duration
                 duration = probe_duration(out_path)
                 duration_str = human_duration(duration)
             except Exception:
+                duration = None
                 duration_str = "未知"
             
             print(f"✅ 素材完成 | 剧：{drama_name} | 第 {material_idx} 条 | 时长 {duration_str} | 输出：{out_path} | 用时 {human_duration(dt_all)}")
-            return Path(out_path)
+            return Path(out_path), duration
             
         finally:
             if not keep_temp:
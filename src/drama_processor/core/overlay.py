@@ -1,35 +1,174 @@
 """Text overlay processing module."""
 
+import functools
 import os
 import random
+import shutil
+import subprocess
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
-from ..utils.files import write_text_file
+from ..utils.files import ensure_dir, md5_of_text, quick_file_signature, write_text_file
+from ..utils.video import escape_filter_value
+
+# 滤镜模板（模块加载时构建一次，按 % 代入参数）
+_TITLE_TPL = ("drawtext=fontfile=%s:%s:fontsize=%s:fontcolor=%s@0.9:"
+              "shadowx=1:shadowy=1:box=0:x=(w-text_w)/2:y=%d")
+_BOTTOM_TPL = ("drawtext=fontfile=%s:%s:fontsize=%s:fontcolor=white@0.85:box=0:"
+               "x=(w-text_w)/2:y=h-text_h-%d")
+_SIDE_TPL = ("drawtext=fontfile=%s:%s:fontsize=%s:fontcolor=white@0.85:box=0:"
+             "x=w-text_w-%d:y=%d")
+# drawtext 文字来源：文件（reload=0 只在初始化时读一次）或短文字直接内联
+# （模板中的 fontfile/textfile 路径均先经 escape_filter_value 引号或转义）
+_TEXTFILE_SRC = "textfile=%s:reload=0"
+_INLINE_SRC = "text='%s'"
+_INLINE_MAX_LEN = 32
+# 内联时需要多层转义的字符，含任一字符的文字仍走 textfile
+_INLINE_UNSAFE = frozenset("'\\:%,;[]=\n")
+_TITLE_FONT_SIZE = 36
+_SIDE_FONT_SIZE = 28
+_SCALE_TPL = "scale=%s:%s:force_original_aspect_ratio=decrease"
+_CROP_TPL = "crop=iw-2*%d:ih-2*%d:%d:%d"
+_PAD_TPL = "pad=%s:%s:(ow-iw)/2:(oh-ih)/2"
+_EQ_TPL = "eq=brightness=%s:contrast=%s:saturation=%s"
+_HUE_TPL = "hue=h=%s"
+# 水印与预渲染文字以 -loop 1 作为无限长静态输入：位置只在初始化时求值，主画面结束即结束
+_STILL_OVERLAY_TPL = "overlay=%d:%d:format=auto:eval=init:shortest=1"
+
+# 预缩放水印 PNG 的默认缓存目录
+_DEFAULT_WATERMARK_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "drama_processor")
+
+
+@functools.lru_cache(maxsize=512)
+def _vertical(text: str) -> str:
+    if "\n" in text:
+        return text
+    return "\n".join(text)
+
+
+def _title_inline(drama_name: str) -> bool:
+    title = f"《{drama_name}》"
+    return len(title) <= _INLINE_MAX_LEN and not _INLINE_UNSAFE.intersection(title)
+
+
+def _title_source(drama_name: str, title_txt: Optional[str]) -> str:
+    """drawtext text source for the title: inline when short and safe, else its text file."""
+    if _title_inline(drama_name):
+        return _INLINE_SRC % f"《{drama_name}》"
+    return _TEXTFILE_SRC % escape_filter_value(title_txt)
+
+
+@dataclass(frozen=True)
+class _OverlayLayout:
+    """画布尺寸确定后不再变化的文字/水印位置（像素）。"""
+
+    margin: int
+    title_y: int
+    bottom_y_sub: int
+    side_y: int
+    watermark_width: int
+
+    @classmethod
+    def for_size(cls, ref_w: int, ref_h: int) -> "_OverlayLayout":
+        margin = max(12, int(ref_h * 0.037))
+        return cls(margin=margin, title_y=margin + 20, bottom_y_sub=margin + 120,
+                   side_y=margin + 200, watermark_width=int(ref_w * 0.08))
+
+
+@dataclass(frozen=True)
+class EpisodeSpec:
+    """build_many 的单集输入。"""
+
+    episode_id: str
+    fontfile: str
+    ref_w: int
+    ref_h: int
+    fps: int
+    drama_name: str
+    footer_text: str
+    side_text: str
+    workdir: str
+    fast_mode: bool = False
+
+
+@dataclass(frozen=True)
+class JitterTable:
+    """precompute_jitter 生成的一批扰动参数，第 i 行对应第 i 集。"""
+
+    crop_pad: List[int]
+    brightness: List[float]
+    contrast: List[float]
+    saturation: List[float]
+    hue: List[float]
+    color_idx: List[int]
+
+    def __len__(self) -> int:
+        return len(self.crop_pad)
 
 
 class TextOverlay:
     """Handles text overlay generation for videos."""
     
-    def __init__(self, watermark_path: Optional[str] = None, title_colors: Optional[List[str]] = None):
+    def __init__(self, watermark_path: Optional[str] = None, title_colors: Optional[List[str]] = None,
+                 cache_dir: Optional[str] = None):
         self.title_colors = title_colors or [
             "#FFA500", "#FFB347", "#FF8C00", "#FFD580", "#E69500", "#FFAE42",
         ]
+        self._ref_size: Optional[Tuple[int, int]] = None
+        self._layout: Optional[_OverlayLayout] = None
+        # 水印宽度 -> 预缩放水印路径（构建失败记为 None，不再重试）
+        self._scaled_watermarks: Dict[int, Optional[str]] = {}
         self.watermark_path = watermark_path
+        self.cache_dir = cache_dir or _DEFAULT_WATERMARK_CACHE_DIR
+        # 共享文字目录 -> 已写入的文字文件；相同文字的各集只写一次
+        self._text_file_cache: Dict[str, Tuple[Optional[str], str, str]] = {}
+        # (模板, fontfile, 文字, 模板参数, 画布宽高) -> 预渲染文字 PNG（失败记为 None，不再重试）
+        self._text_png_cache: Dict[Tuple[str, str, str, tuple, int, int], Optional[str]] = {}
+    
+    @property
+    def watermark_path(self) -> Optional[str]:
+        return self._watermark_path
+    
+    @watermark_path.setter
+    def watermark_path(self, path: Optional[str]) -> None:
+        # 水印是否可用只在设置路径时检查一次，构建滤镜时不再逐次 stat
+        self._watermark_path = path
+        self._watermark_ok = bool(path) and os.path.isfile(path)
+        self._scaled_watermarks = {}
+    
+    def cleanup(self) -> None:
+        """Remove the shared ``_text_<md5>`` directories written by this instance.
+        
+        Call once the ffmpeg jobs that read the text files have finished.
+        """
+        for shared in self._text_file_cache:
+            shutil.rmtree(shared, ignore_errors=True)
+        self._text_file_cache.clear()
+    
+    def set_reference_size(self, ref_w: int, ref_h: int) -> None:
+        """Fix the canvas size; margins and positions are computed here once."""
+        self._ref_size = (ref_w, ref_h)
+        self._layout = _OverlayLayout.for_size(ref_w, ref_h)
+    
+    def _layout_for(self, ref_w: int, ref_h: int) -> _OverlayLayout:
+        if self._ref_size != (ref_w, ref_h):
+            self.set_reference_size(ref_w, ref_h)
+        return self._layout
     
     def to_vertical(self, text: str) -> str:
         """Convert horizontal text to vertical layout."""
-        if "\n" in text:
-            return text
-        return "\n".join(list(text))
+        return _vertical(text)
     
-    def create_text_files(self, workdir: str, drama_name: str, footer_text: str, side_text: str) -> tuple:
-        """Create text files for overlay filters."""
-        title_txt = os.path.join(workdir, "title.txt")
-        bottom_txt = os.path.join(workdir, "bottom.txt")
-        side_txtf = os.path.join(workdir, "side.txt")
+    def create_text_files(self, workdir: str, drama_name: str, footer_text: str, side_text: str,
+                          include_title: bool = True) -> tuple:
+        """Create text files for overlay filters (title is None when not included)."""
+        title_txt = f"{workdir}/title.txt" if include_title else None
+        bottom_txt = f"{workdir}/bottom.txt"
+        side_txtf = f"{workdir}/side.txt"
 
-        write_text_file(title_txt, f"《{drama_name}》")
+        if title_txt:
+            write_text_file(title_txt, f"《{drama_name}》")
         write_text_file(bottom_txt, footer_text)
         write_text_file(side_txtf, self.to_vertical(side_text))
         
@@ -38,52 +177,60 @@ class TextOverlay:
     def build_text_overlays(self, fontfile: str, ref_w: int, ref_h: int, 
                            title_txt: str, bottom_txt: str, side_txtf: str,
                            title_font_size: int = 36, bottom_font_size: int = 28, 
-                           side_font_size: int = 28) -> List[str]:
+                           side_font_size: int = 28,
+                           rng: Optional[random.Random] = None,
+                           title_color: Optional[str] = None) -> List[str]:
         """Build text overlay filter strings."""
-        margin = max(12, int(ref_h * 0.037))
-        title_color = random.choice(self.title_colors)
-        
-        overlays = []
-        
-        # Title overlay (top center)
-        dt_top = (
-            f"drawtext=fontfile='{fontfile}':textfile='{title_txt}':fontsize={title_font_size}:"
-            f"fontcolor={title_color}@0.9:shadowx=1:shadowy=1:box=0:"
-            f"x=(w-text_w)/2:y={margin + 20}"
-        )
-        overlays.append(dt_top)
-        
-        # Bottom overlay (bottom center)
-        dt_bottom = (
-            f"drawtext=fontfile='{fontfile}':textfile='{bottom_txt}':fontsize={bottom_font_size}:"
-            f"fontcolor=white@0.85:box=0:"
-            f"x=(w-text_w)/2:y=h-text_h-{margin + 120}"
-        )
-        overlays.append(dt_bottom)
+        overlays: List[str] = []
+        self._append_text_overlays(overlays, fontfile, self._layout_for(ref_w, ref_h),
+                                   _TEXTFILE_SRC % escape_filter_value(title_txt),
+                                   bottom_txt, side_txtf, title_font_size, bottom_font_size, side_font_size,
+                                   rng=rng, title_color=title_color)
+        return overlays
+    
+    def _append_text_overlays(self, parts: List[str], fontfile: str, layout: _OverlayLayout,
+                              title_src: str, bottom_txt: str, side_txtf: str,
+                              title_font_size: int = 36, bottom_font_size: int = 28,
+                              side_font_size: int = 28,
+                              rng: Optional[random.Random] = None,
+                              title_color: Optional[str] = None) -> None:
+        """Append the title, bottom and side drawtext filters to parts.
         
-        # Side overlay (top right, vertical)
-        dt_side = (
-            f"drawtext=fontfile='{fontfile}':textfile='{side_txtf}':fontsize={side_font_size}:"
-            f"fontcolor=white@0.85:box=0:"
-            f"x=w-text_w-{margin}:y={margin + 200}"
+        title_src is the title's drawtext text source (see _title_source).
+        """
+        dt_bottom, dt_side = self._text_overlay_parts(
+            fontfile, layout, bottom_txt, side_txtf, bottom_font_size, side_font_size,
         )
-        overlays.append(dt_side)
-        
-        return overlays
+        # 只有标题颜色是随机的：标题按模板代入，其余部分按参数缓存
+        if title_color is None:
+            title_color = (rng or random).choice(self.title_colors)
+        parts.append(_TITLE_TPL % (escape_filter_value(fontfile), title_src, title_font_size, title_color, layout.title_y))
+        parts.append(dt_bottom)
+        parts.append(dt_side)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _text_overlay_parts(fontfile: str, layout: _OverlayLayout, bottom_txt: str, side_txtf: str,
+                            bottom_font_size: int, side_font_size: int) -> Tuple[str, str]:
+        """The deterministic bottom (center) and side (top right, vertical) drawtexts."""
+        font = escape_filter_value(fontfile)
+        dt_bottom = _BOTTOM_TPL % (font, _TEXTFILE_SRC % escape_filter_value(bottom_txt), bottom_font_size,
+                                   layout.bottom_y_sub)
+        dt_side = _SIDE_TPL % (font, _TEXTFILE_SRC % escape_filter_value(side_txtf), side_font_size,
+                               layout.margin, layout.side_y)
+        return dt_bottom, dt_side
     
     def build_watermark_overlay(self, ref_w: int, ref_h: int) -> Optional[str]:
         """Build watermark overlay filter string for use in filter chain."""
-        if not self.watermark_path or not os.path.exists(self.watermark_path):
+        if not self._watermark_ok:
             return None
             
-        # Calculate watermark size (8% of video width, maintain aspect ratio)
-        watermark_width = int(ref_w * 0.08)
         margin = 15  # 15px margin from edges
         
         # Create overlay filter that scales and positions watermark in top-left corner
         # This will be added to the main filter chain
         watermark_filter = (
-            f"overlay='{self.watermark_path}':x={margin}:y={margin}:"
+            f"overlay={escape_filter_value(self.watermark_path)}:x={margin}:y={margin}:"
             f"eval=init:format=auto:shortest=1"
         )
         
@@ -92,50 +239,320 @@ class TextOverlay:
     def build_overlay_filter_chain(self, fontfile: str, ref_w: int, ref_h: int, fps: int,
                                   drama_name: str, footer_text: str, side_text: str,
                                   workdir: str, fast_mode: bool = False) -> str:
-        """Build complete filter chain with text overlays."""
-        # Base video processing
-        base_filters = [f"scale={ref_w}:{ref_h}:force_original_aspect_ratio=decrease"]
+        """Build complete filter chain with text overlays.
         
-        # Random cropping for variation
-        crop_pad = random.randint(0, 3)
-        if crop_pad > 0:
-            base_filters.append(f"crop=iw-2*{crop_pad}:ih-2*{crop_pad}:{crop_pad}:{crop_pad}")
+        The text files are shared next to workdir (see cleanup()).
+        """
+        # 所有滤镜依次追加到同一个列表，最后一次 join
+        parts: List[str] = []
+        self._append_base(parts, ref_w, ref_h, fps, fast_mode)
+        self._append_text_overlays_for(parts, workdir, fontfile, self._layout_for(ref_w, ref_h),
+                                       drama_name, footer_text, side_text)
+        return ",".join(parts)
+    
+    def precompute_jitter(self, n: int, seed: Optional[int] = None) -> JitterTable:
+        """Draw the crop/color/title-color variation for n episodes at once.
+        
+        Always drawn from random.Random(seed), so the same seed yields the
+        same table in every environment. Rows are consumed with
+        build_overlay_filter_chain_idx.
+        """
+        rng = random.Random(seed)
+        return JitterTable(
+            crop_pad=[rng.randint(0, 3) for _ in range(n)],
+            brightness=[round(rng.uniform(-0.02, 0.02), 3) for _ in range(n)],
+            contrast=[round(rng.uniform(0.98, 1.02), 3) for _ in range(n)],
+            saturation=[round(rng.uniform(0.98, 1.02), 3) for _ in range(n)],
+            hue=[round(rng.uniform(-5, 5), 2) for _ in range(n)],
+            color_idx=[rng.randrange(len(self.title_colors)) for _ in range(n)],
+        )
+    
+    def build_overlay_filter_chain_idx(self, i: int, jitter: JitterTable, fontfile: str,
+                                       ref_w: int, ref_h: int, fps: int,
+                                       drama_name: str, footer_text: str, side_text: str,
+                                       workdir: str, fast_mode: bool = False) -> str:
+        """build_overlay_filter_chain using row i of a precomputed JitterTable."""
+        color = None
+        if not fast_mode:
+            color = (jitter.brightness[i], jitter.contrast[i], jitter.saturation[i], jitter.hue[i])
+        parts: List[str] = []
+        self._append_base_from(parts, ref_w, ref_h, fps, jitter.crop_pad[i], color)
+        self._append_text_overlays_for(
+            parts, workdir, fontfile, self._layout_for(ref_w, ref_h), drama_name, footer_text, side_text,
+            title_color=self.title_colors[jitter.color_idx[i]],
+        )
+        return ",".join(parts)
+    
+    def build_filter_complex(self, fontfile: str, ref_w: int, ref_h: int, fps: int,
+                             drama_name: str, footer_text: str, side_text: str,
+                             workdir: str, fast_mode: bool = False,
+                             script_name: str = "filter_complex.txt",
+                             rng: Optional[random.Random] = None) -> Tuple[str, List[str]]:
+        """Build base filters, text overlays and watermark as one labeled graph.
+        
+        The graph is written to a script file in workdir, so everything is
+        composed on the same frame in a single filter_complex pass.
         
-        base_filters.append(f"pad={ref_w}:{ref_h}:(ow-iw)/2:(oh-ih)/2")
-        base_filters.append(f"fps={fps}")
+        Returns:
+            (script_path, args) where args go right after the source ``-i``:
+            the watermark and pre-rendered text inputs (if any),
+            ``-filter_complex_script`` and the maps
+        """
+        base_filters: List[str] = []
+        self._append_base(base_filters, ref_w, ref_h, fps, fast_mode, rng)
+        title_color = (rng or random).choice(self.title_colors)
+        text_overlays: List[str] = []
+        layout = self._layout_for(ref_w, ref_h)
+        title_txt, _, side_txtf = self._append_text_overlays_for(
+            text_overlays, workdir, fontfile, layout, drama_name, footer_text, side_text,
+            title_color=title_color,
+        )
+        
+        graph = [f"[0:v]{','.join(base_filters)}[base]"]
+        label = "base"
+        input_args: List[str] = []
+        next_input = 1
+        if self._watermark_ok:
+            wm_input, prescaled = self._watermark_input(layout.watermark_width)
+            input_args = self._still_input_args(wm_input, fps)
+            next_input = 2
+        
+        # 标题与竖排侧边文字在整集内不变：字形只渲染一次成 PNG，逐帧只做 overlay
+        title_dt, bottom_dt, side_dt = text_overlays
+        side_w = _SIDE_FONT_SIZE * 2
+        side_h = min(ref_h, (len(self.to_vertical(side_text).split("\n")) + 1) * _SIDE_FONT_SIZE * 2)
+        layers = [
+            (title_dt, self._text_png(_TITLE_TPL, fontfile, drama_name,
+                                      _title_source(drama_name, title_txt),
+                                      (_TITLE_FONT_SIZE, title_color, 0), ref_w, _TITLE_FONT_SIZE * 2),
+             0, layout.title_y),
+            (bottom_dt, None, 0, 0),
+            (side_dt, self._text_png(_SIDE_TPL, fontfile, side_text,
+                                     _TEXTFILE_SRC % escape_filter_value(side_txtf),
+                                     (_SIDE_FONT_SIZE, 0, 0), side_w, side_h),
+             ref_w - side_w - layout.margin, layout.side_y),
+        ]
+        for i, (drawtext, png, x, y) in enumerate(layers, start=1):
+            if png:
+                input_args += self._still_input_args(png, fps)
+                graph.append(f"[{label}][{next_input}:v]{_STILL_OVERLAY_TPL % (x, y)}[t{i}]")
+                next_input += 1
+            else:
+                graph.append(f"[{label}]{drawtext}[t{i}]")
+            label = f"t{i}"
+        
+        if self._watermark_ok:
+            graph.append(self._watermark_graph(layout.watermark_width, label, "out", prescaled))
+        else:
+            graph.append(f"[{label}]null[out]")
+        
+        script_path = os.path.join(workdir, script_name)
+        write_text_file(script_path, ";\n".join(graph))
+        return script_path, input_args + [
+            "-filter_complex_script", script_path, "-map", "[out]", "-map", "0:a",
+        ]
+    
+    def build_many(self, specs: List[EpisodeSpec],
+                   global_seed: Optional[int] = None) -> List[Tuple[str, List[str]]]:
+        """Build one filter_complex script per episode for a batch.
+        
+        Scripts are named after the episode id, so a batch can share one
+        workdir, and the caller can run the ffmpeg jobs
+        concurrently. With global_seed, each episode's random variation is
+        drawn from (global_seed, episode_id) and is reproducible regardless
+        of the order or concurrency the jobs run in.
+        
+        Returns:
+            (script_path, args) per spec, as from build_filter_complex
+        """
+        results = []
+        for spec in specs:
+            rng = random.Random(f"{global_seed}:{spec.episode_id}") if global_seed is not None else None
+            results.append(self.build_filter_complex(
+                spec.fontfile, spec.ref_w, spec.ref_h, spec.fps,
+                spec.drama_name, spec.footer_text, spec.side_text, spec.workdir,
+                fast_mode=spec.fast_mode,
+                script_name=f"filter_complex_{spec.episode_id}.txt",
+                rng=rng,
+            ))
+        return results
+    
+    def _append_text_overlays_for(self, parts: List[str], workdir: str, fontfile: str,
+                                  layout: _OverlayLayout,
+                                  drama_name: str, footer_text: str, side_text: str,
+                                  rng: Optional[random.Random] = None,
+                                  title_color: Optional[str] = None) -> Tuple[Optional[str], str, str]:
+        """Write the text files (once per distinct texts) and append their drawtext filters.
+        
+        Returns:
+            (title_txt, bottom_txt, side_txtf); title_txt is None when the title is inlined
+        """
+        # 文字文件按内容寻址放在 workdir 的上一级，相同文字的各集共用一份；可内联的标题不再写文件
+        key = md5_of_text("\x00".join((drama_name, footer_text, side_text)))[:16]
+        shared = os.path.join(os.path.dirname(os.path.abspath(workdir)), f"_text_{key}")
+        # 信任内存缓存，不再逐次 stat；目录由 cleanup() 统一删除
+        files = self._text_file_cache.get(shared)
+        if files is None:
+            ensure_dir(shared)
+            files = self.create_text_files(shared, drama_name, footer_text, side_text,
+                                           include_title=not _title_inline(drama_name))
+            self._text_file_cache[shared] = files
+        title_txt, bottom_txt, side_txtf = files
+        self._append_text_overlays(parts, fontfile, layout, _title_source(drama_name, title_txt),
+                                   bottom_txt, side_txtf, rng=rng, title_color=title_color)
+        return files
+    
+    def _append_base(self, parts: List[str], ref_w: int, ref_h: int, fps: int, fast_mode: bool,
+                     rng: Optional[random.Random] = None) -> None:
+        """Append fps/scale/pad to the canvas plus random crop and color variation."""
+        rng = rng or random
+        # Random cropping for variation
+        crop_pad = rng.randint(0, 3)
         
         # Color adjustments (skip in fast mode)
+        color = None
         if not fast_mode:
-            brightness = round(random.uniform(-0.02, 0.02), 3)
-            contrast = round(random.uniform(0.98, 1.02), 3)
-            saturation = round(random.uniform(0.98, 1.02), 3)
-            hue = round(random.uniform(-5, 5), 2)
-            base_filters.append(f"eq=brightness={brightness}:contrast={contrast}:saturation={saturation}")
-            base_filters.append(f"hue=h={hue}")
+            brightness = round(rng.uniform(-0.02, 0.02), 3)
+            contrast = round(rng.uniform(0.98, 1.02), 3)
+            saturation = round(rng.uniform(0.98, 1.02), 3)
+            hue = round(rng.uniform(-5, 5), 2)
+            color = (brightness, contrast, saturation, hue)
+        
+        self._append_base_from(parts, ref_w, ref_h, fps, crop_pad, color)
+    
+    @staticmethod
+    def _append_base_from(parts: List[str], ref_w: int, ref_h: int, fps: int, crop_pad: int,
+                          color: Optional[Tuple[float, float, float, float]]) -> None:
+        """Append base filters for given crop padding and (brightness, contrast, saturation, hue)."""
+        # Base video processing: fps 放在最前，被丢弃的帧不再经过后续滤镜
+        parts.append("fps=%s" % fps)
+        parts.append(_SCALE_TPL % (ref_w, ref_h))
         
-        # Create text files
-        title_txt, bottom_txt, side_txtf = self.create_text_files(workdir, drama_name, footer_text, side_text)
+        if crop_pad > 0:
+            parts.append(_CROP_TPL % (crop_pad, crop_pad, crop_pad, crop_pad))
         
-        # Build text overlays
-        text_overlays = self.build_text_overlays(fontfile, ref_w, ref_h, title_txt, bottom_txt, side_txtf)
+        parts.append(_PAD_TPL % (ref_w, ref_h))
         
-        # Combine all filters
-        all_filters = base_filters + text_overlays
-        return ",".join(all_filters)
+        # 取整后恰为恒等的系数不生成滤镜，省去一次整帧处理
+        if color is not None:
+            brightness, contrast, saturation, hue = color
+            if brightness or contrast != 1.0 or saturation != 1.0:
+                parts.append(_EQ_TPL % (brightness, contrast, saturation))
+            if hue:
+                parts.append(_HUE_TPL % hue)
     
-    def get_watermark_command_args(self, ref_w: int, ref_h: int) -> List[str]:
+    def get_watermark_command_args(self, ref_w: int, ref_h: int,
+                                   fps: Optional[float] = None) -> List[str]:
         """Get additional FFmpeg command arguments for watermark overlay using filter_complex."""
-        if not self.watermark_path or not os.path.exists(self.watermark_path):
+        if not self._watermark_ok:
             return []
-            
-        # Calculate watermark size and position
-        watermark_width = int(ref_w * 0.08)  # 8% of video width
-        margin = 15  # 15px margin from edges
         
         # Return filter_complex arguments for watermark
-        filter_complex = (
-            f"[0:v]scale={watermark_width}:-1[scaled_wm];"
-            f"[1:v][scaled_wm]overlay={margin}:{margin}:format=auto[out]"
-        )
+        width = self._layout_for(ref_w, ref_h).watermark_width
+        wm_input, prescaled = self._watermark_input(width)
+        filter_complex = self._watermark_graph(width, "0:v", "out", prescaled)
+        
+        return self._still_input_args(wm_input, fps) + [
+            "-filter_complex", filter_complex, "-map", "[out]", "-map", "0:a",
+        ]
+    
+    @staticmethod
+    def _still_input_args(wm_input: str, fps: Optional[float] = None) -> List[str]:
+        """Input args for the watermark: a looped still, so it is decoded once and reused per frame."""
+        args = ["-loop", "1"]
+        if fps:
+            args += ["-framerate", str(fps)]
+        return args + ["-i", wm_input]
+    
+    def _watermark_input(self, width: int) -> Tuple[str, bool]:
+        """Watermark file to pass with -i, and whether it is already scaled."""
+        if width not in self._scaled_watermarks:
+            self._scaled_watermarks[width] = self._ensure_scaled_watermark(width)
+        scaled = self._scaled_watermarks[width]
+        return (scaled, True) if scaled else (self.watermark_path, False)
+    
+    def _ensure_scaled_watermark(self, width: int) -> Optional[str]:
+        """Watermark pre-scaled to width, cached as PNG (None if it cannot be built)."""
+        try:
+            key = md5_of_text(f"{os.path.abspath(self.watermark_path)}|"
+                              f"{quick_file_signature(self.watermark_path)}|w{width}")
+        except OSError:
+            return None
+        cached = os.path.join(self.cache_dir, f"wm_{key[:16]}.png")
+        if os.path.isfile(cached):
+            return cached
         
-        return ["-i", self.watermark_path, "-filter_complex", filter_complex, "-map", "[out]", "-map", "0:a"]
+        tmp_out = f"{cached}.{os.getpid()}.tmp.png"
+        try:
+            ensure_dir(self.cache_dir)
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+                 "-i", self.watermark_path, "-vf", f"scale={width}:-1", tmp_out],
+                capture_output=True, timeout=30,
+            )
+            if result.returncode != 0:
+                return None
+            os.replace(tmp_out, cached)
+            return cached
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        finally:
+            if os.path.exists(tmp_out):
+                os.remove(tmp_out)
+    
+    def _text_png(self, tpl: str, fontfile: str, text: str, src: str, args: tuple,
+                  canvas_w: int, canvas_h: int) -> Optional[str]:
+        """Static text pre-rendered with a drawtext template (None if it cannot be built).
+        
+        src is the drawtext text source; args fill the rest of the template. Offsets should be 0
+        so the text is drawn at the canvas edge and placed with overlay.
+        """
+        key = (tpl, fontfile, text, args, canvas_w, canvas_h)
+        if key not in self._text_png_cache:
+            self._text_png_cache[key] = self._render_text_png(
+                tpl, fontfile, text, src, args, canvas_w, canvas_h,
+            )
+        return self._text_png_cache[key]
+    
+    def _render_text_png(self, tpl: str, fontfile: str, text: str, src: str, args: tuple,
+                         canvas_w: int, canvas_h: int) -> Optional[str]:
+        """Render drawtext once onto a transparent canvas, cached as an RGBA PNG."""
+        try:
+            key = md5_of_text(f"{tpl}|{os.path.abspath(fontfile)}|{quick_file_signature(fontfile)}|"
+                              f"{text}|{args}|{canvas_w}x{canvas_h}")
+        except OSError:
+            return None
+        cached = os.path.join(self.cache_dir, f"text_{key[:16]}.png")
+        if os.path.isfile(cached):
+            return cached
+        
+        tmp_out = f"{cached}.{os.getpid()}.tmp.png"
+        canvas = f"color=c=black@0.0:s={canvas_w}x{canvas_h},format=rgba"
+        try:
+            ensure_dir(self.cache_dir)
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+                 "-f", "lavfi", "-i", canvas, "-vf", tpl % ((escape_filter_value(fontfile), src) + args),
+                 "-frames:v", "1", tmp_out],
+                capture_output=True, timeout=30,
+            )
+            if result.returncode != 0:
+                return None
+            os.replace(tmp_out, cached)
+            return cached
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        finally:
+            if os.path.exists(tmp_out):
+                os.remove(tmp_out)
+    
+    def _watermark_graph(self, width: int, main_label: str, out_label: str,
+                         prescaled: bool = False) -> str:
+        """Overlay the watermark (input 1) on [main_label] as [out_label], scaling it to width unless prescaled."""
+        margin = 15  # 15px margin from edges
+        if prescaled:
+            return f"[{main_label}][1:v]{_STILL_OVERLAY_TPL % (margin, margin)}[{out_label}]"
+        return (
+            f"[1:v]scale={width}:-1[scaled_wm];"
+            f"[{main_label}][scaled_wm]{_STILL_OVERLAY_TPL % (margin, margin)}[{out_label}]"
+        )
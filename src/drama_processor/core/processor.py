@@ -1,24 +1,25 @@
 """Main drama processing orchestrator."""
 
+import functools
 import logging
 import os
 import random
 import sys
 import time
 from pathlib import Path
-from typing import List, Optional, Tuple, Set, Callable, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Optional, Tuple, Set, Callable, Dict, Iterator, Any
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from collections import Counter
 
 from ..models.config import ProcessingConfig
 from ..models.project import DramaProject, MaterialOutput
 from ..models.episode import Episode
 from ..utils.files import (
-    list_episode_files, scan_drama_dirs,
-    prepare_export_dir, get_latest_export_dir, count_existing_materials,
+    list_episode_files, scan_drama_episodes,
+    prepare_export_dir, probe_export_dir,
     ensure_temp_root
 )
-from ..utils.video import probe_video_stream, probe_duration
+from ..utils.video import cached_probe, enable_probe_cache
 from ..utils.interactive import interactive_pick_dramas
 from ..utils.time import human_duration
 from ..utils.history import HistoryManager
@@ -30,6 +31,35 @@ from .encoder import VideoEncoder
 
 logger = logging.getLogger(__name__)
 
+# 汇总到 drama_info["materials"] 的成品扩展名
+_MATERIAL_SUFFIXES = (".mp4", ".mov", ".avi")
+
+
+def _drama_date_sort_key(drama_name: str, drama_date: str) -> tuple:
+    """获取剧目排序键值，用于按日期排序（无日期的剧传入 "9999.12.31" 排在最后）"""
+    # 解析日期字符串为可排序的格式
+    try:
+        # 处理 "M.D" 格式，如 "9.6" -> (9, 6)
+        if "." in drama_date:
+            month, day = drama_date.split(".", 1)
+            return (int(month), int(day), drama_name)
+        # 处理其他格式，暂时按字符串排序
+        return (999, 999, drama_date, drama_name)
+    except (ValueError, AttributeError):
+        # 解析失败，排在最后
+        return (999, 999, drama_date, drama_name)
+
+
+@functools.lru_cache(maxsize=1)
+def _project_root() -> Optional[Path]:
+    """Find project root by looking for an assets directory (walked once per process)."""
+    current_dir = Path(__file__).parent
+    while current_dir != current_dir.parent:
+        if (current_dir / "assets").exists():
+            return current_dir
+        current_dir = current_dir.parent
+    return None
+
 
 class DramaProcessor:
     """Main drama processing orchestrator with complete dramas_process.py compatibility."""
@@ -48,6 +78,10 @@ class DramaProcessor:
         if status_callback and not feishu_api_enabled:
             logger.info("飞书功能已关闭，跳过飞书状态同步")
         
+        # 持久化 ffprobe 缓存：重复运行时未变化的剧集只需 stat，不再启动 ffprobe
+        if config.probe_cache_file:
+            enable_probe_cache(os.path.expanduser(config.probe_cache_file))
+        
         # Initialize components
         self.analyzer = VideoAnalyzer()
         self.segment_builder = SegmentBuilder()
@@ -67,6 +101,9 @@ class DramaProcessor:
                 watermark_path = None
         
         self.encoder = VideoEncoder(config, watermark_path=watermark_path)
+        # 本次运行内的扫描结果：root_dir -> {剧目录: 剧集文件}
+        self._scan_cache: Dict[str, Dict[str, List[Path]]] = {}
+        self._episode_files: Dict[str, List[Path]] = {}
         self.history_manager = HistoryManager()
         
         # Initialize Feishu notifier if enabled
@@ -84,8 +121,19 @@ class DramaProcessor:
             logger.info(f"Random seed set to: {config.seed}")
     
     def scan_and_discover_dramas(self, root_dir: str) -> List[str]:
-        """Scan root directory for drama directories."""
-        return scan_drama_dirs(root_dir)
+        """Scan root directory for drama directories (once per root_dir per run)."""
+        found = self._scan_cache.get(root_dir)
+        if found is None:
+            found = scan_drama_episodes(root_dir)
+            self._scan_cache[root_dir] = found
+            self._episode_files.update(found)
+        return sorted(found)
+    
+    @staticmethod
+    def _named_dirs(drama_dirs: List[str]) -> List[Tuple[str, str]]:
+        """Pair each drama directory with its basename (computed once per directory)."""
+        basename = os.path.basename
+        return [(d, basename(d.rstrip("/"))) for d in drama_dirs]
     
     def filter_dramas_by_config(self, all_drama_dirs: List[str]) -> List[str]:
         """Filter drama directories based on config include/exclude/interactive settings."""
@@ -98,18 +146,15 @@ class DramaProcessor:
         if self.config.include:
             # Explicit include list
             include_set = set(self.config.include)
-            drama_dirs = [d for d in all_drama_dirs 
-                         if os.path.basename(d.rstrip("/")) in include_set]
-            if exclude_set:
-                drama_dirs = [d for d in drama_dirs 
-                             if os.path.basename(d.rstrip("/")) not in exclude_set]
+            drama_dirs = [d for d, n in self._named_dirs(all_drama_dirs)
+                         if n in include_set and n not in exclude_set]
             logger.info(f"Processing by include: {len(drama_dirs)} dramas")
             return drama_dirs
         
         elif self.config.full:
             # Full processing
-            drama_dirs = [d for d in all_drama_dirs 
-                         if os.path.basename(d.rstrip("/")) not in exclude_set]
+            drama_dirs = [d for d, n in self._named_dirs(all_drama_dirs)
+                         if n not in exclude_set]
             logger.info(f"Processing all: {len(drama_dirs)} dramas")
             return drama_dirs
         
@@ -140,11 +185,17 @@ class DramaProcessor:
         )
         
         # Load episodes
-        episode_files = list_episode_files(Path(drama_dir))
+        episode_files = self._episode_files.get(drama_dir)
+        if episode_files is None:
+            episode_files = list_episode_files(Path(drama_dir))
+        # 并发 ffprobe，结果进入编码器的探测缓存，后续选 FPS / 切片时不再重复探测
+        infos = self.encoder.probe_many([str(p) for p in episode_files])
         episodes = []
-        for i, file_path in enumerate(episode_files, 1):
+        for i, (file_path, info) in enumerate(zip(episode_files, infos), 1):
+            if info is None:
+                logger.warning(f"Failed to analyze episode {i}: ffprobe failed for {file_path}")
+                continue
             try:
-                info = probe_video_stream(str(file_path))
                 episode = Episode(
                     episode_number=i,
                     file_path=file_path,
@@ -173,12 +224,13 @@ class DramaProcessor:
             project.reference_resolution = (ref_w, ref_h)
         else:
             # Auto-detect most common resolution
-            sizes = []
-            for ep in episodes:
-                if ep.width and ep.height:
-                    sizes.append((self.encoder.even(ep.width), self.encoder.even(ep.height)))
-            if sizes:
-                ref_w, ref_h = Counter(sizes).most_common(1)[0][0]
+            even = self.encoder.even
+            size_counter = Counter(
+                (even(ep.width), even(ep.height))
+                for ep in episodes if ep.width and ep.height
+            )
+            if size_counter:
+                ref_w, ref_h = size_counter.most_common(1)[0][0]
                 project.reference_resolution = (ref_w, ref_h)
         
         # Determine target FPS
@@ -193,16 +245,8 @@ class DramaProcessor:
             tail_path = Path(self.config.tail_file)
             # Handle relative path relative to project root
             if not tail_path.is_absolute():
-                # Find project root by looking for assets directory
-                current_dir = Path(__file__).parent
-                while current_dir != current_dir.parent:
-                    if (current_dir / "assets").exists():
-                        tail_path = current_dir / self.config.tail_file
-                        break
-                    current_dir = current_dir.parent
-                else:
-                    # Fallback: relative to current working directory
-                    tail_path = Path.cwd() / self.config.tail_file
+                # Fallback: relative to current working directory
+                tail_path = (_project_root() or Path.cwd()) / self.config.tail_file
             
             if tail_path.exists():
                 project.tail_video = tail_path
@@ -214,6 +258,30 @@ class DramaProcessor:
         
         return project
     
+    def _send_start_notification(
+        self, notifier: FeishuNotifier, dramas_info: List[Dict[str, Any]]
+    ) -> None:
+        """Send the start notification (runs on the notification thread)."""
+        try:
+            notifier.send_start_notification(dramas_info, self.config)
+            logger.info("已发送开始剪辑通知到飞书群")
+        except Exception as e:
+            logger.warning(f"发送开始通知失败: {e}")
+    
+    def _iter_projects(self, drama_dirs: List[str]) -> Iterator[Tuple[str, "Future[DramaProject]"]]:
+        """Yield (drama_dir, future project) in order.
+        
+        下一部剧的项目（ffprobe、画布与 FPS 检测）在后台线程中创建，
+        与当前剧的编码重叠；create_drama_project 的异常在 result() 时抛出。
+        """
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            upcoming = prefetcher.submit(self.create_drama_project, drama_dirs[0]) if drama_dirs else None
+            for i, drama_dir in enumerate(drama_dirs):
+                current = upcoming
+                if i + 1 < len(drama_dirs):
+                    upcoming = prefetcher.submit(self.create_drama_project, drama_dirs[i + 1])
+                yield drama_dir, current
+    
     def prepare_project_output_dir(self, project: DramaProject, exports_root: str, drama_date: Optional[str] = None) -> Tuple[str, Optional[str], int, int]:
         """Prepare output directory and determine how many materials to generate.
         
@@ -235,9 +303,8 @@ class DramaProcessor:
             total_to_make = self.config.count
         else:
             # Check for existing materials and potentially continue
-            latest_dir, run_suffix = get_latest_export_dir(exports_root, drama_name, date_str)
+            latest_dir, run_suffix, existing_count = probe_export_dir(exports_root, drama_name, date_str)
             if latest_dir:
-                existing_count = count_existing_materials(latest_dir)
                 if existing_count >= self.config.count:
                     logger.info(f"Skipping {drama_name}: already has {existing_count} materials")
                     return None, None, 0, 0
@@ -259,7 +326,7 @@ class DramaProcessor:
     
     def generate_start_points(self, project: DramaProject, count: int) -> List[Tuple[int, float]]:
         """Generate start points for material generation."""
-        if not project.episodes:
+        if count <= 0 or not project.episodes:
             return []
         
         starts = []
@@ -269,6 +336,12 @@ class DramaProcessor:
         episode_paths = [str(ep.file_path) for ep in project.episodes]
         min_duration = self.config.min_duration
         
+        # 每集时长只探测一次；remaining[i] 为第 i 集起到结尾的总时长，可用时长 O(1) 求得
+        durations, remaining = self._episode_duration_table(episode_paths)
+        
+        def available_from(ep_idx: int, offset: float) -> float:
+            return max(0.0, durations[ep_idx] - offset) + remaining[ep_idx + 1]
+        
         # Calculate episode range limit (exclude last N episodes from config)
         exclude_count = self.config.exclude_last_episodes
         max_start_episode = max(0, num_episodes - exclude_count)
@@ -296,15 +369,13 @@ class DramaProcessor:
                 
                 if episode.duration:
                     # Calculate available duration from this episode onwards
-                    available_duration = self._calculate_total_duration_from_episode(
-                        episode_paths, ep_idx, 0.0)
+                    available_duration = remaining[ep_idx]
                     
                     if available_duration < min_duration:
                         continue  # Skip this episode, not enough content
                     
                     # Calculate safe offset range
-                    remaining_episodes_duration = self._calculate_total_duration_from_episode(
-                        episode_paths, ep_idx + 1, 0.0) if ep_idx + 1 < len(episode_paths) else 0.0
+                    remaining_episodes_duration = remaining[ep_idx + 1]
                     max_safe_offset = episode.duration - (min_duration - remaining_episodes_duration)
                     max_safe_offset = max(0.0, min(max_safe_offset, episode.duration * 0.3))  # Max 30% into episode
                     
@@ -317,16 +388,16 @@ class DramaProcessor:
                 
                 # Light deduplication: only avoid excessive duplicates
                 point_key = (ep_idx, offset)
-                duplicate_count = sum(1 for used_point in used_points if used_point == point_key)
+                duplicate_count = 1 if point_key in used_points else 0
                 
                 # Allow some duplicates but not too many
                 if duplicate_count >= duplicate_threshold:
                     continue  # Skip if too many duplicates
                 
                 # Verify this start point can provide minimum duration
-                if self._verify_start_point_duration(episode_paths, ep_idx, offset, min_duration):
+                available_duration = available_from(ep_idx, offset)
+                if available_duration >= min_duration:
                     episode_name = project.episodes[ep_idx].file_path.name
-                    available_duration = self._calculate_total_duration_from_episode(episode_paths, ep_idx, offset)
                     duplicate_marker = " (重复)" if duplicate_count > 0 else ""
                     logger.info(f"🎯 选中起始点 {len(starts)+1}: 第{ep_idx+1}集 {episode_name} | 偏移{offset:.1f}s | 可用时长{available_duration:.1f}s{duplicate_marker}")
                     starts.append((ep_idx, offset))
@@ -337,8 +408,8 @@ class DramaProcessor:
                 logger.warning(f"⚠️ 无法找到足够的随机起始点，使用安全默认值")
                 for ep_idx in range(min(max_start_episode, count - len(starts))):
                     point_key = (ep_idx, 0.0)
-                    duplicate_count = sum(1 for used_point in used_points if used_point == point_key)
-                    if duplicate_count < duplicate_threshold and self._verify_start_point_duration(episode_paths, ep_idx, 0.0, min_duration):
+                    duplicate_count = 1 if point_key in used_points else 0
+                    if duplicate_count < duplicate_threshold and remaining[ep_idx] >= min_duration:
                         starts.append((ep_idx, 0.0))
                         used_points.add(point_key)
                 break
@@ -349,15 +420,15 @@ class DramaProcessor:
                 ep_idx = min(i * step, max_start_episode - 1)
                 
                 # Verify this start point provides enough duration
-                if self._verify_start_point_duration(episode_paths, ep_idx, 0.0, min_duration):
+                available_duration = remaining[ep_idx]
+                if available_duration >= min_duration:
                     episode_name = project.episodes[ep_idx].file_path.name
-                    available_duration = self._calculate_total_duration_from_episode(episode_paths, ep_idx, 0.0)
                     logger.info(f"📍 均匀分布起始点 {len(starts)+1}: 第{ep_idx+1}集 {episode_name} | 偏移0.0s | 可用时长{available_duration:.1f}s")
                     starts.append((ep_idx, 0.0))
                 else:
                     # Try to find the earliest valid episode within allowed range
                     for alt_ep_idx in range(max_start_episode):
-                        if self._verify_start_point_duration(episode_paths, alt_ep_idx, 0.0, min_duration):
+                        if remaining[alt_ep_idx] >= min_duration:
                             starts.append((alt_ep_idx, 0.0))
                             break
         
@@ -366,12 +437,28 @@ class DramaProcessor:
         
         return starts
     
+    def _episode_duration_table(self, episode_paths: List[str]) -> Tuple[List[float], List[float]]:
+        """Per-episode durations and suffix sums (remaining[i] = sum of durations[i:]).
+        
+        探测失败的剧集按 0 计，与 _calculate_total_duration_from_episode 一致。
+        """
+        durations = []
+        for path in episode_paths:
+            try:
+                durations.append(cached_probe(path)["duration"])
+            except Exception:
+                durations.append(0.0)
+        remaining = [0.0] * (len(durations) + 1)
+        for i in range(len(durations) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + durations[i]
+        return durations, remaining
+    
     def _calculate_total_duration_from_episode(self, episode_paths: List[str], start_ep_idx: int, start_offset: float) -> float:
         """Calculate total available duration from given episode and offset."""
         total_duration = 0.0
         for i in range(start_ep_idx, len(episode_paths)):
             try:
-                dur = probe_duration(episode_paths[i])
+                dur = cached_probe(episode_paths[i])["duration"]
                 if i == start_ep_idx:
                     available = max(0.0, dur - start_offset)
                 else:
@@ -381,16 +468,23 @@ class DramaProcessor:
                 continue
         return total_duration
     
-    def _verify_start_point_duration(self, episode_paths: List[str], ep_idx: int, offset: float, min_duration: float) -> bool:
-        """Verify that a start point can provide the minimum required duration."""
-        available_duration = self._calculate_total_duration_from_episode(episode_paths, ep_idx, offset)
-        return available_duration >= min_duration
+    def _ffmpeg_threads_per_invocation(self) -> int:
+        """Filter threads for one material's ffmpeg runs.
+        
+        jobs 个素材同时编码时，按 CPU 数平分，避免 jobs × filter_threads 个线程争抢。
+        """
+        jobs = max(1, self.config.jobs)
+        return max(1, min(self.config.filter_threads, (os.cpu_count() or jobs) // jobs))
     
     def process_single_material(self, project: DramaProject, material_idx: int, 
                               start_ep_idx: int, start_offset: float, 
                               output_path: str, temp_root: str,
-                              run_suffix: Optional[str], material_total: int) -> float:
-        """Process a single material - equivalent to build_one_material."""
+                              run_suffix: Optional[str], material_total: int) -> Tuple[float, Optional[float]]:
+        """Process a single material - equivalent to build_one_material.
+        
+        Returns:
+            (processing_time, output_duration)；时长由编码器在成品写出后测得，未知时为 None
+        """
         start_time = time.time()
         
         # Log detailed start point info
@@ -409,7 +503,7 @@ class DramaProcessor:
         fontfile = self.config.get_default_font()
         
         # Use encoder to process material
-        result_path = self.encoder.process_material(
+        result = self.encoder.process_material(
             episodes=episode_paths,
             drama_name=project.name,
             start_ep_idx=start_ep_idx,
@@ -432,11 +526,12 @@ class DramaProcessor:
             material_idx=material_idx,
             material_total=material_total,
             fast_mode=self.config.fast_mode,
-            filter_threads=self.config.filter_threads
+            filter_threads=self._ffmpeg_threads_per_invocation()
         )
         
         processing_time = time.time() - start_time
-        return processing_time
+        output_duration = result[1] if result else None
+        return processing_time, output_duration
     
     def process_project_materials(self, project: DramaProject, out_dir: str, 
                                 run_suffix: Optional[str], start_index: int, 
@@ -464,73 +559,41 @@ class DramaProcessor:
         date_str = drama_date or self.config.get_date_str()
         material_code = self.config.get_material_code()
         
-        # Prepare tasks
-        tasks = []
+        # Prepare tasks: (material_idx, ep_idx, offset, output_path)，调度循环只负责分发
+        name_prefix = f"{date_str}-{project.name}-{material_code}-"
+        name_tail = f"-{run_suffix}.mp4" if run_suffix else ".mp4"
+        tasks = [
+            (start_index + i, ep_idx, offset,
+             os.path.join(out_dir, f"{name_prefix}{start_index + i:02d}{name_tail}"))
+            for i, (ep_idx, offset) in enumerate(start_points)
+        ]
+        
         def process_task(idx2: int, ep_idx: int, offset: float, output_path: str):
             try:
-                dt = self.process_single_material(
+                dt, duration = self.process_single_material(
                     project, idx2, ep_idx, offset, output_path, temp_root,
                     run_suffix, start_index + total_to_make - 1
                 )
-                return (idx2, None, dt, output_path)
+                return (idx2, None, dt, output_path, duration)
             except Exception as e:
-                return (idx2, e, 0.0, output_path)
+                return (idx2, e, 0.0, output_path, None)
         
-        # Execute processing
+        # Execute processing（jobs=1 时即单线程顺序执行，结果处理只有一条路径）
         completed_count = 0
-        if self.config.jobs == 1:
-            # Sequential processing
-            for i, (ep_idx, offset) in enumerate(start_points):
-                material_idx = start_index + i
-                base_name = f"{date_str}-{project.name}-{material_code}-{material_idx:02d}"
-                if run_suffix:
-                    base_name += f"-{run_suffix}"
-                output_path = os.path.join(out_dir, base_name + ".mp4")
-                
-                task_idx, error, dt, path = process_task(material_idx, ep_idx, offset, output_path)
+        with ThreadPoolExecutor(max_workers=max(1, self.config.jobs)) as executor:
+            futures = [executor.submit(process_task, *task) for task in tasks]
+            
+            # Collect results
+            for future in as_completed(futures):
+                task_idx, error, dt, path, duration = future.result()
                 if error:
                     logger.error(f"Material {task_idx} failed: {error}")
                 else:
                     completed_count += 1
-                    remain = total_to_make - (i + 1)
-                    # Get video duration for display
-                    try:
-                        duration = probe_duration(path)
-                        duration_str = human_duration(duration)
-                    except Exception:
-                        duration_str = "未知"
+                    remain = total_to_make - completed_count
+                    duration_str = human_duration(duration) if duration is not None else "未知"
                     logger.info(f"✅ 素材完成 | 剧：{project.name} | 第 {task_idx} 条 | 时长 {duration_str} | 用时 {human_duration(dt)} | 该剧剩余素材：{remain} 条")
         
-        else:
-            # Parallel processing
-            with ThreadPoolExecutor(max_workers=self.config.jobs) as executor:
-                futures = []
-                for i, (ep_idx, offset) in enumerate(start_points):
-                    material_idx = start_index + i
-                    base_name = f"{date_str}-{project.name}-{material_code}-{material_idx:02d}"
-                    if run_suffix:
-                        base_name += f"-{run_suffix}"
-                    output_path = os.path.join(out_dir, base_name + ".mp4")
-                    
-                    future = executor.submit(process_task, material_idx, ep_idx, offset, output_path)
-                    futures.append(future)
-                
-                # Collect results
-                for future in as_completed(futures):
-                    task_idx, error, dt, path = future.result()
-                    if error:
-                        logger.error(f"Material {task_idx} failed: {error}")
-                    else:
-                        completed_count += 1
-                        remain = total_to_make - completed_count
-                        # Get video duration for display
-                        try:
-                            duration = probe_duration(path)
-                            duration_str = human_duration(duration)
-                        except Exception:
-                            duration_str = "未知"
-                        logger.info(f"✅ 素材完成 | 剧：{project.name} | 第 {task_idx} 条 | 时长 {duration_str} | 用时 {human_duration(dt)} | 该剧剩余素材：{remain} 条")
-        
         project_time = time.time() - project_start_time
         logger.info(f"📦 本剧完成 | {project.name} | 本轮生成 {completed_count}/{total_to_make} 条 | 用时 {human_duration(project_time)}")
         
@@ -571,6 +634,9 @@ class DramaProcessor:
         
         os.makedirs(actual_exports_root, exist_ok=True)
         
+        # 本次运行统一使用的日期（无剧目专属日期时的回退），只计算一次
+        config_date_str = self.config.get_date_str()
+        
         # Set up temporary directory
         temp_root = ensure_temp_root(self.config.temp_dir)
         
@@ -588,246 +654,231 @@ class DramaProcessor:
         
         # Sort dramas by date if drama_dates is provided
         if drama_dates:
-            def get_drama_sort_key(drama_dir: str) -> tuple:
-                """获取剧目排序键值，用于按日期排序"""
-                drama_name = os.path.basename(drama_dir.rstrip("/"))
-                drama_date = drama_dates.get(drama_name, "9999.12.31")  # 默认值确保无日期的排在最后
-                
-                # 解析日期字符串为可排序的格式
-                try:
-                    # 处理 "M.D" 格式，如 "9.6" -> (9, 6)
-                    if "." in drama_date:
-                        month, day = drama_date.split(".", 1)
-                        return (int(month), int(day), drama_name)
-                    # 处理其他格式，暂时按字符串排序
-                    else:
-                        return (999, 999, drama_date, drama_name)
-                except (ValueError, AttributeError):
-                    # 解析失败，排在最后
-                    return (999, 999, drama_date, drama_name)
-            
-            # 按日期排序剧目
-            drama_dirs.sort(key=get_drama_sort_key)
+            # 每部剧只解析一次日期：(排序键, 剧名, 目录) 按排序键稳定排序
+            decorated = [
+                (_drama_date_sort_key(drama_name, drama_dates.get(drama_name, "9999.12.31")), drama_name, drama_dir)
+                for drama_dir, drama_name in self._named_dirs(drama_dirs)
+            ]
+            decorated.sort(key=lambda item: item[0])
+            drama_dirs = [drama_dir for _, _, drama_dir in decorated]
             
             # 记录排序结果
             if logger.isEnabledFor(logging.INFO):
                 logger.info("📅 按日期排序处理剧目:")
-                for drama_dir in drama_dirs:
-                    drama_name = os.path.basename(drama_dir.rstrip("/"))
+                for _, drama_name, _ in decorated:
                     drama_date = drama_dates.get(drama_name, "未知日期")
                     logger.info(f"  - {drama_name} (日期: {drama_date})")
         
-        # Send start notification
-        if self.feishu_notifier:
-            try:
-                dramas_info = []
-                for drama_dir in drama_dirs:
-                    drama_name = os.path.basename(drama_dir.rstrip("/"))
-                    # 使用传入的日期信息，如果没有则使用配置中的日期
-                    start_drama_date = drama_dates.get(drama_name) if drama_dates else self.config.get_date_str()
-                    # 使用配置中的待处理状态值
-                    status_value = self.config.feishu.pending_status_value if self.config.feishu else "待剪辑"
-                    dramas_info.append({
+        # Send start notification（后台单线程发送，不阻塞第一部剧的准备；完成通知经同一线程排在其后）
+        # 执行器只在首次 submit 时起线程；with 退出（含异常）时 shutdown(wait=True)
+        notifier = self.feishu_notifier
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="feishu-notify") as notify_executor:
+            if notifier:
+                # 使用传入的日期信息，如果没有则使用配置中的日期；状态使用配置中的待处理状态值
+                status_value = self.config.feishu.pending_status_value if self.config.feishu else "待剪辑"
+                dramas_info = [
+                    {
                         'name': drama_name,
-                        'date': start_drama_date,
-                        'status': status_value
-                    })
-                
-                self.feishu_notifier.send_start_notification(dramas_info, self.config)
-                logger.info("已发送开始剪辑通知到飞书群")
-            except Exception as e:
-                logger.warning(f"发送开始通知失败: {e}")
+                        'date': drama_dates.get(drama_name) if drama_dates else config_date_str,
+                        'status': status_value,
+                    }
+                    for _, drama_name in self._named_dirs(drama_dirs)
+                ]
+                notify_executor.submit(self._send_start_notification, notifier, dramas_info)
         
-        # Process each drama
-        total_materials_planned = 0
-        total_materials_done = 0
-        successful_dramas = []  # Track successful processing results
+            # Process each drama
+            total_materials_planned = 0
+            total_materials_done = 0
+            successful_dramas = []  # Track successful processing results
         
-        for drama_dir in drama_dirs:
-            drama_start_time = time.time()  # 记录单个剧目开始时间
+            for drama_dir, project_future in self._iter_projects(drama_dirs):
+                drama_start_time = time.time()  # 记录单个剧目开始时间
             
-            try:
-                # Create project
-                project = self.create_drama_project(drama_dir)
+                try:
+                    # Create project (prefetched while the previous drama was encoding)
+                    project = project_future.result()
                 
-                if not project.episodes:
-                    logger.warning(f"Skipping {project.name}: no episodes found")
-                    continue
+                    if not project.episodes:
+                        logger.warning(f"Skipping {project.name}: no episodes found")
+                        continue
                 
-                # Get drama-specific date if available
-                drama_date = drama_dates.get(project.name) if drama_dates else None
+                    # Get drama-specific date if available
+                    drama_date = drama_dates.get(project.name) if drama_dates else None
+                    material_date = drama_date or config_date_str
                 
-                # Determine the export directory for this drama
-                if drama_date and drama_dates:
-                    # Create date-specific export directory
-                    parent_dir = os.path.dirname(os.path.abspath(actual_exports_root))
-                    date_export_dir = os.path.join(parent_dir, f"{drama_date}导出")
-                    os.makedirs(date_export_dir, exist_ok=True)
-                    drama_export_root = date_export_dir
-                else:
-                    # Use the common export directory
-                    drama_export_root = actual_exports_root
+                    # Determine the export directory for this drama
+                    if drama_date and drama_dates:
+                        # Create date-specific export directory
+                        parent_dir = os.path.dirname(os.path.abspath(actual_exports_root))
+                        date_export_dir = os.path.join(parent_dir, f"{drama_date}导出")
+                        os.makedirs(date_export_dir, exist_ok=True)
+                        drama_export_root = date_export_dir
+                    else:
+                        # Use the common export directory
+                        drama_export_root = actual_exports_root
                 
-                # Prepare output directory
-                result = self.prepare_project_output_dir(project, drama_export_root, drama_date)
-                if result[0] is None:  # Skip this drama
-                    continue
+                    # Prepare output directory
+                    result = self.prepare_project_output_dir(project, drama_export_root, drama_date)
+                    if result[0] is None:  # Skip this drama
+                        continue
                 
-                out_dir, run_suffix, start_index, total_to_make = result
-                total_materials_planned += total_to_make
+                    out_dir, run_suffix, start_index, total_to_make = result
+                    total_materials_planned += total_to_make
                 
-                # Update status to processing when starting processing
-                if self.status_callback:
-                    try:
-                        # Get the processing status value from config, fallback to "剪辑中"
-                        processing_status = "剪辑中"
-                        if self.config.feishu and self.config.feishu.processing_status_value:
-                            processing_status = self.config.feishu.processing_status_value
+                    # Update status to processing when starting processing
+                    if self.status_callback:
+                        try:
+                            # Get the processing status value from config, fallback to "剪辑中"
+                            processing_status = "剪辑中"
+                            if self.config.feishu and self.config.feishu.processing_status_value:
+                                processing_status = self.config.feishu.processing_status_value
                         
-                        callback_result = self.status_callback(project.name, processing_status)
+                            callback_result = self.status_callback(project.name, processing_status)
                         
-                        # 检查回调函数的返回值
-                        if callback_result == "SKIP":
-                            logger.warning(f"⚠️ 跳过处理 '{project.name}' - 状态更新返回SKIP")
-                            continue  # 跳过这部剧的处理
-                        elif callback_result is True:
-                            logger.info(f"📝 已更新 '{project.name}' 状态为'{processing_status}'")
-                        else:
-                            logger.warning(f"⚠️ 更新 '{project.name}' 状态失败，但继续处理")
-                    except Exception as e:
-                        logger.warning(f"⚠️ 更新 '{project.name}' 状态失败: {e}")
+                            # 检查回调函数的返回值
+                            if callback_result == "SKIP":
+                                logger.warning(f"⚠️ 跳过处理 '{project.name}' - 状态更新返回SKIP")
+                                continue  # 跳过这部剧的处理
+                            elif callback_result is True:
+                                logger.info(f"📝 已更新 '{project.name}' 状态为'{processing_status}'")
+                            else:
+                                logger.warning(f"⚠️ 更新 '{project.name}' 状态失败，但继续处理")
+                        except Exception as e:
+                            logger.warning(f"⚠️ 更新 '{project.name}' 状态失败: {e}")
                 
-                # Log project info
-                ref_w, ref_h = project.reference_resolution or (1920, 1080)
-                logger.info(
-                    f"=== {project.name} | 参考画布：{ref_w}x{ref_h} | "
-                    f"输出FPS：{project.target_fps} | 运行批次：{run_suffix or '首次'} | "
-                    f"计划生成：{total_to_make} 条，每条 {self.config.min_duration}~{self.config.max_duration}s ==="
-                )
+                    # Log project info
+                    ref_w, ref_h = project.reference_resolution or (1920, 1080)
+                    logger.info(
+                        f"=== {project.name} | 参考画布：{ref_w}x{ref_h} | "
+                        f"输出FPS：{project.target_fps} | 运行批次：{run_suffix or '首次'} | "
+                        f"计划生成：{total_to_make} 条，每条 {self.config.min_duration}~{self.config.max_duration}s ==="
+                    )
                 
-                # Process materials
-                completed, project_time = self.process_project_materials(
-                    project, out_dir, run_suffix, start_index, total_to_make, temp_root, drama_date
-                )
-                total_materials_done += completed
+                    # Process materials
+                    completed, project_time = self.process_project_materials(
+                        project, out_dir, run_suffix, start_index, total_to_make, temp_root, material_date
+                    )
+                    total_materials_done += completed
                 
-                drama_end_time = time.time()  # 记录单个剧目结束时间
-                drama_total_time = drama_end_time - drama_start_time  # 计算剧目总耗时
+                    drama_end_time = time.time()  # 记录单个剧目结束时间
+                    drama_total_time = drama_end_time - drama_start_time  # 计算剧目总耗时
                 
-                # Record successful processing details
-                if completed > 0:
-                    # Update status when processing is completed successfully
-                    if self.status_callback:
-                        # Get the completed status value from config, fallback to "待上传"
-                        completed_status = "待上传"
-                        if self.config.feishu and self.config.feishu.completed_status_value:
-                            completed_status = self.config.feishu.completed_status_value
+                    # Record successful processing details
+                    if completed > 0:
+                        # Update status when processing is completed successfully
+                        if self.status_callback:
+                            # Get the completed status value from config, fallback to "待上传"
+                            completed_status = "待上传"
+                            if self.config.feishu and self.config.feishu.completed_status_value:
+                                completed_status = self.config.feishu.completed_status_value
                         
-                        try:
-                            self.status_callback(project.name, completed_status)
-                            logger.info(f"📝 已更新 '{project.name}' 状态为'{completed_status}'")
-                        except Exception as e:
-                            logger.warning(f"⚠️ 更新 '{project.name}' 状态为'{completed_status}'失败: {e}")
+                            try:
+                                self.status_callback(project.name, completed_status)
+                                logger.info(f"📝 已更新 '{project.name}' 状态为'{completed_status}'")
+                            except Exception as e:
+                                logger.warning(f"⚠️ 更新 '{project.name}' 状态为'{completed_status}'失败: {e}")
                     
-                    # 构建素材文件路径列表
-                    materials_list = []
-                    if os.path.exists(out_dir):
-                        for file in os.listdir(out_dir):
-                            if file.endswith(('.mp4', '.mov', '.avi')):
-                                materials_list.append(os.path.join(out_dir, file))
+                        # 构建素材文件路径列表
+                        materials_list = []
+                        if os.path.exists(out_dir):
+                            with os.scandir(out_dir) as it:
+                                materials_list = [entry.path for entry in it if entry.name.endswith(_MATERIAL_SUFFIXES)]
                     
-                    drama_info = {
-                        'name': project.name,
-                        'completed': completed,
-                        'planned': total_to_make,
-                        'output_dir': out_dir,
-                        'date': drama_date or self.config.get_date_str(),
-                        'run_suffix': run_suffix,
-                        'source_path': drama_dir,
-                        'materials': materials_list,
-                        'total_duration': sum(ep.duration or 0 for ep in project.episodes),
-                        'duration_per_material': (self.config.min_duration + self.config.max_duration) / 2,
-                        'start_time': drama_start_time,
-                        'end_time': drama_end_time,
-                        'processing_time': drama_total_time  # 总体时间（包含准备、处理、整理）
-                    }
+                        drama_info = {
+                            'name': project.name,
+                            'completed': completed,
+                            'planned': total_to_make,
+                            'output_dir': out_dir,
+                            'date': material_date,
+                            'run_suffix': run_suffix,
+                            'source_path': drama_dir,
+                            'materials': materials_list,
+                            'total_duration': sum(ep.duration or 0 for ep in project.episodes),
+                            'duration_per_material': (self.config.min_duration + self.config.max_duration) / 2,
+                            'start_time': drama_start_time,
+                            'end_time': drama_end_time,
+                            'processing_time': drama_total_time  # 总体时间（包含准备、处理、整理）
+                        }
                     
-                    successful_dramas.append(drama_info)
+                        # 添加到历史记录（使用总体时间）
+                        self.history_manager.add_drama_record(session, drama_info, self.config, drama_total_time)
                     
-                    # 添加到历史记录（使用总体时间）
-                    self.history_manager.add_drama_record(session, drama_info, self.config, drama_total_time)
+                        # 汇总与完成通知只需摘要字段；素材路径列表写入历史后即释放
+                        successful_dramas.append({k: v for k, v in drama_info.items() if k != 'materials'})
                 
-                # 即使没有成功，也记录开始时间用于统计
-                elif total_to_make > 0:
-                    # 失败的剧目也记录到历史中
-                    drama_info = {
-                        'name': project.name,
-                        'completed': 0,
-                        'planned': total_to_make,
-                        'output_dir': out_dir,
-                        'date': drama_date or self.config.get_date_str(),
-                        'run_suffix': run_suffix,
-                        'source_path': drama_dir,
-                        'materials': [],
-                        'total_duration': sum(ep.duration or 0 for ep in project.episodes),
-                        'duration_per_material': 0,
-                        'start_time': drama_start_time,
-                        'end_time': drama_end_time,
-                        'processing_time': drama_total_time
-                    }
+                    # 即使没有成功，也记录开始时间用于统计
+                    elif total_to_make > 0:
+                        # 失败的剧目也记录到历史中
+                        drama_info = {
+                            'name': project.name,
+                            'completed': 0,
+                            'planned': total_to_make,
+                            'output_dir': out_dir,
+                            'date': material_date,
+                            'run_suffix': run_suffix,
+                            'source_path': drama_dir,
+                            'materials': [],
+                            'total_duration': sum(ep.duration or 0 for ep in project.episodes),
+                            'duration_per_material': 0,
+                            'start_time': drama_start_time,
+                            'end_time': drama_end_time,
+                            'processing_time': drama_total_time
+                        }
                     
-                    self.history_manager.add_drama_record(session, drama_info, self.config, drama_total_time)
+                        self.history_manager.add_drama_record(session, drama_info, self.config, drama_total_time)
                 
-            except Exception as e:
-                logger.error(f"Failed to process drama {os.path.basename(drama_dir)}: {e}")
-                continue
+                except Exception as e:
+                    logger.error(f"Failed to process drama {os.path.basename(drama_dir)}: {e}")
+                    continue
         
-        # Final summary
-        overall_time = time.time() - overall_start_time
-        logger.info(f"🎯 全部完成。输出根目录：{actual_exports_root} | 总计 {total_materials_done}/{total_materials_planned} 条 | 总用时 {human_duration(overall_time)}")
+            # Final summary
+            overall_time = time.time() - overall_start_time
+            logger.info(f"🎯 全部完成。输出根目录：{actual_exports_root} | 总计 {total_materials_done}/{total_materials_planned} 条 | 总用时 {human_duration(overall_time)}")
         
-        # Send completion notification
-        if self.feishu_notifier:
-            try:
-                # Get the completed status value from config, fallback to "待上传"
-                completed_status = "待上传"
-                if self.config.feishu and self.config.feishu.completed_status_value:
-                    completed_status = self.config.feishu.completed_status_value
+            # Send completion notification
+            if notifier:
+                try:
+                    # Get the completed status value from config, fallback to "待上传"
+                    completed_status = "待上传"
+                    if self.config.feishu and self.config.feishu.completed_status_value:
+                        completed_status = self.config.feishu.completed_status_value
                 
-                # 构建剧目结果信息
-                dramas_results = []
-                for drama_info in successful_dramas:
-                    dramas_results.append({
-                        'name': drama_info['name'],
-                        'date': drama_info['date'],
-                        'status': completed_status,
-                        'completed': drama_info['completed'],
-                        'planned': drama_info['planned'],
-                        'output_dir': drama_info['output_dir']
-                    })
+                    # 构建剧目结果信息
+                    dramas_results = [
+                        {
+                            'name': drama_info['name'],
+                            'date': drama_info['date'],
+                            'status': completed_status,
+                            'completed': drama_info['completed'],
+                            'planned': drama_info['planned'],
+                            'output_dir': drama_info['output_dir'],
+                        }
+                        for drama_info in successful_dramas
+                    ]
                 
-                # 添加失败的剧目信息（如果有的话）
-                processed_names = {d['name'] for d in successful_dramas}
-                for drama_dir in drama_dirs:
-                    drama_name = os.path.basename(drama_dir.rstrip("/"))
-                    if drama_name not in processed_names:
-                        # Get drama-specific date if available
-                        failed_drama_date = drama_dates.get(drama_name) if drama_dates else None
-                        dramas_results.append({
+                    # 添加失败的剧目信息（如果有的话）
+                    processed_names = {d['name'] for d in successful_dramas}
+                    dramas_results.extend(
+                        {
                             'name': drama_name,
-                            'date': failed_drama_date or self.config.get_date_str(),
+                            'date': (drama_dates.get(drama_name) if drama_dates else None) or config_date_str,
                             'status': '失败',
                             'completed': 0,
                             'planned': self.config.count,
-                            'output_dir': ''
-                        })
+                            'output_dir': '',
+                        }
+                        for _, drama_name in self._named_dirs(drama_dirs)
+                        if drama_name not in processed_names
+                    )
                 
-                self.feishu_notifier.send_completion_notification(
-                    dramas_results, total_materials_done, total_materials_planned, overall_time
-                )
-                logger.info("已发送完成剪辑通知到飞书群")
-            except Exception as e:
-                logger.warning(f"发送完成通知失败: {e}")
+                    # 经同一通知线程发送，保证在开始通知之后；运行结束前等待发送完成
+                    notify_executor.submit(
+                        notifier.send_completion_notification,
+                        dramas_results, total_materials_done, total_materials_planned, overall_time
+                    ).result()
+                    logger.info("已发送完成剪辑通知到飞书群")
+                except Exception as e:
+                    logger.warning(f"发送完成通知失败: {e}")
         
         # 完成历史记录会话
         self.history_manager.finish_session(session)
@@ -1,15 +1,55 @@
 """Video segment building module."""
 
+import bisect
 import logging
-from typing import List, Optional, Dict, Tuple
+from typing import List, NamedTuple, Optional, Dict, Tuple
 
 from ..models.episode import Episode, EpisodeSegment
 
-from ..utils.video import probe_duration
+from ..utils.video import cached_probe
 
 logger = logging.getLogger(__name__)
 
 
+class _Choice(NamedTuple):
+    """A candidate segment; its cumulative duration lives in a parallel float list."""
+    
+    episode: Episode
+    start: float
+    end: float
+
+
+def _closest_index(cumulatives: List[float], target: float, lo: int, hi: int) -> int:
+    """Index in [lo, hi] of the cumulative duration closest to target.
+    
+    cumulatives is non-decreasing, so only the two neighbours of the
+    insertion point can be closest; ties go to the earliest index, matching
+    a linear min() scan (equal values left of target are walked back to the
+    first of their run).
+    """
+    j = bisect.bisect_left(cumulatives, target, lo, hi + 1)
+    if j > hi:
+        return bisect.bisect_left(cumulatives, cumulatives[hi], lo, hi)
+    if j > lo and target - cumulatives[j - 1] <= cumulatives[j] - target:
+        return bisect.bisect_left(cumulatives, cumulatives[j - 1], lo, j - 1)
+    return j
+
+
+def _select_cutoff(cumulatives: List[float], min_duration: float, max_duration: float) -> int:
+    """Index of the cutoff whose cumulative duration is closest to the range midpoint.
+    
+    Cutoffs within [min_duration, max_duration] form a contiguous run of the
+    non-decreasing cumulatives and are preferred; if none qualifies, all are
+    considered.
+    """
+    target_duration = (min_duration + max_duration) / 2.0
+    lo = bisect.bisect_left(cumulatives, min_duration)
+    hi = bisect.bisect_right(cumulatives, max_duration) - 1
+    if lo <= hi:
+        return _closest_index(cumulatives, target_duration, lo, hi)
+    return _closest_index(cumulatives, target_duration, 0, len(cumulatives) - 1)
+
+
 class SegmentBuilder:
     """Builds video segments from episodes."""
     
@@ -42,8 +82,10 @@ class SegmentBuilder:
             f"offset={start_offset}, duration={min_duration}-{max_duration}s"
         )
         
-        choices = []
+        choices: List[_Choice] = []
+        cumulatives: List[float] = []
         total_duration = 0.0
+        target_duration = (min_duration + max_duration) / 2.0
         
         for i in range(start_episode_idx, len(episodes)):
             episode = episodes[i]
@@ -52,7 +94,10 @@ class SegmentBuilder:
             try:
                 duration = episode.duration
                 if duration is None:
-                    duration = probe_duration(episode.file_path)
+                    duration = cached_probe(episode.file_path)["duration"]
+                    if duration > 0:
+                        # 回填到剧集对象，后续起点的构建无需再查缓存
+                        episode.duration = duration
             except Exception as e:
                 logger.warning(f"Cannot get duration for episode {episode.episode_number}: {e}")
                 continue
@@ -67,17 +112,12 @@ class SegmentBuilder:
             
             total_duration += take_duration
             
-            choices.append({
-                "episode_idx": i,
-                "episode": episode,
-                "start": seg_start,
-                "end": seg_end,
-                "cumulative": total_duration,
-                "apply_blur": False
-            })
+            choices.append(_Choice(episode, seg_start, seg_end))
+            cumulatives.append(total_duration)
             
-            # Stop if we've reached maximum duration
-            if total_duration >= max_duration:
+            # Stop once the target is crossed: later cutoffs are only farther from it,
+            # and this one is either within max_duration or already past it
+            if total_duration >= min(target_duration, max_duration):
                 break
         
         if not choices:
@@ -85,39 +125,18 @@ class SegmentBuilder:
             return []
         
         # Find optimal cutoff point
-        target_duration = (min_duration + max_duration) / 2.0
-        
-        # Find segments within acceptable range
-        valid_choices = [
-            (idx, choice) for idx, choice in enumerate(choices)
-            if min_duration <= choice["cumulative"] <= max_duration
-        ]
-        
-        if valid_choices:
-            # Choose closest to target duration
-            best_idx, _ = min(
-                valid_choices,
-                key=lambda x: abs(x[1]["cumulative"] - target_duration)
-            )
-        else:
-            # Choose closest to target duration from all choices
-            best_idx = min(
-                range(len(choices)),
-                key=lambda idx: abs(choices[idx]["cumulative"] - target_duration)
-            )
+        best_idx = _select_cutoff(cumulatives, min_duration, max_duration)
         
         # Build final segment list
-        segments = []
-        selected_choices = choices[:best_idx + 1]
-        
-        for choice in selected_choices:
-            segment = EpisodeSegment(
-                source_path=choice["episode"].file_path,
-                start_time=choice["start"],
-                end_time=choice["end"],
-                apply_blur=choice["apply_blur"]
+        segments = [
+            EpisodeSegment(
+                source_path=choice.episode.file_path,
+                start_time=choice.start,
+                end_time=choice.end,
+                apply_blur=False
             )
-            segments.append(segment)
+            for choice in choices[:best_idx + 1]
+        ]
         
         total_final_duration = sum(seg.duration for seg in segments)
         logger.info(
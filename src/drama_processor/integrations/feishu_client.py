@@ -3,9 +3,15 @@
 """
 import time
 import logging
-from typing import Optional, List, Dict, Any
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Tuple
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from drama_processor.models.feishu import (
     FeishuConfig, 
     FeishuSearchResponse, 
@@ -14,6 +20,43 @@ from drama_processor.models.feishu import (
 
 logger = logging.getLogger(__name__)
 
+# 连接池与重试：仅对幂等方法（GET/PUT 等）在 429/5xx 时退避重试，POST 不自动重试
+_POOL_CONNECTIONS = 4
+_POOL_MAXSIZE = 16
+_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 500, 502, 503, 504),
+    raise_on_status=False,
+)
+# 批量更新状态时的并发请求数（不超过连接池大小）
+_UPDATE_WORKERS = 8
+# batch_update 接口单次最多更新的记录数
+_BATCH_UPDATE_LIMIT = 500
+# 相同条件的搜索结果在 TTL 内复用；任一客户端更新同一张表的状态后即失效
+_SEARCH_TTL = 30.0
+_search_cache: Dict[tuple, Tuple[float, FeishuSearchResponse]] = {}
+_search_cache_lock = threading.Lock()
+# 简化日期格式，如 "9.5"
+_SHORT_DATE_RE = re.compile(r"(\d+)\.(\d+)")
+
+
+def _invalidate_search_cache(app_token: str, table_id: str) -> None:
+    """丢弃某张表的全部搜索缓存"""
+    with _search_cache_lock:
+        for key in [k for k in _search_cache if k[:2] == (app_token, table_id)]:
+            del _search_cache[key]
+
+
+def _chunked(items: Iterable[Tuple[str, str]], size: int) -> Iterator[List[Tuple[str, str]]]:
+    """按 size 切分 (record_id, status) 序列"""
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
 
 def _convert_date_format(date_str: str) -> str:
     """
@@ -25,32 +68,38 @@ def _convert_date_format(date_str: str) -> str:
     Returns:
         飞书标准日期格式，如 "2025-09-05"
     """
-    try:
-        # 当前年份
-        current_year = datetime.now().year
-        
-        # 分割月份和日期
-        if '.' in date_str:
-            month_str, day_str = date_str.split('.', 1)
-        else:
-            raise ValueError(f"日期格式不正确，期望格式如 '9.5'，实际: {date_str}")
-        
-        # 转换为整数并格式化
-        month = int(month_str)
-        day = int(day_str)
-        
-        if month < 1 or month > 12:
-            raise ValueError(f"月份超出范围 1-12: {month}")
-        if day < 1 or day > 31:
-            raise ValueError(f"日期超出范围 1-31: {day}")
-        
-        # 格式化为标准日期格式
-        return f"{current_year}-{month:02d}-{day:02d}"
-        
-    except ValueError as e:
-        raise ValueError(f"日期格式转换失败: {e}")
-    except Exception as e:
-        raise ValueError(f"日期格式转换失败: {e}")
+    match = _SHORT_DATE_RE.fullmatch(date_str.strip()) if isinstance(date_str, str) else None
+    if match is None:
+        raise ValueError(f"日期格式转换失败: 日期格式不正确，期望格式如 '9.5'，实际: {date_str}")
+    
+    month = int(match.group(1))
+    day = int(match.group(2))
+    if month < 1 or month > 12:
+        raise ValueError(f"日期格式转换失败: 月份超出范围 1-12: {month}")
+    if day < 1 or day > 31:
+        raise ValueError(f"日期格式转换失败: 日期超出范围 1-31: {day}")
+    
+    # 年份每次取当前值：飞书轮询可能跨年长期运行
+    return f"{datetime.now().year}-{month:02d}-{day:02d}"
+
+
+def _parse_feishu_date(date_value: str) -> str:
+    """
+    将飞书日期字段值转换为简化日期格式（如 "9.6"）
+    
+    飞书日期字段可能是毫秒时间戳或 "2025-09-06" 格式；其它值视为已是简化格式原样返回。
+    
+    Raises:
+        ValueError: 日期无法解析
+    """
+    if date_value.isdigit():
+        # 毫秒时间戳
+        date_obj = datetime.fromtimestamp(int(date_value) / 1000)
+    elif "-" in date_value:
+        date_obj = datetime.strptime(date_value, "%Y-%m-%d")
+    else:
+        return date_value
+    return f"{date_obj.month}.{date_obj.day}"
 
 
 class FeishuAPIError(Exception):
@@ -70,6 +119,25 @@ class FeishuClient:
         self.config = config
         self._access_token: Optional[str] = None
         self._token_expire_time: Optional[int] = None
+        # 批量更新时多个工作线程可能同时发现token过期，刷新需串行
+        self._token_lock = threading.Lock()
+        # 复用 keep-alive 连接：同一主机的多次调用不再重复 TCP/TLS 握手
+        self._session = requests.Session()
+        self._session.headers["Content-Type"] = "application/json"
+        self._session.mount(
+            "https://",
+            HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE, max_retries=_RETRY),
+        )
+    
+    def close(self) -> None:
+        """关闭连接池"""
+        self._session.close()
+    
+    def __enter__(self) -> "FeishuClient":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
         
     def _is_token_expired(self) -> bool:
         """检查token是否过期"""
@@ -86,13 +154,9 @@ class FeishuClient:
             "app_secret": self.config.app_secret
         }
         
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
         try:
             logger.info("正在刷新飞书access token...")
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._session.post(url, json=payload, timeout=30)
             response.raise_for_status()
             
             token_response = FeishuTokenResponse(**response.json())
@@ -112,9 +176,13 @@ class FeishuClient:
             raise FeishuAPIError(f"刷新token失败: {str(e)}")
     
     def _ensure_valid_token(self) -> None:
-        """确保token有效"""
-        if self._is_token_expired():
-            self._refresh_token()
+        """确保token有效（线程安全，同一时刻只刷新一次）"""
+        if not self._is_token_expired():
+            return
+        with self._token_lock:
+            # 等锁期间可能已被其它线程刷新
+            if self._is_token_expired():
+                self._refresh_token()
     
     def search_records(
         self, 
@@ -139,19 +207,28 @@ class FeishuClient:
         Returns:
             搜索结果
         """
-        self._ensure_valid_token()
-        
         # 使用配置中的默认状态值
         if status_filter is None:
             status_filter = self.config.pending_status_value
+        field_names = field_names or self.config.field_names or ["剧名", "日期"]
+        page_size = page_size or self.config.page_size
+        
+        cache_key = (self.config.app_token, self.config.table_id, status_filter, date_filter,
+                     tuple(field_names), page_size, sort_field, sort_desc)
+        with _search_cache_lock:
+            cached = _search_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _SEARCH_TTL:
+            logger.info(f"复用 {_SEARCH_TTL:.0f}s 内相同条件的飞书搜索结果，状态过滤: {status_filter}")
+            return cached[1]
+        
+        self._ensure_valid_token()
         
         # 构建请求URL
         url = f"{self.config.base_url}/apps/{self.config.app_token}/tables/{self.config.table_id}/records/search"
         
         # 构建请求头
         headers = {
-            "Authorization": f"Bearer {self._access_token}",
-            "Content-Type": "application/json"
+            "Authorization": f"Bearer {self._access_token}"
         }
         
         # 构建过滤条件
@@ -188,8 +265,8 @@ class FeishuClient:
         
         # 构建请求体
         payload = {
-            "field_names": field_names or self.config.field_names or ["剧名", "日期"],
-            "page_size": page_size or self.config.page_size,
+            "field_names": field_names,
+            "page_size": page_size,
             "filter": {
                 "conjunction": "and",
                 "conditions": conditions
@@ -207,7 +284,7 @@ class FeishuClient:
                 logger.info(f"正在搜索飞书记录，状态过滤: {status_filter}，日期过滤: {date_filter}")
             else:
                 logger.info(f"正在搜索飞书记录，状态过滤: {status_filter}")
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            response = self._session.post(url, json=payload, headers=headers, timeout=30)
             response.raise_for_status()
             
             search_response = FeishuSearchResponse(**response.json())
@@ -218,11 +295,15 @@ class FeishuClient:
                     logger.info("未找到符合条件的记录")
                     # 创建一个空的响应
                     empty_response = FeishuSearchResponse(code=0, msg="success", data={"items": []})
+                    with _search_cache_lock:
+                        _search_cache[cache_key] = (time.monotonic(), empty_response)
                     return empty_response
                 else:
                     raise FeishuAPIError(f"搜索记录失败: {search_response.msg} (错误码: {search_response.code})")
             
             logger.info(f"成功获取 {len(search_response.items)} 条记录")
+            with _search_cache_lock:
+                _search_cache[cache_key] = (time.monotonic(), search_response)
             return search_response
             
         except requests.RequestException as e:
@@ -295,23 +376,9 @@ class FeishuClient:
                     # 获取日期信息
                     drama_date = None
                     if "日期" in record.fields and record.fields["日期"]:
-                        # 飞书日期字段可能是时间戳格式，需要转换
                         date_value = record.fields["日期"][0].text
                         try:
-                            # 尝试解析时间戳（毫秒）
-                            if date_value.isdigit():
-                                timestamp = int(date_value) / 1000  # 转换为秒
-                                date_obj = datetime.fromtimestamp(timestamp)
-                                drama_date = f"{date_obj.month}.{date_obj.day}"
-                            else:
-                                # 如果是日期字符串格式，尝试解析
-                                if "-" in date_value:
-                                    # 格式: 2025-09-06
-                                    date_obj = datetime.strptime(date_value, "%Y-%m-%d")
-                                    drama_date = f"{date_obj.month}.{date_obj.day}"
-                                else:
-                                    # 可能已经是简化格式
-                                    drama_date = date_value
+                            drama_date = _parse_feishu_date(date_value)
                         except (ValueError, TypeError) as e:
                             logger.warning(f"无法解析剧目 '{drama_name}' 的日期 '{date_value}': {e}")
                             drama_date = date_value  # 使用原始值
@@ -347,8 +414,7 @@ class FeishuClient:
         url = f"https://open.feishu.cn/open-apis/bitable/v1/apps/{self.config.app_token}/tables/{self.config.table_id}/records/{record_id}"
         
         headers = {
-            "Authorization": f"Bearer {self._access_token}",
-            "Content-Type": "application/json"
+            "Authorization": f"Bearer {self._access_token}"
         }
         
         payload = {
@@ -359,7 +425,7 @@ class FeishuClient:
         
         try:
             logger.info(f"正在更新记录 {record_id} 状态为: {status}")
-            response = requests.put(url, json=payload, headers=headers, timeout=30)
+            response = self._session.put(url, json=payload, headers=headers, timeout=30)
             response.raise_for_status()
             
             result = response.json()
@@ -371,6 +437,7 @@ class FeishuClient:
                     raise FeishuAPIError(f"更新状态失败: {error_msg}")
             
             logger.info(f"记录 {record_id} 状态更新成功")
+            _invalidate_search_cache(self.config.app_token, self.config.table_id)
             return True
             
         except requests.RequestException as e:
@@ -379,3 +446,96 @@ class FeishuClient:
         except Exception as e:
             logger.error(f"更新记录状态失败: {str(e)}")
             return False
+    
+    def _batch_update_chunk(self, chunk: List[Tuple[str, str]]) -> bool:
+        """通过 batch_update 接口一次更新一批记录（整批成功或失败）"""
+        url = f"{self.config.base_url}/apps/{self.config.app_token}/tables/{self.config.table_id}/records/batch_update"
+        
+        headers = {
+            "Authorization": f"Bearer {self._access_token}"
+        }
+        
+        payload = {
+            "records": [
+                {"record_id": record_id, "fields": {self.config.status_field_name: status}}
+                for record_id, status in chunk
+            ]
+        }
+        
+        try:
+            logger.info(f"正在批量更新 {len(chunk)} 条记录状态")
+            response = self._session.post(url, json=payload, headers=headers, timeout=30)
+            response.raise_for_status()
+            
+            result = response.json()
+            if result.get("code") != 0:
+                raise FeishuAPIError(f"批量更新状态失败: {result.get('msg', '')}")
+            
+            logger.info(f"{len(chunk)} 条记录状态批量更新成功")
+            _invalidate_search_cache(self.config.app_token, self.config.table_id)
+            return True
+            
+        except requests.RequestException as e:
+            logger.error(f"批量更新记录状态网络请求失败: {str(e)}")
+            return False
+        except Exception as e:
+            logger.error(f"批量更新记录状态失败: {str(e)}")
+            return False
+    
+    def batch_update_record_status(self, items: Iterable[Tuple[str, str]]) -> int:
+        """
+        批量更新记录状态（每次请求最多 500 条）
+        
+        Args:
+            items: (记录ID, 新状态) 序列
+            
+        Returns:
+            更新成功的记录数
+        """
+        self._ensure_valid_token()
+        
+        updated = 0
+        for chunk in _chunked(items, _BATCH_UPDATE_LIMIT):
+            if self._batch_update_chunk(chunk):
+                updated += len(chunk)
+        return updated
+    
+    def update_record_statuses(self, updates: Dict[str, str]) -> Dict[str, bool]:
+        """
+        更新多条记录的状态
+        
+        优先使用 batch_update 接口；某批失败时（如其中有记录ID不存在），
+        该批改为并发逐条 PUT，以确定每条记录的结果。
+        
+        Args:
+            updates: 记录ID到新状态的映射
+            
+        Returns:
+            记录ID到是否更新成功的映射
+        """
+        if not updates:
+            return {}
+        # 先在当前线程刷新token，各工作线程共用同一个有效token
+        self._ensure_valid_token()
+        
+        results: Dict[str, bool] = {}
+        failed: List[Tuple[str, str]] = []
+        for chunk in _chunked(updates.items(), _BATCH_UPDATE_LIMIT):
+            if self._batch_update_chunk(chunk):
+                results.update((record_id, True) for record_id, _ in chunk)
+            else:
+                failed.extend(chunk)
+        if not failed:
+            return results
+        
+        def update_one(item: Tuple[str, str]) -> bool:
+            record_id, status = item
+            try:
+                return self.update_record_status(record_id, status)
+            except Exception as e:
+                logger.error(f"更新记录 {record_id} 状态失败: {str(e)}")
+                return False
+        
+        with ThreadPoolExecutor(max_workers=min(len(failed), _UPDATE_WORKERS)) as executor:
+            results.update(zip((record_id for record_id, _ in failed), executor.map(update_one, failed)))
+        return {record_id: results[record_id] for record_id in updates}
@@ -82,6 +82,7 @@ class FeishuWatcher:
             self._stop = True
             self._cancel_all_tasks()
             self.executor.shutdown(wait=True, cancel_futures=False)
+            self.client.close()
     
     def stop(self) -> None:
         """Request watcher stop."""
@@ -130,8 +131,7 @@ class FeishuWatcher:
     
     def _start_date_task(self, date_label: str, initial_info: Dict[str, Dict[str, str]], priority: tuple) -> None:
         cancel_event = Event()
-        client = self._create_client()
-        future = self.executor.submit(self._process_date, date_label, initial_info, cancel_event, client)
+        future = self.executor.submit(self._process_date, date_label, initial_info, cancel_event)
         self.active_tasks[date_label] = DateTask(future=future, cancel_event=cancel_event, priority=priority)
         self._notify(f"🚀 启动日期 {date_label} 任务，优先级 {priority}")
     
@@ -254,16 +254,20 @@ class FeishuWatcher:
             dates = [d for d in dates if d not in self.date_blacklist]
         return dates
     
-    def _process_date(self, date_label: str, initial_info: Dict[str, Dict[str, str]], cancel_event: Event, client: FeishuClient) -> bool:
-        """Process a single date batch using the provided initial data."""
+    def _process_date(self, date_label: str, initial_info: Dict[str, Dict[str, str]], cancel_event: Event) -> bool:
+        """Process a single date batch using the provided initial data.
+        
+        The task gets its own client (and connection pool), closed when the batch finishes.
+        """
         self._notify(f"🎯 日期 {date_label} 检测到待剪辑剧，开始处理")
         processed_any = False
-        try:
-            self._run_batch(date_label, initial_info or {}, client, cancel_event)
-            processed_any = True
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.error(f"❌ 日期 {date_label} 处理失败: {exc}")
-            self._notify(f"❌ 日期 {date_label} 处理失败：{exc}")
+        with self._create_client() as client:
+            try:
+                self._run_batch(date_label, initial_info or {}, client, cancel_event)
+                processed_any = True
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error(f"❌ 日期 {date_label} 处理失败: {exc}")
+                self._notify(f"❌ 日期 {date_label} 处理失败：{exc}")
         return processed_any
     
     def _fetch_date_tasks(self, date_label: str, client: Optional[FeishuClient] = None) -> Dict[str, Dict[str, str]]:
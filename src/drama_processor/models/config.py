@@ -79,6 +79,7 @@ class VideoConfig(BaseModel):
     """Video encoding configuration."""
     
     hw_codec: str = Field(default="auto", description="Hardware video codec (auto-detect if 'auto')")
+    hw_decode: bool = Field(default=True, description="Also decode sources on the GPU when hardware encoding")
     sw_codec: str = Field(default="libx264", description="Software video codec") 
     bitrate: str = Field(default="9000k", description="Video bitrate")
     max_rate: str = Field(default="9000k", description="Maximum bitrate")
@@ -121,13 +122,20 @@ class ProcessingConfig(BaseModel):
     """Main processing configuration."""
     
     # 当前激活的用户配置
-    active_user: Optional[str] = Field(default=None, description="当前激活的用户配置名称（如 xh, xl, xx）")
+    active_user: Optional[Union[str, List[str]]] = Field(
+        default=None,
+        description="当前激活的用户配置名称（如 xh, xl, xx）；为列表时按顺序依次覆盖",
+    )
     
     # Basic settings
     target_fps: int = Field(default=60, description="Target FPS")
     smart_fps: bool = Field(default=True, description="Enable smart FPS adaptation")
     fast_mode: bool = Field(default=False, description="Enable fast mode")
     filter_threads: int = Field(default=max(4, min(8, (os.cpu_count() or 4) * 3 // 4)), description="Filter processing threads")
+    encoder_threads: Optional[int] = Field(
+        default=None,
+        description="Software encoder threads per ffmpeg run (auto from cores and jobs when unset)",
+    )
     verbose: bool = Field(default=False, description="Enable verbose logging with detailed FFmpeg commands")
     
     # Duration settings
@@ -162,6 +170,14 @@ class ProcessingConfig(BaseModel):
     use_hardware: bool = Field(default=True, description="Prefer hardware encoding")
     keep_temp: bool = Field(default=False, description="Keep temporary files")
     jobs: int = Field(default=1, description="Concurrent jobs per drama")
+    parallel_segments: int = Field(
+        default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+        description="Concurrent segment encodes per material",
+    )
+    single_pass_segments: bool = Field(
+        default=False,
+        description="Encode and join all segments of a material in one ffmpeg process",
+    )
     
     # Canvas/Resolution settings
     canvas: Optional[str] = Field(default=None, description="Canvas size (WxH or 'first')")
@@ -173,6 +189,14 @@ class ProcessingConfig(BaseModel):
     temp_dir: Optional[str] = Field(default=None, description="Temporary directory")
     output_dir: str = Field(default="../导出素材", description="Output directory")
     tail_cache_dir: str = Field(default="/tmp/tails_cache", description="Tail cache directory")
+    segment_cache_dir: Optional[str] = Field(
+        default=None,
+        description="Normalized segment cache directory (disabled when unset)",
+    )
+    probe_cache_file: Optional[str] = Field(
+        default="~/.cache/drama_processor/ffprobe.json",
+        description="Persistent ffprobe result cache (disabled when unset)",
+    )
     tail_file: Optional[str] = Field(default="assets/tail.mp4", description="Default tail video file")
     refresh_tail_cache: bool = Field(default=False, description="Refresh tail cache")
     
@@ -231,6 +255,20 @@ class ProcessingConfig(BaseModel):
         """Check if Feishu watcher can run."""
         return bool(self.enable_feishu_features and self.feishu_watcher and self.feishu_watcher.enabled)
     
+    def without_feishu(self) -> "ProcessingConfig":
+        """Return a copy with every Feishu feature switched off.
+        
+        Applies all changes in one model_copy (no per-field assignment/validation).
+        """
+        update = {
+            "enable_feishu_features": False,
+            "enable_feishu_notification": False,
+            "feishu": None,
+        }
+        if self.feishu_watcher:
+            update["feishu_watcher"] = self.feishu_watcher.model_copy(update={"enabled": False})
+        return self.model_copy(update=update)
+    
     def get_date_str(self) -> str:
         """Get date string for filename generation."""
         if self.date_str:
@@ -1,22 +1,25 @@
 """Utility functions for drama processor."""
 
 from .system import find_font, ensure_dir, get_cpu_count
-from .video import probe_video_stream, probe_duration, extract_first_frame
+from .video import escape_filter_value, probe_video_stream, probe_duration, extract_first_frame
 from .time import human_duration
-from .files import list_episode_files, md5_of_file, md5_of_text
+from .files import link_or_copy, list_episode_files, md5_of_file, md5_of_text, quick_file_signature
 from .text import to_vertical, write_text_file
 
 __all__ = [
     "find_font",
     "ensure_dir", 
     "get_cpu_count",
+    "escape_filter_value",
     "probe_video_stream",
     "probe_duration",
     "extract_first_frame",
     "human_duration",
+    "link_or_copy",
     "list_episode_files",
     "md5_of_file",
     "md5_of_text",
+    "quick_file_signature",
     "to_vertical",
     "write_text_file",
 ]
@@ -1,12 +1,23 @@
 """File utility functions."""
 
+import functools
 import glob
 import hashlib
 import math
 import os
+import shutil
 import subprocess
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - xxhash 为可选依赖
+    xxhash = None
+
+# quick_file_signature 采样的首尾字节数
+_SIGNATURE_SAMPLE_SIZE = 64 * 1024
 
 
 def list_episode_files(episode_dir: Path) -> List[Path]:
@@ -18,7 +29,12 @@ def list_episode_files(episode_dir: Path) -> List[Path]:
     Returns:
         List of episode file paths sorted by number
     """
-    files = glob.glob(str(episode_dir / "*.mp4"))
+    # 单次 scandir（与 glob "*.mp4" 相同的匹配规则：区分大小写、跳过隐藏文件）
+    try:
+        with os.scandir(episode_dir) as it:
+            files = [e.path for e in it if e.name.endswith(".mp4") and not e.name.startswith(".")]
+    except OSError:
+        return []
     
     def sort_key(file_path: str) -> float:
         """Generate sort key for episode file."""
@@ -69,10 +85,84 @@ def md5_of_file(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
     return hash_obj.hexdigest()
 
 
+def quick_file_signature(file_path: Union[str, Path]) -> str:
+    """Cheap content signature of a (large) file.
+    
+    Combines size, mtime and a hash of the first and last 64 KB instead of
+    hashing the whole file; results are cached per (path, size, mtime).
+    
+    Args:
+        file_path: Path to file
+        
+    Returns:
+        Hexadecimal signature string
+        
+    Raises:
+        OSError: If file cannot be read
+    """
+    st = os.stat(file_path)
+    return _quick_file_signature(os.path.abspath(file_path), st.st_size, st.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=64)
+def _quick_file_signature(abs_path: str, size: int, mtime_ns: int) -> str:
+    with open(abs_path, "rb") as f:
+        head = f.read(_SIGNATURE_SAMPLE_SIZE)
+        tail = b""
+        if size > 2 * _SIGNATURE_SAMPLE_SIZE:
+            f.seek(-_SIGNATURE_SAMPLE_SIZE, os.SEEK_END)
+            tail = f.read()
+    hash_obj = xxhash.xxh64() if xxhash is not None else hashlib.blake2b(digest_size=8)
+    hash_obj.update(head)
+    hash_obj.update(tail)
+    return f"{size:x}-{mtime_ns:x}-{hash_obj.hexdigest()}"
+
+
+def link_or_copy(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Place src at dst, hard-linking when possible instead of copying.
+    
+    Falls back to a copy when src and dst are on different filesystems (or
+    the filesystem has no hard links). dst is replaced atomically via a
+    temporary name next to it.
+    
+    Args:
+        src: Existing file
+        dst: Destination path
+        
+    Raises:
+        OSError: If the file can be neither linked nor copied
+    """
+    # 临时名带上进程/线程，并发写入同一 dst 时互不干扰
+    tmp = f"{os.fspath(dst)}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if os.path.lexists(tmp):
+        os.remove(tmp)
+    try:
+        os.link(src, tmp)
+    except OSError:
+        # EXDEV（跨文件系统）或不支持硬链接：copyfile 在 Linux 上走 sendfile
+        shutil.copyfile(src, tmp)
+    try:
+        os.replace(tmp, dst)
+    except OSError:
+        os.remove(tmp)
+        raise
+
+
 def write_text_file(path: str, text: str):
-    """Write text to file with UTF-8 encoding."""
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(text)
+    """Write text to file with UTF-8 encoding.
+    
+    Uses a raw fd (one open, write, close; no buffered text wrapper and no
+    fsync). Newlines are written as-is on every platform.
+    """
+    data = text.encode("utf-8")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+    fd = os.open(path, flags, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 def ensure_dir(path: str) -> str:
@@ -94,23 +184,38 @@ def find_font(name_hint: str) -> str:
 
 
 def has_mp4(directory: str) -> bool:
-    """Check if directory contains MP4 files."""
-    return len(glob.glob(os.path.join(directory, "*.mp4"))) > 0
+    """Check if directory contains MP4 files (stops at the first one)."""
+    try:
+        with os.scandir(directory) as it:
+            return any(e.name.endswith(".mp4") and not e.name.startswith(".") for e in it)
+    except OSError:
+        return False
 
 
-def scan_drama_dirs(root_dir: str) -> List[str]:
-    """Scan for drama directories containing MP4 files."""
+def scan_drama_episodes(root_dir: str) -> Dict[str, List[Path]]:
+    """Scan for drama directories containing MP4 files, with their episode files.
+    
+    Each drama directory is listed once; the episode lists can be reused
+    instead of listing the directory again when the project is created.
+    """
     excluded_names = {"exports", "_exports"}
     
-    dirs = []
-    for entry in os.scandir(root_dir):
-        if (entry.is_dir() and 
-            not entry.name.startswith(".") and 
-            entry.name.lower() not in excluded_names and 
-            has_mp4(entry.path)):
-            dirs.append(entry.path)
+    dramas = {}
+    with os.scandir(root_dir) as it:
+        for entry in it:
+            if (entry.is_dir() and 
+                not entry.name.startswith(".") and 
+                entry.name.lower() not in excluded_names):
+                episode_files = list_episode_files(Path(entry.path))
+                if episode_files:
+                    dramas[entry.path] = episode_files
     
-    return sorted(dirs)
+    return dramas
+
+
+def scan_drama_dirs(root_dir: str) -> List[str]:
+    """Scan for drama directories containing MP4 files."""
+    return sorted(scan_drama_episodes(root_dir))
 
 
 # Cover picking function removed
@@ -211,6 +316,59 @@ def count_existing_materials(dir_path: str) -> int:
     return len(glob.glob(os.path.join(dir_path, "*.mp4")))
 
 
+def probe_export_dir(exports_root: str, drama_name: str, date_str: Optional[str] = None) -> tuple[Optional[str], Optional[str], int]:
+    """Locate the latest export directory and count its MP4 materials in one pass.
+
+    Equivalent to ``get_latest_export_dir`` followed by ``count_existing_materials``,
+    but the exports root is listed once with ``os.scandir`` (no per-candidate
+    ``isdir``), and the chosen directory is counted by name without stat calls.
+
+    Returns:
+        (latest_dir, run_suffix, existing_count); latest_dir is None when no
+        export directory exists yet.
+    """
+    if date_str:
+        parent_dir = os.path.dirname(os.path.abspath(exports_root))
+        exports_root = os.path.join(parent_dir, f"{date_str}导出")
+
+    prefix = f"{drama_name}-"
+    max_suffix = -999
+    best_name: Optional[str] = None
+    try:
+        with os.scandir(exports_root) as it:
+            for entry in it:
+                name = entry.name
+                if name == drama_name:
+                    if max_suffix < -1 and entry.is_dir():
+                        max_suffix = -1
+                        best_name = name
+                    continue
+                if not name.startswith(prefix):
+                    continue
+                suffix = name[len(prefix):]
+                if len(suffix) == 3 and suffix.isdigit() and int(suffix) > max_suffix and entry.is_dir():
+                    max_suffix = int(suffix)
+                    best_name = name
+    except (FileNotFoundError, NotADirectoryError):
+        return None, None, 0
+
+    if best_name is None:
+        return None, None, 0
+
+    best_dir = os.path.join(exports_root, best_name)
+    run_suffix = f"{max_suffix:03d}" if max_suffix >= 0 else None
+    # 与 glob("*.mp4") 口径一致：忽略以 . 开头的隐藏文件
+    try:
+        with os.scandir(best_dir) as it:
+            existing = sum(
+                1 for entry in it
+                if entry.name.endswith(".mp4") and not entry.name.startswith(".")
+            )
+    except OSError:
+        existing = 0
+    return best_dir, run_suffix, existing
+
+
 def ensure_temp_root(temp_root_opt: Optional[str]) -> str:
     """Ensure temporary root directory exists."""
     root = (temp_root_opt.strip() if temp_root_opt else "/tmp")
@@ -7,6 +7,7 @@
 """
 
 import base64
+import functools
 import json
 import logging
 import os
@@ -14,7 +15,7 @@ import sys
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, List, Optional, Set
 
 from .fingerprint import get_machine_fingerprint
 
@@ -58,6 +59,14 @@ class LicenseInfo:
         return FEATURE_ALL in self.features or feature in self.features
 
 
+@dataclass(frozen=True)
+class LicenseProbe:
+    """进程启动时对 argv/环境变量的一次 license 探测结果。"""
+
+    allowed_features: FrozenSet[str]
+    info: Optional[LicenseInfo]
+
+
 def _find_license_path_in_argv(argv: List[str]) -> Optional[str]:
     """从命令行参数中查找 --license 指定的路径。"""
     for i, arg in enumerate(argv):
@@ -204,14 +213,37 @@ def verify_license_dict(
     return LicenseInfo(user=user, features=features, expires_at=expires_at, raw=data)
 
 
-def load_and_verify_license(
+def _load_and_verify_license_uncached(
     path: str, public_key_pem: Optional[str] = None
 ) -> LicenseInfo:
-    """从文件读取并校验 license。"""
     data = load_license_file(path)
     return verify_license_dict(data, public_key_pem=public_key_pem)
 
 
+@functools.lru_cache(maxsize=8)
+def _verify_license_file_cached(
+    path: str, mtime_ns: int, size: int, public_key_pem: Optional[str]
+) -> LicenseInfo:
+    """按 (路径, mtime, 大小) 在进程内缓存校验成功的结果；校验失败不缓存。"""
+    return _load_and_verify_license_uncached(path, public_key_pem=public_key_pem)
+
+
+def load_and_verify_license(
+    path: str, public_key_pem: Optional[str] = None
+) -> LicenseInfo:
+    """从文件读取并校验 license。
+
+    同一进程内对未变化的文件只做一次签名校验（命令注册判断与 CLI 回调共享结果）。
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return _load_and_verify_license_uncached(path, public_key_pem=public_key_pem)
+    return _verify_license_file_cached(
+        os.path.abspath(path), st.st_mtime_ns, st.st_size, public_key_pem
+    )
+
+
 def get_license_info_from_args_and_env(
     argv: Optional[List[str]] = None,
     *,
@@ -254,3 +286,15 @@ def get_allowed_features_from_args_and_env(
     """快速获取授权 feature 集合（用于 import 时决定是否注册命令）。"""
     info = get_license_info_from_args_and_env(argv)
     return info.features if info else set()
+
+
+@functools.lru_cache(maxsize=None)
+def probe_license_from_argv_and_env() -> LicenseProbe:
+    """基于 sys.argv/环境变量探测 license，每个进程最多执行一次。
+
+    命令注册判断（是否暴露 feishu）与 CLI 根回调共享同一结果，
+    避免重复扫描 argv、重复读取文件和重复记录校验失败日志。
+    """
+    info = get_license_info_from_args_and_env(sys.argv)
+    features = frozenset(info.features) if info else frozenset()
+    return LicenseProbe(allowed_features=features, info=info)
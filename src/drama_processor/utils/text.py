@@ -14,7 +14,7 @@ def to_vertical(text: str) -> str:
     """
     if "\n" in text:
         return text
-    return "\n".join(list(text))
+    return "\n".join(text)
 
 
 def write_text_file(file_path: Path, text: str) -> None:
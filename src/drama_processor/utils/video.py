@@ -1,10 +1,18 @@
 """Video processing utility functions."""
 
+import atexit
+import functools
 import json
+import os
 import subprocess
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, Union
 
+# 滤镜参数值（第一层）与滤镜图（第二层）中需要转义的字符
+_FILTER_OPTION_SPECIAL = frozenset("\\':")
+_FILTERGRAPH_SPECIAL = frozenset("\\'[],;")
+
 
 def parse_rate(rate_str: Optional[str]) -> float:
     """Parse frame rate string.
@@ -32,6 +40,22 @@ def parse_rate(rate_str: Optional[str]) -> float:
         return 0.0
 
 
+@functools.lru_cache(maxsize=64)
+def escape_filter_value(value: str) -> str:
+    """Quote/escape a filter option value (e.g. a fontfile path) for a filtergraph.
+    
+    Values without option-level special characters are single-quoted, which
+    also protects ``,;[]`` in the graph. Otherwise both escaping levels are
+    applied with backslashes, so paths containing ``:`` (Windows drive
+    letters), ``'`` or ``\\`` survive. Cached: the same font and text file
+    paths recur for every episode of a batch.
+    """
+    if not _FILTER_OPTION_SPECIAL.intersection(value):
+        return f"'{value}'"
+    level1 = value.replace("\\", "\\\\").replace("'", "\\'").replace(":", "\\:")
+    return "".join("\\" + c if c in _FILTERGRAPH_SPECIAL else c for c in level1)
+
+
 def probe_video_stream(path: Union[str, Path]) -> Dict[str, Any]:
     """Probe video stream information.
     
@@ -99,6 +123,107 @@ def probe_duration(path: Union[str, Path]) -> float:
     return info["duration"]
 
 
+class ProbeCache:
+    """probe_video_stream results persisted as JSON, keyed by (abs path, mtime_ns, size).
+    
+    A file that is replaced or modified gets a new key, so stale entries are
+    never returned; they are only dropped once the cache exceeds max_entries.
+    """
+    
+    def __init__(self, cache_file: str, max_entries: int = 50000):
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                entries = json.load(f).get("entries")
+            if isinstance(entries, dict):
+                self._entries = entries
+        except (OSError, ValueError, AttributeError):
+            pass
+    
+    def probe(self, path: Union[str, Path]) -> Dict[str, Any]:
+        """probe_video_stream(path), answered from the cache when the file is unchanged."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            return probe_video_stream(path)
+        key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+        with self._lock:
+            info = self._entries.get(key)
+        if info is not None:
+            return dict(info)
+        
+        info = probe_video_stream(path)
+        with self._lock:
+            self._entries[key] = dict(info)
+            self._dirty = True
+        return info
+    
+    def flush(self) -> None:
+        """Write the cache back to disk if it changed (atomic replace)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            entries = self._entries
+            if len(entries) > self.max_entries:
+                # dict 保持插入顺序：丢弃最早写入的条目
+                entries = dict(list(entries.items())[-self.max_entries:])
+                self._entries = entries
+            payload = json.dumps({"version": 1, "entries": entries}, ensure_ascii=False)
+            self._dirty = False
+        
+        tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.cache_file)), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp, self.cache_file)
+        except OSError:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+
+_probe_cache: Optional[ProbeCache] = None
+_probe_cache_lock = threading.Lock()
+
+
+def enable_probe_cache(cache_file: str) -> ProbeCache:
+    """Load the persistent probe cache (once per process) and flush it at exit."""
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is None or _probe_cache.cache_file != cache_file:
+            if _probe_cache is not None:
+                _probe_cache.flush()
+            _probe_cache = ProbeCache(cache_file)
+            atexit.register(_probe_cache.flush)
+        return _probe_cache
+
+
+@functools.lru_cache(maxsize=4096)
+def _probe_in_process(abs_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """probe_video_stream memoized for this process; (mtime_ns, size) invalidate changed files."""
+    return probe_video_stream(abs_path)
+
+
+def cached_probe(path: Union[str, Path]) -> Dict[str, Any]:
+    """probe_video_stream through the persistent cache when enabled.
+    
+    Without a persistent cache, results are still memoized in-process under
+    the same (abs path, mtime_ns, size) key.
+    """
+    cache = _probe_cache
+    if cache is not None:
+        return cache.probe(path)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return probe_video_stream(path)
+    return dict(_probe_in_process(os.path.abspath(path), st.st_mtime_ns, st.st_size))
+
+
 def is_black_frame_at(video_path: Path, time: float, amount_pct: int = 98, pix_th: int = 32) -> bool:
     """Check if frame at given time is black.
     
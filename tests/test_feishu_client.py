@@ -0,0 +1,177 @@
+"""FeishuClient 批量状态更新测试（HTTP 会话全部 mock）"""
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+from unittest.mock import MagicMock
+
+import pytest
+
+from drama_processor.integrations import feishu_client as fc
+from drama_processor.integrations.feishu_client import FeishuClient
+from drama_processor.models.feishu import FeishuConfig, FeishuSearchResponse
+
+
+def _response(payload: Dict[str, Any]) -> MagicMock:
+    response = MagicMock()
+    response.json.return_value = payload
+    return response
+
+
+OK = {"code": 0, "msg": "success"}
+FAIL = {"code": 1, "msg": "fail"}
+NOT_FOUND = {"code": 1254043, "msg": "RecordIdNotFound"}
+
+
+@pytest.fixture(autouse=True)
+def clear_search_cache() -> Iterator[None]:
+    fc._search_cache.clear()
+    yield
+    fc._search_cache.clear()
+
+
+@pytest.fixture
+def client() -> FeishuClient:
+    config = FeishuConfig(
+        app_id="app", app_secret="secret", app_token="app-token", table_id="tbl"
+    )
+    client = FeishuClient(config)
+    # 预置有效token，避免测试中触发刷新请求
+    client._access_token = "token"
+    client._token_expire_time = time.time() + 3600
+    client._session = MagicMock()
+    return client
+
+
+def _batch_sizes(session: MagicMock) -> List[int]:
+    return [len(c.kwargs["json"]["records"]) for c in session.post.call_args_list]
+
+
+def test_batch_update_splits_into_chunks_of_500(client: FeishuClient) -> None:
+    client._session.post.return_value = _response(OK)
+    updates = {f"rec{i}": "待上传" for i in range(1203)}
+
+    results = client.update_record_statuses(updates)
+
+    assert _batch_sizes(client._session) == [500, 500, 203]
+    urls = [c.args[0] for c in client._session.post.call_args_list]
+    assert all(url.endswith("/records/batch_update") for url in urls)
+    client._session.put.assert_not_called()
+    assert list(results) == list(updates)
+    assert all(results.values())
+
+
+def test_batch_update_record_status_counts_only_successful_chunks(
+    client: FeishuClient,
+) -> None:
+    client._session.post.side_effect = [_response(OK), _response(FAIL)]
+
+    items = ((f"rec{i}", "待上传") for i in range(600))
+    updated = client.batch_update_record_status(items)
+
+    assert _batch_sizes(client._session) == [500, 100]
+    assert updated == 500
+
+
+def test_failed_batch_falls_back_to_per_record_put(client: FeishuClient) -> None:
+    client._session.post.return_value = _response(NOT_FOUND)
+
+    def put(url: str, **kwargs: Any) -> MagicMock:
+        if url.endswith("/rec-missing"):
+            return _response(NOT_FOUND)
+        return _response(OK)
+
+    client._session.put.side_effect = put
+    updates = {"rec-b": "待上传", "rec-missing": "待上传", "rec-a": "剪辑中"}
+
+    results = client.update_record_statuses(updates)
+
+    assert client._session.post.call_count == 1
+    put_fields = {
+        c.args[0].rsplit("/", 1)[-1]: c.kwargs["json"]["fields"]["当前状态"]
+        for c in client._session.put.call_args_list
+    }
+    assert client._session.put.call_count == 3
+    assert put_fields == updates
+    # 结果按输入顺序返回，与工作线程完成顺序无关
+    assert list(results) == ["rec-b", "rec-missing", "rec-a"]
+    assert results == {"rec-b": True, "rec-missing": False, "rec-a": True}
+
+
+def test_only_failed_chunk_is_retried_per_record(client: FeishuClient) -> None:
+    client._session.post.side_effect = [_response(OK), _response(FAIL)]
+    client._session.put.return_value = _response(OK)
+    updates = {f"rec{i}": "待上传" for i in range(502)}
+
+    results = client.update_record_statuses(updates)
+
+    assert client._session.put.call_count == 2
+    assert list(results) == list(updates)
+    assert all(results.values())
+
+
+def test_empty_updates_make_no_requests(client: FeishuClient) -> None:
+    assert client.update_record_statuses({}) == {}
+    client._session.post.assert_not_called()
+    client._session.put.assert_not_called()
+
+
+def _seed_search_cache() -> None:
+    empty = FeishuSearchResponse(code=0, msg="success", data={"items": []})
+    fc._search_cache[("app-token", "tbl", "待剪辑")] = (time.monotonic(), empty)
+    fc._search_cache[("app-token", "other", "待剪辑")] = (time.monotonic(), empty)
+
+
+def test_successful_batch_invalidates_table_search_cache(client: FeishuClient) -> None:
+    _seed_search_cache()
+    client._session.post.return_value = _response(OK)
+
+    client.update_record_statuses({"rec1": "待上传"})
+
+    assert list(fc._search_cache) == [("app-token", "other", "待剪辑")]
+
+
+def test_failed_updates_keep_search_cache(client: FeishuClient) -> None:
+    _seed_search_cache()
+    client._session.post.return_value = _response(FAIL)
+    client._session.put.return_value = _response(FAIL)
+
+    results = client.update_record_statuses({"rec1": "待上传"})
+
+    assert results == {"rec1": False}
+    assert len(fc._search_cache) == 2
+
+
+def test_concurrent_token_refresh_runs_once(client: FeishuClient) -> None:
+    client._access_token = None
+    client._token_expire_time = None
+    refreshes: List[str] = []
+
+    def refresh() -> None:
+        refreshes.append(threading.current_thread().name)
+        time.sleep(0.05)
+        client._access_token = "fresh"
+        client._token_expire_time = time.time() + 3600
+
+    client._refresh_token = refresh  # type: ignore[method-assign]
+    barrier = threading.Barrier(8)
+
+    def worker() -> None:
+        barrier.wait()
+        client._ensure_valid_token()
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(refreshes) == 1
+    assert client._access_token == "fresh"
+
+
+def test_context_manager_closes_session(client: FeishuClient) -> None:
+    with client as entered:
+        assert entered is client
+        client._session.close.assert_not_called()
+
+    client._session.close.assert_called_once_with()
@@ -0,0 +1,56 @@
+"""TextOverlay 共享文字文件的复用与清理测试"""
+import os
+from pathlib import Path
+from typing import List
+
+import pytest
+
+from drama_processor.core.overlay import TextOverlay
+
+
+def _build(overlay: TextOverlay, workdir: Path) -> str:
+    workdir.mkdir(exist_ok=True)
+    # 长剧名不内联，标题也写入文字文件
+    title = "一个非常长的剧名" * 5
+    return overlay.build_overlay_filter_chain(
+        "/fonts/k.ttf", 1080, 1920, 30, title, "底部文字", "侧边", str(workdir)
+    )
+
+
+def _shared_dirs(root: Path) -> List[str]:
+    return sorted(p.name for p in root.iterdir() if p.name.startswith("_text_"))
+
+
+def test_identical_texts_share_one_directory(tmp_path: Path) -> None:
+    overlay = TextOverlay()
+
+    _build(overlay, tmp_path / "ep1")
+    _build(overlay, tmp_path / "ep2")
+
+    assert len(_shared_dirs(tmp_path)) == 1
+
+
+def test_cached_files_are_not_restatted(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    overlay = TextOverlay()
+    _build(overlay, tmp_path / "ep1")
+
+    def no_stat(path: str) -> bool:
+        raise AssertionError(f"unexpected stat: {path}")
+
+    monkeypatch.setattr(os.path, "isfile", no_stat)
+    _build(overlay, tmp_path / "ep2")
+
+
+def test_cleanup_removes_shared_directories(tmp_path: Path) -> None:
+    overlay = TextOverlay()
+    _build(overlay, tmp_path / "ep1")
+
+    overlay.cleanup()
+
+    assert _shared_dirs(tmp_path) == []
+    # 清理后再次构建会重新写入文字文件
+    _build(overlay, tmp_path / "ep2")
+    shared = tmp_path / _shared_dirs(tmp_path)[0]
+    assert sorted(p.name for p in shared.iterdir()) == ["bottom.txt", "side.txt", "title.txt"]
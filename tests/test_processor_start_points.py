@@ -0,0 +1,219 @@
+"""generate_start_points 与逐次线性扫描的旧实现逐点一致性测试（ffprobe 全部 stub）"""
+import random
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import pytest
+
+from drama_processor.core import processor as processor_module
+from drama_processor.core.processor import DramaProcessor
+from drama_processor.models.episode import Episode
+from drama_processor.models.project import DramaProject
+
+Durations = Dict[str, Optional[float]]
+
+
+def _probe_stub(durations: Durations) -> Callable[[str], Dict[str, float]]:
+    def probe(path: str) -> Dict[str, float]:
+        duration = durations[path]
+        if duration is None:
+            raise RuntimeError(f"ffprobe failed: {path}")
+        return {"duration": duration}
+
+    return probe
+
+
+def _make_project(durations: Durations) -> DramaProject:
+    episodes = [
+        Episode(file_path=Path(path), episode_number=number, duration=duration or None)
+        for number, (path, duration) in enumerate(durations.items(), start=1)
+    ]
+    # 跳过 source_dir 存在性校验：剧集文件只存在于 stub 的探测结果中
+    return DramaProject.model_construct(
+        name="测试剧", source_dir=Path("/e"), episodes=episodes
+    )
+
+
+def _make_processor(
+    min_duration: float, exclude_last_episodes: int, random_start: bool
+) -> DramaProcessor:
+    processor = object.__new__(DramaProcessor)
+    processor.config = SimpleNamespace(  # type: ignore[assignment]
+        min_duration=min_duration,
+        exclude_last_episodes=exclude_last_episodes,
+        random_start=random_start,
+    )
+    return processor
+
+
+def _linear_available(
+    durations: Durations, paths: List[str], ep_idx: int, offset: float
+) -> float:
+    """旧实现：每次从 ep_idx 起重新累加各集时长，探测失败的剧集跳过"""
+    total = 0.0
+    for i in range(ep_idx, len(paths)):
+        duration = durations[paths[i]]
+        if duration is None:
+            continue
+        total += max(0.0, duration - offset) if i == ep_idx else duration
+    return total
+
+
+def _reference_start_points(
+    durations: Durations,
+    project: DramaProject,
+    count: int,
+    min_duration: float,
+    exclude_last_episodes: int,
+    random_start: bool,
+) -> List[Tuple[int, float]]:
+    """重构前 generate_start_points 的选点逻辑（去掉日志），随机数消耗顺序保持一致"""
+    episodes = project.episodes
+    if count <= 0 or not episodes:
+        return []
+    paths = [str(ep.file_path) for ep in episodes]
+
+    def available(ep_idx: int, offset: float) -> float:
+        return _linear_available(durations, paths, ep_idx, offset)
+
+    max_start_episode = max(0, len(episodes) - exclude_last_episodes)
+    if max_start_episode <= 0:
+        max_start_episode = len(episodes)
+
+    starts: List[Tuple[int, float]] = []
+    used_points: Set[Tuple[int, float]] = set()
+    if random_start:
+        attempts = 0
+        duplicate_threshold = max(2, count // 3)
+        while len(starts) < count and attempts < count * 5:
+            attempts += 1
+            ep_idx = random.randrange(max_start_episode)
+            episode = episodes[ep_idx]
+            offset = 0.0
+            if episode.duration:
+                if available(ep_idx, 0.0) < min_duration:
+                    continue
+                rest = available(ep_idx + 1, 0.0)
+                max_safe_offset = episode.duration - (min_duration - rest)
+                max_safe_offset = min(max_safe_offset, episode.duration * 0.3)
+                max_safe_offset = max(0.0, max_safe_offset)
+                if max_safe_offset > 0:
+                    offset = round(random.uniform(0, max_safe_offset), 3)
+            point_key = (ep_idx, offset)
+            duplicates = sum(1 for p in used_points if p == point_key)
+            if duplicates >= duplicate_threshold:
+                continue
+            if available(ep_idx, offset) >= min_duration:
+                starts.append(point_key)
+                used_points.add(point_key)
+        if len(starts) < count:
+            for ep_idx in range(min(max_start_episode, count - len(starts))):
+                point_key = (ep_idx, 0.0)
+                duplicates = sum(1 for p in used_points if p == point_key)
+                if (
+                    duplicates < duplicate_threshold
+                    and available(ep_idx, 0.0) >= min_duration
+                ):
+                    starts.append(point_key)
+                    used_points.add(point_key)
+    else:
+        step = max(1, max_start_episode // max(1, count))
+        for i in range(count):
+            ep_idx = min(i * step, max_start_episode - 1)
+            if available(ep_idx, 0.0) >= min_duration:
+                starts.append((ep_idx, 0.0))
+            else:
+                for alt_ep_idx in range(max_start_episode):
+                    if available(alt_ep_idx, 0.0) >= min_duration:
+                        starts.append((alt_ep_idx, 0.0))
+                        break
+    return starts
+
+
+def _scenario(seed: int) -> Tuple[Durations, float, int, int]:
+    rng = random.Random(seed)
+    durations: Durations = {}
+    for i in range(rng.randint(1, 30)):
+        # 约 5% 的剧集探测失败，另有时长为 0 的空文件
+        failed = rng.random() < 0.05
+        durations[f"/e/{i + 1}.mp4"] = (
+            None if failed else rng.choice([0.0, 0.0, 30.0, 45.7, 60.0, 90.5, 120.25, 200.0])
+        )
+    min_duration = rng.choice([60, 150, 200, 400, 5000])
+    return durations, min_duration, rng.randint(0, 12), rng.randint(0, 15)
+
+
+@pytest.mark.parametrize("random_start", [True, False], ids=["random", "even"])
+@pytest.mark.parametrize("seed", range(40))
+def test_start_points_match_linear_reference(
+    monkeypatch: pytest.MonkeyPatch, seed: int, random_start: bool
+) -> None:
+    durations, min_duration, exclude, count = _scenario(seed)
+    monkeypatch.setattr(processor_module, "cached_probe", _probe_stub(durations))
+    project = _make_project(durations)
+    processor = _make_processor(min_duration, exclude, random_start)
+
+    random.seed(seed)
+    expected = _reference_start_points(
+        durations, project, count, min_duration, exclude, random_start
+    )
+    random.seed(seed)
+    actual = processor.generate_start_points(project, count)
+
+    assert actual == expected
+
+
+def test_failed_probe_counts_as_zero_duration(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    durations: Durations = {"/e/1.mp4": 100.0, "/e/2.mp4": None, "/e/3.mp4": 100.0}
+    monkeypatch.setattr(processor_module, "cached_probe", _probe_stub(durations))
+    processor = _make_processor(
+        min_duration=150, exclude_last_episodes=0, random_start=False
+    )
+
+    # 第 2 集不可用：只有从第 1 集起才有 200s，第 2/3 集起都只剩 100s
+    starts = processor.generate_start_points(_make_project(durations), 3)
+
+    assert starts == [(0, 0.0), (0, 0.0), (0, 0.0)]
+
+
+def test_exclude_last_episodes_limits_start_range(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    durations: Durations = {f"/e/{i}.mp4": 60.0 for i in range(1, 11)}
+    monkeypatch.setattr(processor_module, "cached_probe", _probe_stub(durations))
+    processor = _make_processor(
+        min_duration=60, exclude_last_episodes=4, random_start=True
+    )
+
+    random.seed(0)
+    starts = processor.generate_start_points(_make_project(durations), 12)
+
+    assert len(starts) == 12
+    assert all(ep_idx < 6 for ep_idx, _ in starts)
+
+
+def test_exclude_covering_all_episodes_falls_back_to_full_range(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    durations: Durations = {"/e/1.mp4": 60.0, "/e/2.mp4": 60.0, "/e/3.mp4": 60.0}
+    monkeypatch.setattr(processor_module, "cached_probe", _probe_stub(durations))
+    processor = _make_processor(
+        min_duration=60, exclude_last_episodes=5, random_start=False
+    )
+
+    starts = processor.generate_start_points(_make_project(durations), 3)
+
+    assert starts == [(0, 0.0), (1, 0.0), (2, 0.0)]
+
+
+def test_no_start_points_for_empty_request(monkeypatch: pytest.MonkeyPatch) -> None:
+    durations: Durations = {"/e/1.mp4": 60.0}
+    monkeypatch.setattr(processor_module, "cached_probe", _probe_stub(durations))
+    processor = _make_processor(
+        min_duration=30, exclude_last_episodes=0, random_start=True
+    )
+
+    assert processor.generate_start_points(_make_project(durations), 0) == []
@@ -0,0 +1,211 @@
+"""SegmentBuilder 截断点选择与旧的线性 min() 实现一致性测试（ffprobe 全部 stub）"""
+import random
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pytest
+
+from drama_processor.core import segments as segments_module
+from drama_processor.core.segments import (
+    SegmentBuilder,
+    _closest_index,
+    _select_cutoff,
+)
+from drama_processor.models.episode import Episode
+
+Segment = Tuple[str, float, float]
+# 每集的 (已知时长, 探测时长)；已知时长为 None 时才会探测，探测时长为 None 表示探测失败
+Layout = List[Tuple[Optional[float], Optional[float]]]
+
+
+def _linear_closest(cumulatives: List[float], target: float, lo: int, hi: int) -> int:
+    """旧实现：在 [lo, hi] 中线性取距 target 最近者，并列取最早的"""
+    return min(range(lo, hi + 1), key=lambda i: abs(cumulatives[i] - target))
+
+
+def _linear_select(cumulatives: List[float], min_d: float, max_d: float) -> int:
+    """旧实现：优先在 [min_d, max_d] 内取最接近目标时长者，否则在全部候选中取"""
+    target = (min_d + max_d) / 2.0
+    valid = [i for i, c in enumerate(cumulatives) if min_d <= c <= max_d]
+    candidates = valid or range(len(cumulatives))
+    return min(candidates, key=lambda i: abs(cumulatives[i] - target))
+
+
+@pytest.mark.parametrize(
+    "cumulatives, target, lo, hi, expected",
+    [
+        ([10.0, 20.0, 30.0], 5.0, 0, 2, 0),  # 目标低于第一个候选
+        ([10.0, 20.0, 30.0], 99.0, 0, 2, 2),  # 目标高于最后一个候选
+        ([10.0, 20.0, 30.0], 20.0, 0, 2, 1),  # 恰好命中
+        ([10.0, 20.0, 30.0], 15.0, 0, 2, 0),  # 等距并列取较早者
+        ([10.0, 20.0, 30.0], 16.0, 0, 2, 1),
+        ([10.0, 20.0, 20.0, 30.0], 25.0, 0, 3, 1),  # 相等累计值取最早的
+        ([10.0, 20.0, 20.0, 20.0], 99.0, 0, 3, 1),
+        ([20.0, 20.0, 30.0], 0.0, 0, 2, 0),
+        ([10.0, 20.0, 30.0, 40.0], 5.0, 1, 2, 1),  # 仅在 [lo, hi] 内选择
+        ([10.0, 20.0, 30.0, 40.0], 99.0, 1, 2, 2),
+        ([42.0], 0.0, 0, 0, 0),
+    ],
+)
+def test_closest_index_cases(
+    cumulatives: List[float], target: float, lo: int, hi: int, expected: int
+) -> None:
+    assert _linear_closest(cumulatives, target, lo, hi) == expected
+    assert _closest_index(cumulatives, target, lo, hi) == expected
+
+
+def _random_cumulatives(rng: random.Random) -> List[float]:
+    # 小整数步长：大量等距并列，含 0 步长产生的相等累计值
+    total = 0.0
+    cumulatives = []
+    for _ in range(rng.randint(1, 12)):
+        total += rng.choice([0, 5, 10, 10, 15, 30])
+        cumulatives.append(total)
+    return cumulatives
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_closest_index_matches_linear_min(seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(200):
+        cumulatives = _random_cumulatives(rng)
+        lo = rng.randrange(len(cumulatives))
+        hi = rng.randrange(lo, len(cumulatives))
+        target = rng.choice([-5.0, 0.0, 7.5, 10.0, 25.0, 60.0, 500.0])
+        expected = _linear_closest(cumulatives, target, lo, hi)
+        assert _closest_index(cumulatives, target, lo, hi) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_select_cutoff_matches_linear_selection(seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(200):
+        cumulatives = _random_cumulatives(rng)
+        min_d = rng.choice([0, 10, 20, 45, 60, 200])
+        # 含 max < min 的空有效区间
+        max_d = min_d + rng.choice([-10, 0, 5, 20, 60])
+        expected = _linear_select(cumulatives, min_d, max_d)
+        assert _select_cutoff(cumulatives, min_d, max_d) == expected
+
+
+ProbeStub = Callable[[Path], Dict[str, float]]
+
+
+def _probe_stub(durations: Dict[str, Optional[float]]) -> ProbeStub:
+    def probe(path: Path) -> Dict[str, float]:
+        duration = durations[str(path)]
+        if duration is None:
+            raise RuntimeError(f"ffprobe failed: {path}")
+        return {"duration": duration}
+
+    return probe
+
+
+def _make_episodes(layout: Layout) -> List[Episode]:
+    return [
+        Episode(file_path=Path(f"/e/{i}.mp4"), episode_number=i, duration=known)
+        for i, (known, _) in enumerate(layout, start=1)
+    ]
+
+
+def _reference_segments(
+    layout: Layout,
+    start_idx: int,
+    start_offset: float,
+    min_d: float,
+    max_d: float,
+) -> List[Segment]:
+    """旧实现：不提前结束，累计全部剧集后线性选择截断点"""
+    choices: List[Segment] = []
+    cumulatives: List[float] = []
+    total = 0.0
+    for i in range(start_idx, len(layout)):
+        known, probed = layout[i]
+        duration = known if known is not None else probed
+        if duration is None:
+            continue
+        seg_start = start_offset if i == start_idx else 0.0
+        take = max(0.0, duration - seg_start)
+        if take <= 0:
+            continue
+        total += take
+        choices.append((f"/e/{i + 1}.mp4", seg_start, duration))
+        cumulatives.append(total)
+    if not choices:
+        return []
+    return choices[: _linear_select(cumulatives, min_d, max_d) + 1]
+
+
+def _build(
+    monkeypatch: pytest.MonkeyPatch,
+    layout: Layout,
+    start_idx: int,
+    start_offset: float,
+    min_d: float,
+    max_d: float,
+) -> List[Segment]:
+    probed = {f"/e/{i}.mp4": p for i, (_, p) in enumerate(layout, start=1)}
+    monkeypatch.setattr(segments_module, "cached_probe", _probe_stub(probed))
+    segments = SegmentBuilder().build_segments_at_episode_boundaries(
+        _make_episodes(layout), start_idx, start_offset, min_d, max_d
+    )
+    return [(str(s.source_path), s.start_time, s.end_time) for s in segments]
+
+
+def _random_layout(rng: random.Random) -> Layout:
+    layout: Layout = []
+    for _ in range(rng.randint(1, 15)):
+        duration = rng.choice([30.0, 45.5, 60.0, 90.0, round(rng.uniform(1, 200), 2)])
+        kind = rng.random()
+        if kind < 0.6:
+            layout.append((duration, duration))
+        elif kind < 0.8:
+            layout.append((None, duration))  # 需要探测
+        elif kind < 0.9:
+            layout.append((None, 0.0))  # 空文件
+        else:
+            layout.append((None, None))  # 探测失败
+    return layout
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_build_segments_matches_linear_reference(
+    monkeypatch: pytest.MonkeyPatch, seed: int
+) -> None:
+    rng = random.Random(seed)
+    for _ in range(50):
+        layout = _random_layout(rng)
+        start_idx = rng.randrange(len(layout))
+        start_offset = rng.choice([0.0, 5.0, 40.0])
+        min_d = rng.choice([30, 60, 100, 150, 300])
+        max_d = min_d + rng.choice([-20, 0, 15, 60, 120])
+        expected = _reference_segments(layout, start_idx, start_offset, min_d, max_d)
+        actual = _build(monkeypatch, layout, start_idx, start_offset, min_d, max_d)
+        assert actual == expected
+
+
+def test_empty_valid_range_falls_back_to_closest(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # 累计 100/200 都不在 [120, 150] 内，取距目标 135 最近的 100
+    layout: Layout = [(100.0, 100.0)] * 3
+    assert _build(monkeypatch, layout, 0, 0.0, 120, 150) == [("/e/1.mp4", 0.0, 100.0)]
+
+
+def test_target_below_first_choice(monkeypatch: pytest.MonkeyPatch) -> None:
+    layout: Layout = [(300.0, 300.0)] * 2
+    assert _build(monkeypatch, layout, 0, 0.0, 60, 120) == [("/e/1.mp4", 0.0, 300.0)]
+
+
+def test_target_above_last_choice_takes_everything(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    layout: Layout = [
+        (10.0, 10.0),
+        (None, None),
+        (None, 20.0),
+    ]
+    assert _build(monkeypatch, layout, 0, 0.0, 60, 120) == [
+        ("/e/1.mp4", 0.0, 10.0),
+        ("/e/3.mp4", 0.0, 20.0),
+    ]